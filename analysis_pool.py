@@ -0,0 +1,131 @@
+"""
+ECHOPULSE v3.0 Analysis Pool
+CPU-bound request work (JSON parsing, scoring, brief rendering, JSON
+serialization) runs in worker processes so the FastAPI event loop keeps
+answering /health and other requests while a large analysis is in flight.
+Metrics the workers record (analyzer timings) come back with each result
+and are merged into the app's registry.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Callable
+
+from atomic_io import atomic_writer
+from metrics import METRICS
+
+
+METRICS.describe("echopulse_analysis_pool_seconds", "Offloaded analysis latency by task, queueing included")
+
+# Added to worker processes' niceness
+WORKER_NICENESS = 10
+
+_analyzer = None
+
+
+def _get_analyzer():
+    # One analyzer per worker process, built on first use
+    global _analyzer
+    if _analyzer is None:
+        from analyzer import EchoPulseAnalyzer
+        _analyzer = EchoPulseAnalyzer()
+    return _analyzer
+
+
+def _lower_priority():
+    # On small hosts the workers share cores with the event loop; let it win
+    try:
+        os.nice(WORKER_NICENESS)
+    except OSError:
+        pass
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _call(fn: Callable[..., Any], *args) -> Tuple[Any, Dict[str, Any]]:
+    # In a worker: the result plus the metrics recorded since the last task
+    result = fn(*args)
+    return result, METRICS.drain()
+
+
+def analyze_json(contents: bytes) -> str:
+    """Brief for a raw JSON request body"""
+    return _get_analyzer().analyze(json.loads(contents))
+
+
+def analyze_scan(data: Dict[str, Any]) -> Tuple[str, str]:
+    """(scan file text, brief) for scan data that also gets saved"""
+    return json.dumps(data, indent=2), _get_analyzer().analyze(data)
+
+
+def ingest_upload(upload_path: str, scan_path: str) -> Tuple[str, int]:
+    """
+    Stream a raw uploaded scan: parse and validate it candidate by candidate,
+    write it to scan_path (atomically, same layout as json.dump indent=2) and
+    rank it for the brief, all in memory bounded by one candidate plus the
+    brief's top k. Returns (brief, candidate count).
+    """
+    from upload_stream import ScanFileWriter, iter_events, stream_candidates
+
+    metadata: Dict[str, Any] = {}
+    counts = {"candidates": 0}
+
+    def counted(candidates):
+        for candidate in candidates:
+            counts["candidates"] += 1
+            yield candidate
+
+    with open(upload_path, "rb") as raw, atomic_writer(Path(scan_path)) as out:
+        writer = ScanFileWriter(out)
+        candidates = stream_candidates(iter_events(raw), metadata, writer)
+        # metadata is read after the stream is exhausted, so trailing fields count
+        brief = _get_analyzer().analyze_stream(counted(candidates), metadata)
+        writer.close()
+    return brief, counts["candidates"]
+
+
+class AnalysisPool:
+    """
+    Process pool for the analysis tasks above. Until start() is called
+    (e.g. outside the app lifespan) tasks run on the default thread pool,
+    which still keeps them off the event loop.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or int(os.getenv("ANALYSIS_WORKERS", min(4, os.cpu_count() or 1)))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        if self._pool is not None:
+            return
+        # spawn, not fork: the app process already runs threads (brief watcher, anyio)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_lower_priority
+        )
+        # Start the workers now rather than on the first upload
+        for _ in range(self.workers):
+            self._pool.submit(_ready)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Await fn(*args) in a worker, merging the metrics it recorded"""
+        loop = asyncio.get_running_loop()
+        with METRICS.timer("echopulse_analysis_pool", task=fn.__name__):
+            if self._pool is None:
+                # Threads share this process's registry already
+                return await loop.run_in_executor(None, fn, *args)
+            result, worker_metrics = await loop.run_in_executor(self._pool, _call, fn, *args)
+        METRICS.merge(worker_metrics)
+        return result
@@ -3,8 +3,18 @@ ECHOPULSE v3.0 Analyzer
 Implements the scoring and brief generation logic
 """
 
+import heapq
 from datetime import datetime
-from typing import Dict, List, Any
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
+
+from metrics import METRICS
+
+
+# Candidates the brief shows: pick, two alternates, three on the watching list
+BRIEF_SIZE = 6
 
 
 class EchoPulseAnalyzer:
@@ -21,38 +31,174 @@ class EchoPulseAnalyzer:
         Takes raw data and generates ECHOPULSE morning brief
         """
         candidates = data.get("candidates", [])
+        data_gaps = self._format_data_gaps(data)
 
         if not candidates:
-            return self._generate_no_setup_brief()
-
-        # Score each candidate
-        scored_candidates = []
-        for candidate in candidates:
-            score = self._score_candidate(candidate)
-            scored_candidates.append({
-                "data": candidate,
-                "scores": score
-            })
-
-        # Filter qualified candidates
-        qualified = [
-            c for c in scored_candidates
-            if c["scores"]["attention"] >= self.min_attention_score
-            and c["scores"]["health"] >= self.min_health_score
-            and c["data"].get("rumor_confidence", 0) >= self.min_rumor_confidence
+            return self._generate_no_setup_brief(data_gaps)
+
+        with METRICS.timer("echopulse_analyzer", phase="score"):
+            qualified = self.rank(candidates, k=BRIEF_SIZE)
+
+        with METRICS.timer("echopulse_analyzer", phase="render"):
+            if not qualified:
+                return self._generate_no_setup_brief(data_gaps)
+
+            # Generate brief
+            return self._generate_brief(qualified, data_gaps)
+
+    def analyze_stream(
+        self,
+        candidates: Iterable[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+        k: int = BRIEF_SIZE
+    ) -> str:
+        """
+        Same brief as analyze(), from any iterable of candidates (an NDJSON
+        reader, a live collector stream) in O(k) memory
+        metadata carries the scan-level fields (failures, source_errors, ...)
+        """
+        incomplete: List[Dict[str, Any]] = []
+        counts = {"seen": 0, "incomplete": 0}
+
+        def watch(stream):
+            # Remember only a sample of candidates with gaps, for the brief
+            for candidate in stream:
+                counts["seen"] += 1
+                if candidate.get("missing"):
+                    counts["incomplete"] += 1
+                    if len(incomplete) < 10:
+                        incomplete.append({"ticker": candidate["ticker"], "missing": candidate["missing"]})
+                yield candidate
+
+        with METRICS.timer("echopulse_analyzer", phase="score"):
+            qualified = self.top_k(watch(candidates), k)
+
+        data_gaps = self._format_data_gaps(
+            {**(metadata or {}), "candidates": incomplete},
+            incomplete_count=counts["incomplete"]
+        )
+        with METRICS.timer("echopulse_analyzer", phase="render"):
+            if not qualified:
+                return self._generate_no_setup_brief(data_gaps)
+            return self._generate_brief(qualified, data_gaps)
+
+    def rank(self, candidates: List[Dict[str, Any]], k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Qualified candidates, best composite first, as {"data", "scores"}
+        Ties keep input order; with k, only the top k are built
+        """
+        scores = self.score_batch(candidates)
+        qualified_idx = np.flatnonzero(scores["qualified"])
+        order = qualified_idx[np.argsort(-scores["composite"][qualified_idx], kind="stable")]
+        if k is not None:
+            order = order[:k]
+
+        attention = scores["attention"]
+        composite = scores["composite"]
+        return [
+            self._scored(candidates[i], float(attention[i]), float(composite[i]))
+            for i in order.tolist()
         ]
 
-        # Sort by composite score
-        qualified.sort(key=lambda x: x["scores"]["composite"], reverse=True)
+    def top_k(
+        self,
+        candidates: Iterable[Dict[str, Any]],
+        k: int = BRIEF_SIZE,
+        batch_size: int = 4096
+    ) -> List[Dict[str, Any]]:
+        """
+        rank(candidates, k) for a stream: scores batch_size candidates at a
+        time and keeps a k-entry min-heap keyed by (composite, -arrival), so
+        the result, ties included, matches the stable sort in rank()
+        """
+        heap: List[tuple] = []
+        stream = iter(candidates)
+        seq = 0
+
+        while k > 0:
+            batch = list(islice(stream, batch_size))
+            if not batch:
+                break
+            scores = self.score_batch(batch)
+            attention = scores["attention"]
+            composite = scores["composite"].tolist()
+
+            for i in np.flatnonzero(scores["qualified"]).tolist():
+                key = (composite[i], -(seq + i))
+                if len(heap) < k:
+                    heapq.heappush(heap, (*key, self._scored(batch[i], float(attention[i]), composite[i])))
+                elif key > heap[0][:2]:
+                    heapq.heapreplace(heap, (*key, self._scored(batch[i], float(attention[i]), composite[i])))
+            seq += len(batch)
+
+        heap.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [entry[2] for entry in heap]
+
+    def _scored(self, candidate: Dict[str, Any], attention: float, composite: float) -> Dict[str, Any]:
+        return {
+            "data": candidate,
+            "scores": {
+                "attention": attention,
+                # Original value, so the brief prints 4/5 rather than 4.0/5
+                "health": candidate.get("health_score", 0),
+                "composite": composite
+            }
+        }
+
+    def composite_scores(self, candidates: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Composite score per ticker, qualified or not"""
+        composite = self.score_batch(candidates)["composite"].tolist()
+        return {
+            c["ticker"]: score
+            for c, score in zip(candidates, composite)
+            if c.get("ticker")
+        }
 
-        if not qualified:
-            return self._generate_no_setup_brief()
+    def score_batch(self, candidates: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Vectorized _score_candidate over many candidates
+        Returns float64 columns attention, health, composite (same values,
+        bit for bit, as scoring one at a time) and the boolean qualified mask
+        """
+        n = len(candidates)
+        buzz_ratio = np.fromiter((c.get("buzz_ratio", 1.0) for c in candidates), np.float64, n)
+        velocity_1h = np.fromiter((c.get("velocity_1h", 0) for c in candidates), np.float64, n)
+        platforms = np.fromiter((len(c.get("platforms", [])) for c in candidates), np.float64, n)
+        health = np.fromiter((c.get("health_score", 0) for c in candidates), np.float64, n)
+        confidence = np.fromiter((c.get("rumor_confidence", 0) for c in candidates), np.float64, n)
+        has_catalyst = np.fromiter((bool(c.get("catalyst_date")) for c in candidates), np.bool_, n)
+
+        # Attention Score (0-100), same terms and order as _score_candidate
+        buzz_points = np.minimum(50, buzz_ratio / 4.0 * 50)
+        velocity_points = np.minimum(20, velocity_1h / 10 * 20)
+        platform_points = np.minimum(15, platforms * 5)
+        influencer_points = np.where(buzz_ratio > 3.0, 15.0, 5.0)
+        attention = buzz_points + velocity_points + platform_points + influencer_points
+
+        # Composite Score: 40% Attention + 20% Health + 20% Catalyst + 20% Confidence
+        catalyst_proximity = np.where(has_catalyst, 100.0, 50.0)
+        composite = (
+            attention * 0.4 +
+            health * 20 * 0.2 +
+            catalyst_proximity * 0.2 +
+            confidence * 33.3 * 0.2
+        )
 
-        # Generate brief
-        return self._generate_brief(qualified)
+        qualified = (
+            (attention >= self.min_attention_score)
+            & (health >= self.min_health_score)
+            & (confidence >= self.min_rumor_confidence)
+        )
+
+        return {
+            "attention": attention,
+            "health": health,
+            "composite": composite,
+            "qualified": qualified
+        }
 
     def _score_candidate(self, candidate: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate scores for a candidate"""
+        """Calculate scores for a candidate (reference for score_batch)"""
 
         # Attention Score (0-100)
         buzz_ratio = candidate.get("buzz_ratio", 1.0)
@@ -90,7 +236,7 @@ class EchoPulseAnalyzer:
             "composite": composite
         }
 
-    def _generate_brief(self, qualified: List[Dict]) -> str:
+    def _generate_brief(self, qualified: List[Dict], data_gaps: str = "") -> str:
         """Generate morning decision dashboard"""
 
         today = datetime.now().strftime("%A, %B %d, %Y")
@@ -125,6 +271,9 @@ class EchoPulseAnalyzer:
                 health = candidate["scores"]["health"]
                 brief += f"- **${ticker}**: Attention {attention}/100, Health {health}/5 - Monitor for setup\n"
 
+        # What the scan could not collect
+        brief += data_gaps
+
         # Footer
         brief += f"""
 
@@ -222,7 +371,7 @@ This is intelligence aggregation, NOT investment advice. You are responsible for
 - **Thesis Invalidation**: Exit immediately if rumor contradicted
 
 **RISK ASSESSMENT**: {self._assess_risk(data, health)}/5
-
+{self._format_missing(data)}
 **KEY VERIFICATION LINKS**:
 {sources_str}
 """
@@ -245,9 +394,51 @@ This is intelligence aggregation, NOT investment advice. You are responsible for
 - Attention: {attention}/100 | Health: {health}/5 | Catalyst: {catalyst} on {catalyst_date}
 - Thesis: {rumor}
 - Entry: ${price * 0.97:.2f}-${price * 1.02:.2f} | T1: ${t1:.2f} (+20%)
-
+{self._format_missing(data)}
 """
 
+    def _format_missing(self, data: Dict) -> str:
+        """One-line warning for a candidate collected with gaps"""
+        missing = data.get("missing")
+        if not missing:
+            return ""
+        return f"- ⚠️ **Data gaps**: {', '.join(missing)} not collected - scores use defaults\n"
+
+    def _format_data_gaps(self, data: Dict[str, Any], incomplete_count: Optional[int] = None) -> str:
+        """Brief section listing what a best-effort scan could not collect"""
+        lines = []
+
+        deadline = data.get("deadline") or {}
+        if deadline.get("expired"):
+            lines.append(f"- Scan hit its {deadline['minutes']:g}-minute deadline; results are best-effort")
+
+        for source, error in (data.get("source_errors") or {}).items():
+            lines.append(f"- {source.title()} unavailable: {error}")
+
+        for name, breaker in (data.get("circuit_breakers") or {}).items():
+            if breaker.get("calls_skipped"):
+                lines.append(
+                    f"- {name.title()} skipped for {breaker['calls_skipped']} calls "
+                    f"(circuit {breaker['state'].replace('_', '-')}; last error: {breaker.get('last_error')})"
+                )
+
+        incomplete = [c for c in data.get("candidates", []) if c.get("missing")]
+        for candidate in incomplete[:10]:
+            lines.append(f"- ${candidate['ticker']}: missing {', '.join(candidate['missing'])}")
+        total = len(incomplete) if incomplete_count is None else incomplete_count
+        if total > 10:
+            lines.append(f"- ...and {total - 10} more candidates with missing fields")
+
+        failures = data.get("failures") or []
+        if failures:
+            shown = ", ".join(f"${f['ticker']}" for f in failures[:10])
+            more = f" (+{len(failures) - 10} more)" if len(failures) > 10 else ""
+            lines.append(f"- {len(failures)} tickers not collected: {shown}{more}")
+
+        if not lines:
+            return ""
+        return "\n\n---\n\n## 🕳️ DATA GAPS\n\n" + "\n".join(lines) + "\n"
+
     def _format_health_check(self, fundamentals: Dict) -> str:
         """Format health check details"""
         checks = []
@@ -313,7 +504,7 @@ This is intelligence aggregation, NOT investment advice. You are responsible for
 
         return min(5, risk)
 
-    def _generate_no_setup_brief(self) -> str:
+    def _generate_no_setup_brief(self, data_gaps: str = "") -> str:
         """Generate brief when no qualified setups"""
         today = datetime.now().strftime("%A, %B %d, %Y")
 
@@ -333,7 +524,7 @@ This is intelligence aggregation, NOT investment advice. You are responsible for
 - No catalyst within 7 days
 
 **Action**: Stand aside. Cash is a position. Wait for better setups tomorrow.
-
+{data_gaps}
 ---
 
 **Bad days happen. Don't force trades.**
@@ -3,54 +3,175 @@ ECHOPULSE v3.0 - Personal Rumor Trading Scanner
 Railway-deployed FastAPI application
 """
 
-from fastapi import FastAPI, Request, UploadFile, File
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-import json
-from typing import Dict, List, Any
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from typing import Dict, List, Any, Optional
+
+from analysis_pool import AnalysisPool, analyze_json, analyze_scan, ingest_upload
+from atomic_io import write_atomic_async
+from brief_index import BriefIndex
+from collectors_async import AsyncDataAggregator, close_shared_client
+from events import EventBroadcaster
+from history_store import HistoryStore
+from jobs import JobQueue, job_key, SUCCEEDED
+from metrics import METRICS
+from upload_stream import UploadError, copy_upload
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    events.start()
+    # End open /api/events streams as soon as shutdown starts, not after the drain
+    events.close_on_signals()
+    brief_index.start()
+    analysis_pool.start()
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    analysis_pool.shutdown()
+    brief_index.stop()
+    events.stop()
+    # Close the pooled connections the async collectors kept alive
+    await close_shared_client()
 
-from analyzer import EchoPulseAnalyzer
 
 # Initialize FastAPI
-app = FastAPI(title="ECHOPULSE Scanner", version="3.0")
+app = FastAPI(title="ECHOPULSE Scanner", version="3.0", lifespan=lifespan)
 
 # Mount static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
-# Initialize analyzer
-analyzer = EchoPulseAnalyzer()
+# Analysis runs in worker processes, off the event loop (ANALYSIS_WORKERS)
+analysis_pool = AnalysisPool()
+
+# Created on first /api/scan so its cache and breakers persist across requests
+scan_aggregator: Optional[AsyncDataAggregator] = None
+
+# Live scan progress, job updates and new briefs for dashboards (/api/events)
+events = EventBroadcaster()
+
+# Background scans and analyses; identical in-flight jobs run once (JOB_WORKERS)
+job_queue = JobQueue(
+    max_workers=int(os.getenv("JOB_WORKERS", 2)),
+    on_change=lambda job: events.publish("job", job.snapshot())
+)
 
 # Data directories
 DATA_DIR = Path("data")
 BRIEFS_DIR = Path("briefs")
 TRADES_DIR = Path("trades")
+HISTORY_DIR = DATA_DIR / "history"
 
 # Ensure directories exist
 for dir in [DATA_DIR, BRIEFS_DIR, TRADES_DIR]:
     dir.mkdir(exist_ok=True)
 
+# Brief listing and recent content, served from memory
+brief_index = BriefIndex(BRIEFS_DIR, on_change=lambda brief: events.publish("brief", brief))
+
+# Largest request body accepted (uploads and JSON posts), in MB
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", 256))
+
+
+class BodyTooLarge(HTTPException):
+    """Raised mid-stream by BodySizeLimit once a chunked body passes the limit"""
+
+    def __init__(self):
+        super().__init__(status_code=413, detail=f"Request body over {MAX_UPLOAD_MB:g} MB")
+
+
+def body_too_large_response() -> JSONResponse:
+    return JSONResponse({
+        "status": "error",
+        "message": f"Request body over {MAX_UPLOAD_MB:g} MB"
+    }, status_code=413)
+
+
+class BodySizeLimit:
+    """
+    Reject request bodies over max_bytes with 413: up front from
+    Content-Length, or mid-stream for chunked bodies, before they're buffered
+    (both answered by body_too_large_response)
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            return await body_too_large_response()(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            if received > self.max_bytes:
+                raise BodyTooLarge()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(BodySizeLimit, max_bytes=int(MAX_UPLOAD_MB * 1024 * 1024))
+
+
+@app.exception_handler(BodyTooLarge)
+async def body_too_large(request: Request, exc: BodyTooLarge):
+    return body_too_large_response()
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """Time every request by route template (not raw path, to keep label sets small)"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        labels = {
+            "method": request.method,
+            "route": route.path if route is not None else "unmatched",
+            "status": status
+        }
+        METRICS.observe("echopulse_http_seconds", time.perf_counter() - started, **labels)
+        METRICS.inc("echopulse_http_calls_total", **labels)
+        if status >= 500:
+            METRICS.inc("echopulse_http_errors_total", **labels)
+
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page - view latest brief or upload data"""
 
     # Get latest brief if exists
-    briefs = sorted(BRIEFS_DIR.glob("morning_brief_*.md"), reverse=True)
-    latest_brief = None
-    brief_content = None
-
-    if briefs:
-        latest_brief = briefs[0]
-        with open(latest_brief, "r") as f:
-            brief_content = f.read()
+    latest_date = brief_index.latest()
+    brief_content = brief_index.content(latest_date) if latest_date else None
 
     return templates.TemplateResponse("index.html", {
         "request": request,
-        "latest_brief": latest_brief.name if latest_brief else None,
+        "latest_brief": brief_index.path(latest_date).name if latest_date else None,
+        "latest_date": latest_date,
         "brief_content": brief_content,
         "today": datetime.now().strftime("%Y-%m-%d")
     })
@@ -62,8 +183,14 @@ async def health_check():
     return {"status": "healthy", "version": "3.0"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(METRICS.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/api/analyze")
-async def analyze_data(data: Dict[str, Any]):
+async def analyze_data(request: Request):
     """
     Analyze stock data and generate ECHOPULSE brief
 
@@ -85,15 +212,12 @@ async def analyze_data(data: Dict[str, Any]):
     }
     """
     try:
-        # Run ECHOPULSE analysis
-        brief = analyzer.analyze(data)
+        # Run ECHOPULSE analysis (parsed and scored in a worker process)
+        brief = await analysis_pool.run(analyze_json, await request.body())
 
         # Save brief to file
         today = datetime.now().strftime("%Y-%m-%d")
-        brief_file = BRIEFS_DIR / f"morning_brief_{today}.md"
-
-        with open(brief_file, "w") as f:
-            f.write(brief)
+        brief_file = await brief_index.write_async(today, brief)
 
         return JSONResponse({
             "status": "success",
@@ -101,6 +225,107 @@ async def analyze_data(data: Dict[str, Any]):
             "brief_content": brief
         })
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        return JSONResponse({
+            "status": "error",
+            "message": str(e)
+        }, status_code=500)
+
+
+def _watchlist(request: Dict[str, Any]) -> List[str]:
+    from scanner import DEFAULT_WATCHLIST
+    return [str(t).strip().upper() for t in request.get("tickers") or DEFAULT_WATCHLIST if str(t).strip()]
+
+
+async def run_scan(tickers: List[str], key: str) -> Dict[str, Any]:
+    """
+    Collect a watchlist, save the scan and brief; the scan job's body
+    Publishes per-ticker progress and stage timings, tagged with the job key
+    """
+    global scan_aggregator
+    if scan_aggregator is None:
+        scan_aggregator = AsyncDataAggregator()
+
+    stages: Dict[str, float] = {}
+    collected = 0
+
+    def on_candidate(candidate: Dict[str, Any]):
+        nonlocal collected
+        collected += 1
+        events.publish("scan_progress", {
+            "key": key,
+            "ticker": candidate.get("ticker"),
+            "collected": collected,
+            "total": len(tickers)
+        })
+
+    def stage_done(stage: str, started: float):
+        stages[stage] = round(time.perf_counter() - started, 3)
+        events.publish("scan_stage", {"key": key, "stage": stage, "seconds": stages[stage]})
+
+    started = time.perf_counter()
+    data = await scan_aggregator.scan_watchlist(tickers, on_candidate=on_candidate)
+    stage_done("collect", started)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    data_file = DATA_DIR / f"scan_{today}.json"
+    started = time.perf_counter()
+    data_text, brief = await analysis_pool.run(analyze_scan, data)
+    stage_done("analyze", started)
+
+    started = time.perf_counter()
+    await write_atomic_async(data_file, data_text)
+    brief_file = await brief_index.write_async(today, brief)
+    stage_done("save", started)
+
+    return {
+        "candidates": len(data["candidates"]),
+        "failures": data["failures"],
+        "stages": stages,
+        "data_file": str(data_file),
+        "brief_file": str(brief_file),
+        "brief_content": brief
+    }
+
+
+async def run_analysis(body: bytes) -> Dict[str, Any]:
+    """Analyze a scan JSON body and save the brief; the analyze job's body"""
+    brief = await analysis_pool.run(analyze_json, body)
+    brief_file = await brief_index.write_async(datetime.now().strftime("%Y-%m-%d"), brief)
+    return {"brief_file": str(brief_file), "brief_content": brief}
+
+
+def submit_scan(tickers: List[str]):
+    # Same watchlist (any order) on the same day is the same scan
+    today = datetime.now().strftime("%Y-%m-%d")
+    key = job_key(sorted(set(tickers)), today)
+    return job_queue.submit("scan", key, lambda: run_scan(tickers, key), {"tickers": len(tickers), "date": today})
+
+
+@app.post("/api/scan")
+async def scan_tickers(request: Dict[str, Any]):
+    """
+    Collect live data for a watchlist and generate a brief
+    Runs on the async collectors, so the event loop keeps serving other requests.
+    Goes through the job queue, so concurrent identical requests share one scan.
+
+    Body: {"tickers": ["NVDA", "AMD"]}  (omit for the default watchlist)
+    """
+    try:
+        job, deduplicated = submit_scan(_watchlist(request))
+        await job.wait()
+        if job.status != SUCCEEDED:
+            raise RuntimeError(job.error)
+
+        return JSONResponse({
+            "status": "success",
+            "job_id": job.id,
+            "deduplicated": deduplicated,
+            **job.result
+        })
+
     except Exception as e:
         return JSONResponse({
             "status": "error",
@@ -108,80 +333,162 @@ async def analyze_data(data: Dict[str, Any]):
         }, status_code=500)
 
 
+@app.post("/api/jobs/scan", status_code=202)
+async def submit_scan_job(request: Dict[str, Any]):
+    """
+    Queue a scan and return its job ID right away
+    Body: {"tickers": ["NVDA", "AMD"]}  (omit for the default watchlist)
+    """
+    job, deduplicated = submit_scan(_watchlist(request))
+    return JSONResponse({**job.snapshot(), "deduplicated": deduplicated}, status_code=202)
+
+
+@app.post("/api/jobs/analyze", status_code=202)
+async def submit_analyze_job(request: Request):
+    """Queue an analysis of a scan JSON body and return its job ID right away"""
+    body = await request.body()
+    today = datetime.now().strftime("%Y-%m-%d")
+    key = job_key(hashlib.sha256(body).hexdigest(), today)
+    job, deduplicated = job_queue.submit("analyze", key, lambda: run_analysis(body), {"bytes": len(body), "date": today})
+    return JSONResponse({**job.snapshot(), "deduplicated": deduplicated}, status_code=202)
+
+
+@app.get("/api/jobs")
+async def list_jobs():
+    """Recent jobs, newest first"""
+    return JSONResponse({**job_queue.stats(), "recent": job_queue.list()})
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse({"status": "error", "message": f"Job {job_id} not found"}, status_code=404)
+    return JSONResponse(job.snapshot())
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Job result: 200 when done, 202 while queued or running, 500 if it failed"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse({"status": "error", "message": f"Job {job_id} not found"}, status_code=404)
+    if not job.finished:
+        return JSONResponse(job.snapshot(), status_code=202)
+    if job.status != SUCCEEDED:
+        return JSONResponse({"status": "error", "job_id": job.id, "message": job.error}, status_code=500)
+    return JSONResponse({"status": "success", "job_id": job.id, **job.result})
+
+
 @app.post("/api/upload")
 async def upload_data(file: UploadFile = File(...)):
-    """Upload JSON data file for analysis"""
+    """
+    Upload JSON data file for analysis
+    A worker parses and validates it candidate by candidate, streaming it into
+    the scan file and the brief's ranking without loading the whole document
+    """
+    upload_path = DATA_DIR / f".upload-{uuid.uuid4().hex}.json.part"
     try:
-        # Read uploaded file
-        contents = await file.read()
-        data = json.loads(contents)
+        # Hand the upload to the worker as a file it can read in chunks
+        await asyncio.to_thread(copy_upload, file.file, str(upload_path))
 
-        # Save to data directory
+        # Save to data directory and analyze, in one streaming pass
         today = datetime.now().strftime("%Y-%m-%d")
         data_file = DATA_DIR / f"scan_{today}.json"
-
-        with open(data_file, "w") as f:
-            json.dump(data, f, indent=2)
-
-        # Run analysis
-        brief = analyzer.analyze(data)
+        brief, candidates = await analysis_pool.run(ingest_upload, str(upload_path), str(data_file))
 
         # Save brief
-        brief_file = BRIEFS_DIR / f"morning_brief_{today}.md"
-        with open(brief_file, "w") as f:
-            f.write(brief)
+        brief_file = await brief_index.write_async(today, brief)
 
         return JSONResponse({
             "status": "success",
+            "candidates": candidates,
             "data_file": str(data_file),
             "brief_file": str(brief_file),
             "brief_content": brief
         })
 
+    except UploadError as e:
+        return JSONResponse({
+            "status": "error",
+            "message": f"Invalid scan file: {e}"
+        }, status_code=400)
     except Exception as e:
         return JSONResponse({
             "status": "error",
             "message": str(e)
         }, status_code=500)
+    finally:
+        upload_path.unlink(missing_ok=True)
 
 
 @app.get("/api/briefs")
 async def list_briefs():
     """List all generated briefs"""
-    briefs = sorted(BRIEFS_DIR.glob("morning_brief_*.md"), reverse=True)
-
-    return JSONResponse({
-        "briefs": [
-            {
-                "filename": b.name,
-                "date": b.stem.replace("morning_brief_", ""),
-                "size": b.stat().st_size
-            }
-            for b in briefs
-        ]
-    })
+    return JSONResponse({"briefs": brief_index.list()})
 
 
 @app.get("/api/briefs/{date}")
 async def get_brief(date: str):
     """Get specific brief by date (YYYY-MM-DD)"""
-    brief_file = BRIEFS_DIR / f"morning_brief_{date}.md"
+    content = brief_index.content(date)
 
-    if not brief_file.exists():
+    if content is None:
         return JSONResponse({
             "status": "error",
             "message": f"Brief for {date} not found"
         }, status_code=404)
 
-    with open(brief_file, "r") as f:
-        content = f.read()
-
     return JSONResponse({
         "date": date,
         "content": content
     })
 
 
+@app.get("/api/history/{ticker}")
+async def ticker_history(
+    ticker: str,
+    column: str = "buzz_ratio",
+    start: Optional[str] = None,
+    end: Optional[str] = None
+):
+    """One ticker's column over time, from the compacted scan history"""
+    if not (HISTORY_DIR / "meta.json").exists():
+        return JSONResponse({
+            "status": "error",
+            "message": "No history store; run python history_store.py compact"
+        }, status_code=404)
+
+    store = HistoryStore(HISTORY_DIR)
+    try:
+        rows = store.select([column], start, end, ticker=ticker)
+    except (KeyError, ValueError) as e:
+        # unknown column, or a start/end that is not a date
+        return JSONResponse({"status": "error", "message": e.args[0]}, status_code=400)
+
+    return JSONResponse({
+        "ticker": ticker.upper(),
+        "column": column,
+        "dates": [str(d) for d in rows["date"]],
+        "values": store.to_list(column, rows[column])
+    })
+
+
+@app.get("/api/events")
+async def event_stream(request: Request):
+    """
+    Server-sent events for live dashboards: scan_progress, scan_stage, job and brief
+    Reconnecting clients send Last-Event-ID and are replayed what they missed.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    return StreamingResponse(
+        events.stream(int(last_event_id) if last_event_id.isdigit() else None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/sample-data")
 async def get_sample_data():
     """Get sample data template for testing"""
@@ -0,0 +1,42 @@
+"""
+ECHOPULSE v3.0 Atomic File Writes
+Readers (the brief watcher, scanner reruns, the web UI) never see a half-written file
+"""
+
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, TextIO
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[TextIO]:
+    """
+    Text file handle whose content replaces path only if the block succeeds
+    (temp file beside path, fsynced, then renamed over it)
+    """
+    path = Path(path)
+    # Unique per writer, so concurrent writes of the same file don't share a temp
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: Path, text: str):
+    """Write text to path atomically"""
+    with atomic_writer(path) as f:
+        f.write(text)
+
+
+async def write_atomic_async(path: Path, text: str):
+    """write_atomic on a worker thread, keeping the event loop free"""
+    await asyncio.to_thread(write_atomic, path, text)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+ECHOPULSE v3.0 Backtest
+Replay archived scans through the analyzer and grade each pick against
+daily price history, using the exit plan from the brief
+
+    python backtest.py                       # every data/scan_*.json
+    python backtest.py --from 2025-10-01 --picks 3 --output backtest.json
+    python backtest.py --history data/history   # read the compacted store instead of JSON
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from analyzer import EchoPulseAnalyzer
+from history_store import HistoryStore
+
+
+OHLCV_FIELDS = ("date", "open", "high", "low", "close", "volume")
+
+# Exit plan from EchoPulseAnalyzer._format_primary_pick
+T1_GAIN = 0.20          # sell 50% at +20%, stop to breakeven
+T2_GAIN = 0.35          # sell 25% at +35%
+T1_FRACTION = 0.50
+T2_FRACTION = 0.25
+ENTRY_ZONE = (0.97, 1.02)
+# Time stop when the pick has no usable catalyst date
+DEFAULT_HOLD_DAYS = 10
+
+
+class OHLCVCache:
+    """Daily bars per ticker, cached as data/ohlcv/<TICKER>.csv"""
+
+    def __init__(self, cache_dir: Path = Path("data/ohlcv")):
+        self.cache_dir = Path(cache_dir)
+
+    def path(self, ticker: str) -> Path:
+        return self.cache_dir / f"{ticker.upper()}.csv"
+
+    def load(self, ticker: str) -> List[Dict[str, Any]]:
+        """Cached bars, oldest first (empty if never downloaded)"""
+        path = self.path(ticker)
+        if not path.exists():
+            return []
+        with open(path, "r", newline="") as f:
+            return [
+                {
+                    "date": row["date"],
+                    "open": float(row["open"]),
+                    "high": float(row["high"]),
+                    "low": float(row["low"]),
+                    "close": float(row["close"]),
+                    "volume": float(row["volume"] or 0)
+                }
+                for row in csv.DictReader(f)
+            ]
+
+    def covers(self, ticker: str, start: str, end: str) -> bool:
+        bars = self.load(ticker)
+        return bool(bars) and bars[0]["date"] <= start and bars[-1]["date"] >= end
+
+    def download(self, ticker: str, start: str, end: str):
+        """Fetch [start, end] from yfinance and merge it into the cache file"""
+        import yfinance as yf
+        from request_scheduler import shared_scheduler
+
+        # yfinance's end is exclusive
+        end_exclusive = (datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        frame = shared_scheduler.submit(
+            "yfinance",
+            lambda: yf.Ticker(ticker).history(start=start, end=end_exclusive, auto_adjust=False)
+        )
+
+        bars = {bar["date"]: bar for bar in self.load(ticker)}
+        for index, row in frame.iterrows():
+            date = index.strftime("%Y-%m-%d")
+            bars[date] = {
+                "date": date,
+                "open": float(row["Open"]),
+                "high": float(row["High"]),
+                "low": float(row["Low"]),
+                "close": float(row["Close"]),
+                "volume": float(row["Volume"])
+            }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path(ticker).with_suffix(".tmp")
+        with open(tmp, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=OHLCV_FIELDS)
+            writer.writeheader()
+            for date in sorted(bars):
+                writer.writerow(bars[date])
+        os.replace(tmp, self.path(ticker))
+
+    def ensure(self, needs: Dict[str, Tuple[str, str]]):
+        """Download every ticker whose cached history doesn't span (start, end)"""
+        for ticker, (start, end) in sorted(needs.items()):
+            if self.covers(ticker, start, end):
+                continue
+            try:
+                print(f"📥 {ticker}: {start} → {end}")
+                self.download(ticker, start, end)
+            except Exception as e:
+                print(f"⚠️  No price history for {ticker}: {e}")
+
+
+def scan_files(data_dir: Path = Path("data"), start: Optional[str] = None, end: Optional[str] = None) -> List[Path]:
+    """Archived scan snapshots in date order, optionally within [start, end]"""
+    files = []
+    for path in sorted(data_dir.glob("scan_*.json")):
+        date = path.stem.replace("scan_", "")
+        if (start and date < start) or (end and date > end):
+            continue
+        files.append(path)
+    return files
+
+
+@lru_cache(maxsize=4)
+def _history(history_dir: str) -> HistoryStore:
+    return HistoryStore(Path(history_dir))
+
+
+def scan_days(
+    data_dir: Path = Path("data"),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    history_dir: Optional[str] = None
+) -> List[str]:
+    """Archived scans to replay: dates in the history store, or scan_*.json paths"""
+    if history_dir:
+        return _history(history_dir).scan_dates(start, end)
+    return [str(path) for path in scan_files(data_dir, start, end)]
+
+
+def load_day(source: str, history_dir: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """(date, candidates) for one entry from scan_days()"""
+    if history_dir:
+        return source, _history(history_dir).day(source)
+    with open(source, "r") as f:
+        data = json.load(f)
+    return data.get("date") or Path(source).stem.replace("scan_", ""), data.get("candidates", [])
+
+
+def load_picks(
+    source: str,
+    picks: int = 1,
+    analyzer: Optional[EchoPulseAnalyzer] = None,
+    history_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """The day's top picks, exactly as the brief would have ranked them"""
+    date, candidates = load_day(source, history_dir)
+    ranked = (analyzer or EchoPulseAnalyzer()).rank(candidates, k=picks)
+    return [
+        {
+            "date": date,
+            "rank": i + 1,
+            "ticker": entry["data"]["ticker"],
+            "price": entry["data"].get("price", 0),
+            "catalyst_date": entry["data"].get("catalyst_date"),
+            "composite": round(entry["scores"]["composite"], 2)
+        }
+        for i, entry in enumerate(ranked)
+    ]
+
+
+def time_stop_date(pick: Dict[str, Any]) -> str:
+    """Exit-by date: the catalyst date, or DEFAULT_HOLD_DAYS calendar days out"""
+    catalyst = pick.get("catalyst_date")
+    try:
+        if catalyst and catalyst > pick["date"]:
+            datetime.strptime(catalyst, "%Y-%m-%d")
+            return catalyst
+    except ValueError:
+        pass
+    start = datetime.strptime(pick["date"], "%Y-%m-%d")
+    return (start + timedelta(days=DEFAULT_HOLD_DAYS)).strftime("%Y-%m-%d")
+
+
+def simulate_pick(pick: Dict[str, Any], bars: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Play the brief's exit plan over daily bars:
+      enter at the first open on/after the scan date if inside the entry zone
+      T1 (+20% of the scan price): sell 50%, stop moves to breakeven
+      T2 (+35%): sell 25%
+      time stop: everything left goes at the close on the exit-by date
+    A bar that reaches T1 can't also stop out at breakeven (intraday order is unknown).
+    """
+    result = {**pick, "outcome": "no_data", "return_pct": None}
+    price = pick["price"]
+    exit_by = time_stop_date(pick)
+    window = [bar for bar in bars if pick["date"] <= bar["date"] <= exit_by]
+    if not window or not price:
+        return result
+
+    entry = window[0]["open"]
+    low, high = price * ENTRY_ZONE[0], price * ENTRY_ZONE[1]
+    if not low <= entry <= high:
+        result.update(outcome="no_fill", entry=round(entry, 4))
+        return result
+
+    t1, t2 = price * (1 + T1_GAIN), price * (1 + T2_GAIN)
+    remaining = 1.0
+    realized = 0.0
+    t1_hit = t2_hit = False
+    stop = None
+    outcome = "time_stop"
+    exit_date = window[-1]["date"]
+
+    for bar in window:
+        hit_t1_today = False
+        if not t1_hit and bar["high"] >= t1:
+            realized += T1_FRACTION * (t1 / entry - 1)
+            remaining -= T1_FRACTION
+            t1_hit = hit_t1_today = True
+            stop = entry
+            outcome = "t1"
+        if t1_hit and not t2_hit and bar["high"] >= t2:
+            realized += T2_FRACTION * (t2 / entry - 1)
+            remaining -= T2_FRACTION
+            t2_hit = True
+            outcome = "t2"
+        if stop is not None and not hit_t1_today and bar["low"] <= stop:
+            # Remainder stopped at breakeven: adds nothing
+            remaining = 0.0
+            exit_date = bar["date"]
+            break
+
+    if remaining > 0:
+        realized += remaining * (window[-1]["close"] / entry - 1)
+
+    result.update(
+        outcome=outcome,
+        entry=round(entry, 4),
+        t1_hit=t1_hit,
+        t2_hit=t2_hit,
+        exit_date=exit_date,
+        return_pct=round(realized * 100, 3)
+    )
+    return result
+
+
+def backtest_day(source: str, cache_dir: str, picks: int, history_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """One archived scan: rank it, then grade each pick (runs in a worker process)"""
+    cache = OHLCVCache(Path(cache_dir))
+    return [
+        simulate_pick(pick, cache.load(pick["ticker"]))
+        for pick in load_picks(source, picks, history_dir=history_dir)
+    ]
+
+
+def summarize(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Hit rates and return stats over graded trades"""
+    filled = [t for t in trades if t["return_pct"] is not None]
+    returns = [t["return_pct"] for t in filled]
+    wins = [r for r in returns if r > 0]
+    losses = [r for r in returns if r <= 0]
+
+    def rate(count: int) -> float:
+        return round(count / len(filled) * 100, 1) if filled else 0.0
+
+    return {
+        "picks": len(trades),
+        "filled": len(filled),
+        "no_fill": sum(1 for t in trades if t["outcome"] == "no_fill"),
+        "no_data": sum(1 for t in trades if t["outcome"] == "no_data"),
+        "t1_hit_rate": rate(sum(1 for t in filled if t["t1_hit"])),
+        "t2_hit_rate": rate(sum(1 for t in filled if t["t2_hit"])),
+        "win_rate": rate(len(wins)),
+        "avg_return_pct": round(statistics.mean(returns), 3) if returns else 0.0,
+        "median_return_pct": round(statistics.median(returns), 3) if returns else 0.0,
+        "avg_win_pct": round(statistics.mean(wins), 3) if wins else 0.0,
+        "avg_loss_pct": round(statistics.mean(losses), 3) if losses else 0.0,
+        # Expected return per trade taken
+        "expectancy_pct": round(
+            (len(wins) / len(filled)) * (statistics.mean(wins) if wins else 0)
+            + (len(losses) / len(filled)) * (statistics.mean(losses) if losses else 0), 3
+        ) if filled else 0.0
+    }
+
+
+def run_backtest(
+    days: List[str],
+    cache: OHLCVCache,
+    picks: int = 1,
+    workers: Optional[int] = None,
+    offline: bool = False,
+    history_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """Fill the price cache (network, main process), then grade days in parallel"""
+    if not offline:
+        needs: Dict[str, Tuple[str, str]] = {}
+        for source in days:
+            for pick in load_picks(source, picks, history_dir=history_dir):
+                start, end = pick["date"], min(time_stop_date(pick), datetime.now().strftime("%Y-%m-%d"))
+                known = needs.get(pick["ticker"], (start, end))
+                needs[pick["ticker"]] = (min(known[0], start), max(known[1], end))
+        cache.ensure(needs)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        graded = pool.map(
+            backtest_day,
+            days,
+            [str(cache.cache_dir)] * len(days),
+            [picks] * len(days),
+            [history_dir] * len(days),
+            chunksize=max(1, len(days) // (workers * 4))
+        )
+        trades = [trade for day in graded for trade in day]
+
+    return {
+        "days": len(days),
+        "summary": summarize(trades),
+        "trades": trades
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest ECHOPULSE picks over archived scans")
+    parser.add_argument("--data-dir", default="data", help="where scan_*.json live")
+    parser.add_argument("--from", dest="start", help="first scan date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="last scan date (YYYY-MM-DD)")
+    parser.add_argument("--picks", type=int, default=1, help="grade the top N per day (default: the pick only)")
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--offline", action="store_true", help="use cached prices only")
+    parser.add_argument("--history", help="read scans from this compacted history store")
+    parser.add_argument("--output", help="write the full report JSON here")
+    args = parser.parse_args()
+
+    days = scan_days(Path(args.data_dir), args.start, args.end, args.history)
+    if not days:
+        print("No archived scans found")
+        return 1
+
+    cache = OHLCVCache(Path(args.data_dir) / "ohlcv")
+    report = run_backtest(
+        days, cache, picks=args.picks, workers=args.workers,
+        offline=args.offline, history_dir=args.history
+    )
+    summary = report["summary"]
+
+    print(f"📊 {report['days']} days, {summary['picks']} picks, {summary['filled']} filled")
+    print(f"   T1 hit rate: {summary['t1_hit_rate']}%  T2 hit rate: {summary['t2_hit_rate']}%")
+    print(f"   Win rate: {summary['win_rate']}%  Avg return: {summary['avg_return_pct']:+.2f}%  "
+          f"Expectancy: {summary['expectancy_pct']:+.2f}%")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Full report: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
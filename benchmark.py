@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+ECHOPULSE v3.0 Throughput Benchmarks
+Time scans and analysis on synthetic watchlists with simulated source latency
+
+    python benchmark.py                                   # 10, 100, 1000 tickers
+    python benchmark.py --sizes 10,100,1000,10000 --targets scan,analyze
+    python benchmark.py --compare benchmarks/2025-11-11_ab12cd3.json
+
+Every case runs in a fresh process so peak RSS is per case. Results are
+written as JSON under benchmarks/ (one file per run, tagged with the git
+commit) so runs can be diffed across commits.
+"""
+
+import argparse
+import io
+import json
+import random
+import resource
+import string
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Any
+
+
+TARGETS = ("scan", "mcp_scan", "analyze")
+DEFAULT_SIZES = (10, 100, 1000)
+RESULTS_DIR = Path("benchmarks")
+
+# Filler keys so synthetic info dicts weigh about as much as real ones (~150 fields)
+INFO_FILLER_FIELDS = 140
+
+
+def synthetic_tickers(count: int, seed: int = 0) -> List[str]:
+    """Distinct letter-only symbols (cashtag-matchable), 3-5 characters"""
+    rng = random.Random(seed)
+    tickers = set()
+    while len(tickers) < count:
+        length = rng.choice((3, 4, 4, 5))
+        tickers.add("".join(rng.choice(string.ascii_uppercase) for _ in range(length)))
+    return sorted(tickers)
+
+
+def build_session(tickers: List[str], with_searches: bool = False, seed: int = 0):
+    """A SourceSession covering every request a scan of `tickers` makes"""
+    from replay import SourceSession
+    from collectors import RedditBuzzCollector
+
+    rng = random.Random(seed)
+    session = SourceSession(recorded_at=time.time())
+    session.tickers = list(tickers)
+    now = session.recorded_at
+    catalyst_date = (datetime.fromtimestamp(now) + timedelta(days=7)).strftime("%Y-%m-%d")
+
+    for ticker in tickers:
+        price = round(rng.uniform(2, 400), 2)
+        info = {
+            "longName": f"{ticker} Holdings Inc.",
+            "currentPrice": price,
+            "marketCap": int(rng.uniform(5e7, 5e11)),
+            "volume": int(rng.uniform(1e5, 5e7)),
+            "sector": rng.choice(["Technology", "Healthcare", "Biotechnology", "Consumer Cyclical"]),
+            "revenueGrowth": rng.uniform(-0.3, 0.6),
+            "profitMargins": rng.uniform(-0.4, 0.4),
+            "operatingMargins": rng.uniform(-0.5, 0.4),
+            "debtToEquity": rng.uniform(0, 400),
+            "sharesOutstanding": int(rng.uniform(1e7, 5e9)),
+        }
+        for i in range(INFO_FILLER_FIELDS):
+            info[f"field{i}"] = rng.random()
+        session.info[ticker] = info
+        session.quotes[ticker] = {
+            "symbol": ticker,
+            "regularMarketPrice": price,
+            "regularMarketVolume": info["volume"],
+            "marketCap": info["marketCap"],
+            "longName": info["longName"],
+        }
+        session.catalysts[ticker] = {
+            "catalyst": "Earnings Report",
+            "catalyst_date": catalyst_date,
+            "rumor": "Market expects positive guidance",
+            "rumor_confidence": rng.choice((1, 2, 3)),
+            "sources": ["https://finance.yahoo.com/calendar/earnings"],
+        }
+
+    subreddits = RedditBuzzCollector.SUBREDDITS
+    for sub_name in subreddits:
+        # 1000 newest posts over the past week, listed newest first in pages of 100
+        posts = []
+        for i in range(1000):
+            tags = " ".join(f"${t}" for t in rng.sample(tickers, min(len(tickers), rng.randint(1, 3))))
+            posts.append({
+                "fullname": f"t3_{sub_name}{i}",
+                "title": f"{tags} looking strong",
+                "selftext": "",
+                "created_utc": now - i * 600,
+            })
+        after = None
+        for page_start in range(0, len(posts), 100):
+            params = {"limit": 100, "params": {"after": after} if after else {}}
+            page = posts[page_start:page_start + 100]
+            session.listings[SourceSession.listing_key(sub_name, "new", params)] = page
+            after = page[-1]["fullname"]
+
+        if with_searches:
+            for ticker in tickers:
+                for time_filter, limit, window in (("day", 100, 86400), ("hour", 50, 3600), ("week", 200, 604800)):
+                    params = {"query": f"${ticker}", "time_filter": time_filter, "limit": limit}
+                    hits = [
+                        {"fullname": f"t3_{ticker}{j}", "title": f"${ticker}", "selftext": "",
+                         "created_utc": now - rng.uniform(0, window)}
+                        for j in range(rng.randint(0, 5))
+                    ]
+                    session.listings[SourceSession.listing_key(sub_name, "search", params)] = hits
+
+    return session
+
+
+def synthetic_scan_data(tickers: List[str], seed: int = 0) -> Dict[str, Any]:
+    """Scan JSON in the collector output shape, for analyzer runs"""
+    rng = random.Random(seed)
+    candidates = []
+    for ticker in tickers:
+        candidates.append({
+            "ticker": ticker,
+            "name": f"{ticker} Holdings Inc.",
+            "price": round(rng.uniform(2, 400), 2),
+            "market_cap": int(rng.uniform(5e7, 5e11)),
+            "volume": int(rng.uniform(1e5, 5e7)),
+            "sector": rng.choice(["Technology", "Healthcare", "Biotechnology"]),
+            "mentions_24h": rng.randint(0, 800),
+            "buzz_ratio": round(rng.uniform(0.2, 6.0), 2),
+            "velocity_1h": rng.randint(0, 120),
+            "platforms": ["reddit", "twitter", "stocktwits"][:rng.randint(1, 3)],
+            "catalyst": "Earnings Report",
+            "catalyst_date": "2025-11-18",
+            "rumor": "Market expects positive guidance",
+            "rumor_confidence": rng.choice((1, 2, 3)),
+            "sources": ["https://finance.yahoo.com/calendar/earnings"],
+            "fundamentals": {
+                "revenue_growing": rng.random() > 0.4,
+                "profitable": rng.random() > 0.5,
+                "path_to_profit": rng.random() > 0.3,
+                "red_flags": rng.random() > 0.8,
+                "debt_manageable": rng.random() > 0.3,
+                "dilution_ok": True,
+            },
+            "health_score": rng.randint(0, 5),
+        })
+    return {"date": datetime.now().strftime("%Y-%m-%d"), "candidates": candidates}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_case(target: str, size: int, latency: Dict[str, float], workers: int, seed: int) -> Dict[str, Any]:
+    """One benchmark case; runs inside its own process"""
+    from request_scheduler import RequestScheduler
+    from replay import SessionReplayer
+
+    tickers = synthetic_tickers(size, seed)
+    per_ticker: List[float] = []
+    started = time.perf_counter()
+
+    if target == "analyze":
+        from analyzer import EchoPulseAnalyzer
+
+        data = synthetic_scan_data(tickers, seed)
+        analyzer = EchoPulseAnalyzer()
+        repeats = 5
+        started = time.perf_counter()
+        for _ in range(repeats):
+            run_started = time.perf_counter()
+            analyzer.analyze(data)
+            per_ticker.append((time.perf_counter() - run_started) / size)
+        elapsed = (time.perf_counter() - started) / repeats
+        candidates = size
+    else:
+        from scan_engine import ScanEngine
+
+        if target == "mcp_scan":
+            from collectors_mcp import MCPDataAggregator
+            aggregator = MCPDataAggregator(engine=ScanEngine(max_workers=workers))
+        else:
+            from collectors import DataAggregator
+            aggregator = DataAggregator(engine=ScanEngine(max_workers=workers))
+
+        session = build_session(tickers, with_searches=(target == "mcp_scan"), seed=seed)
+        unthrottled = RequestScheduler(rate_limits={s: (1e9, 1e9) for s in ("yfinance", "reddit", "news")})
+        SessionReplayer(session, latency=latency, seed=seed).install(aggregator, scheduler=unthrottled)
+
+        collect = aggregator.collect_candidate_data
+
+        def timed_collect(ticker, *args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return collect(ticker, *args, **kwargs)
+            finally:
+                per_ticker.append(time.perf_counter() - t0)
+
+        aggregator.collect_candidate_data = timed_collect
+
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            data = aggregator.scan_watchlist(tickers)
+        elapsed = time.perf_counter() - started
+        candidates = len(data["candidates"])
+
+    return {
+        "target": target,
+        "tickers": size,
+        "candidates": candidates,
+        "seconds": round(elapsed, 4),
+        "tickers_per_sec": round(size / elapsed, 1) if elapsed else None,
+        "p50_ms": round(_percentile(per_ticker, 50) * 1000, 3),
+        "p99_ms": round(_percentile(per_ticker, 99) * 1000, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: List[Dict[str, Any]], baseline_file: Path):
+    """Print tickers/sec and p99 changes against a previous results file"""
+    with open(baseline_file, "r") as f:
+        baseline = {(r["target"], r["tickers"]): r for r in json.load(f)["results"]}
+
+    print(f"\nvs {baseline_file}:")
+    for result in results:
+        before = baseline.get((result["target"], result["tickers"]))
+        if not before or not before.get("tickers_per_sec"):
+            continue
+        speed = (result["tickers_per_sec"] / before["tickers_per_sec"] - 1) * 100
+        print(f"  {result['target']:>9} x{result['tickers']:<6} "
+              f"throughput {speed:+.1f}%  p99 {before['p99_ms']}ms -> {result['p99_ms']}ms")
+
+
+def main():
+    from replay import DEFAULT_LATENCY, _parse_latency
+
+    parser = argparse.ArgumentParser(description="ECHOPULSE collector / analyzer benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated watchlist sizes (10 to 10000)")
+    parser.add_argument("--targets", default=",".join(TARGETS),
+                        help=f"comma-separated subset of {','.join(TARGETS)}")
+    parser.add_argument("--latency-scale", type=float, default=0.02,
+                        help="multiplier on recorded per-source latency (default: 0.02)")
+    parser.add_argument("--latency", help="override per-source seconds, e.g. yfinance=0.01")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file (default: benchmarks/<date>_<commit>.json)")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    targets = [t for t in args.targets.split(",") if t]
+    latency = {source: seconds * args.latency_scale for source, seconds in DEFAULT_LATENCY.items()}
+    latency.update(_parse_latency(args.latency))
+
+    results = []
+    for target in targets:
+        for size in sizes:
+            # Fresh interpreter per case so peak RSS belongs to this case alone
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(run_case, target, size, latency, args.workers, args.seed).result()
+            results.append(result)
+            print(f"{target:>9} x{size:<6} {result['seconds']:>9.3f}s  "
+                  f"{result['tickers_per_sec']:>10} tickers/s  "
+                  f"p50 {result['p50_ms']}ms  p99 {result['p99_ms']}ms  "
+                  f"rss {result['peak_rss_mb']}MB")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y-%m-%d}_{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "run_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "workers": args.workers,
+            "latency": latency,
+            "results": results,
+        }, f, indent=2)
+    print(f"\n✅ Results written to {output}")
+
+    if args.compare:
+        compare(results, Path(args.compare))
+
+
+if __name__ == "__main__":
+    main()
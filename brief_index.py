@@ -0,0 +1,223 @@
+"""
+ECHOPULSE v3.0 Brief Index
+In-memory listing and content cache for briefs/, kept current by the app's
+own writes and by a polling watcher for external writers (scanner.py)
+"""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from atomic_io import write_atomic
+from metrics import METRICS
+
+
+BRIEF_PREFIX = "morning_brief_"
+BRIEF_SUFFIX = ".md"
+
+METRICS.describe("echopulse_brief_index_rescans_total", "Full rescans of the briefs directory")
+METRICS.describe("echopulse_brief_index_reads_total", "Brief contents read from disk")
+
+
+class BriefIndex:
+    """
+    Metadata for every brief plus the content of the most recently used ones.
+    The watcher stats the directory each poll (creates, deletes and renames
+    change its mtime) and the few briefs whose content is cached (in-place
+    rewrites don't), so requests never touch the filesystem for a listing.
+    on_change is called with a brief's listing entry whenever one is written
+    or turns up new or changed on disk (from the watcher thread for those).
+    """
+
+    def __init__(
+        self,
+        briefs_dir: Path = Path("briefs"),
+        poll_interval: float = 2.0,
+        max_cached: int = 30,
+        on_change: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.briefs_dir = Path(briefs_dir)
+        self.poll_interval = poll_interval
+        self.max_cached = max_cached
+        self.on_change = on_change
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dates: List[str] = []                                    # newest first
+        self._content: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()  # date -> (mtime_ns, text)
+        self._dir_mtime: Optional[int] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def path(self, date: str) -> Path:
+        return self.briefs_dir / f"{BRIEF_PREFIX}{date}{BRIEF_SUFFIX}"
+
+    def refresh(self):
+        """Rescan the directory, dropping cached content that changed on disk"""
+        entries: Dict[str, Dict[str, Any]] = {}
+        dir_mtime = os.stat(self.briefs_dir).st_mtime_ns
+        with os.scandir(self.briefs_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not (name.startswith(BRIEF_PREFIX) and name.endswith(BRIEF_SUFFIX)):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                date = name[len(BRIEF_PREFIX):-len(BRIEF_SUFFIX)]
+                entries[date] = {
+                    "filename": name,
+                    "date": date,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns
+                }
+
+        with self._lock:
+            # The first load isn't news; later rescans report new or rewritten briefs
+            changed = [
+                date for date, entry in entries.items()
+                if self._loaded and self._entries.get(date, {}).get("mtime_ns") != entry["mtime_ns"]
+            ] if self.on_change else []
+            self._entries = entries
+            self._dates = sorted(entries, reverse=True)
+            for date, (mtime_ns, _) in list(self._content.items()):
+                if date not in entries or entries[date]["mtime_ns"] != mtime_ns:
+                    del self._content[date]
+            self._dir_mtime = dir_mtime
+            self._loaded = True
+        METRICS.inc("echopulse_brief_index_rescans_total")
+        for date in sorted(changed):
+            self._notify(date)
+
+    def poll(self):
+        """One watcher tick: rescan if the directory changed, else recheck cached briefs"""
+        try:
+            if os.stat(self.briefs_dir).st_mtime_ns != self._dir_mtime:
+                self.refresh()
+                return
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            watched = list(dict.fromkeys(list(self._content) + self._dates[:1]))
+        for date in watched:
+            try:
+                stat = os.stat(self.path(date))
+            except FileNotFoundError:
+                self.refresh()
+                return
+            with self._lock:
+                entry = self._entries.get(date)
+                changed = entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size
+                if changed:
+                    self._entries[date] = {**(entry or {}), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                    self._content.pop(date, None)
+            if changed:
+                self._notify(date)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.refresh()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Briefs newest first, as {"filename", "date", "size"}"""
+        self._ensure_loaded()
+        with self._lock:
+            return [
+                {key: self._entries[date][key] for key in ("filename", "date", "size")}
+                for date in self._dates
+            ]
+
+    def latest(self) -> Optional[str]:
+        """Date of the newest brief"""
+        self._ensure_loaded()
+        with self._lock:
+            return self._dates[0] if self._dates else None
+
+    def content(self, date: str) -> Optional[str]:
+        """A brief's markdown, from memory when cached"""
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(date)
+            if entry is None:
+                return None
+            cached = self._content.get(date)
+            if cached is not None and cached[0] == entry["mtime_ns"]:
+                self._content.move_to_end(date)
+                return cached[1]
+
+        try:
+            with open(self.path(date), "r") as f:
+                stat = os.fstat(f.fileno())
+                text = f.read()
+        except FileNotFoundError:
+            self.refresh()
+            return None
+        METRICS.inc("echopulse_brief_index_reads_total")
+        self._remember(date, stat, text)
+        return text
+
+    def write(self, date: str, content: str) -> Path:
+        """Write a brief atomically and index it without waiting for the watcher"""
+        self.briefs_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(date)
+        write_atomic(path, content)
+        self._remember(date, os.stat(path), content)
+        self._notify(date)
+        return path
+
+    async def write_async(self, date: str, content: str) -> Path:
+        """write() on a worker thread, for async handlers"""
+        return await asyncio.to_thread(self.write, date, content)
+
+    def _remember(self, date: str, stat: os.stat_result, text: str):
+        """Cache content read or written at this stat, updating the entry to match"""
+        with self._lock:
+            self._entries[date] = {
+                "filename": f"{BRIEF_PREFIX}{date}{BRIEF_SUFFIX}",
+                "date": date,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns
+            }
+            if date not in self._dates:
+                self._dates = sorted(self._entries, reverse=True)
+            self._content[date] = (stat.st_mtime_ns, text)
+            self._content.move_to_end(date)
+            while len(self._content) > self.max_cached:
+                self._content.popitem(last=False)
+
+    def _notify(self, date: str):
+        if self.on_change is None:
+            return
+        with self._lock:
+            entry = self._entries.get(date)
+            if entry is None:
+                return
+            listing = {"filename": self.path(date).name, "date": date, "size": entry["size"]}
+        self.on_change(listing)
+
+    def start(self):
+        """Load the index and start the polling watcher thread"""
+        self.refresh()
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="brief-index-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️  Brief index watcher: {e}")
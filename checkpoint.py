@@ -0,0 +1,59 @@
+"""
+ECHOPULSE v3.0 Scan Checkpoints
+Append-only NDJSON of candidates, written as each ticker finishes
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Set
+
+
+def iter_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one record per line
+    A torn final line (crash mid-write) is skipped, not fatal
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable checkpoint line in {path.name}")
+
+
+class ScanCheckpoint:
+    """Candidates collected so far for one scan day"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def reset(self):
+        """Start a fresh checkpoint"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        open(self.path, "w").close()
+
+    def append(self, candidate: Dict[str, Any]):
+        """Persist one candidate immediately (flushed and fsynced)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(candidate, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> List[Dict[str, Any]]:
+        """All checkpointed candidates (latest record wins per ticker)"""
+        by_ticker = {}
+        for candidate in iter_ndjson(self.path):
+            by_ticker[candidate.get("ticker")] = candidate
+        return list(by_ticker.values())
+
+    def tickers(self) -> Set[str]:
+        """Tickers already collected"""
+        return {c.get("ticker") for c in iter_ndjson(self.path)}
@@ -0,0 +1,204 @@
+"""
+ECHOPULSE v3.0 Circuit Breakers
+Fail fast on a degraded source instead of paying its timeout for every ticker
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from metrics import METRICS
+from request_scheduler import RateLimited, throttle_delay
+
+
+# (consecutive failures before opening, cool-down seconds) per collector
+DEFAULT_BREAKER_SETTINGS = {
+    "stock": (5, 60),
+    "fundamentals": (5, 60),
+    "reddit": (3, 120),
+    "tavily": (3, 60),
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+METRICS.describe("echopulse_circuit_rejections_total", "Calls skipped because a breaker was open")
+
+
+class CircuitOpenError(Exception):
+    """The source's breaker is open; the call was not attempted"""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"{name} circuit open, retrying in {retry_in:.0f}s")
+
+
+def is_source_failure(error: Exception) -> bool:
+    """
+    Whether error says the source itself is unhealthy: a transport error,
+    a timeout, an HTTP 5xx or a 429. Anything else (a 404 for an unknown
+    symbol, an empty or unparseable payload, a replay miss) is about the
+    request, not the source, and leaves the breaker alone.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, RateLimited) or throttle_delay(error) is not None:
+            return True
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status >= 500
+        # OSError covers socket errors, TimeoutError and requests' exceptions;
+        # httpx and prawcore transport errors are matched by name
+        if isinstance(error, OSError):
+            return True
+        if any(cls.__name__ in ("TransportError", "TimeoutException", "RequestException")
+               for cls in type(error).__mro__):
+            return True
+        # prawcore wraps the transport error it caught
+        error = getattr(error, "original_exception", None) or error.__cause__
+    return False
+
+
+class CircuitBreaker:
+    """
+    closed    -> calls go through; failure_threshold failures in a row opens it
+    open      -> calls raise CircuitOpenError until cooldown has passed
+    half_open -> up to half_open_probes calls go through as probes;
+                 a success closes the breaker, a failure reopens it
+    Only errors is_source_failure() accepts count as failures.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        half_open_probes: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.half_open_probes = max(1, half_open_probes)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn through the breaker, recording its outcome"""
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) through the breaker"""
+        self._before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            self._record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                retry_in = self._opened_at + self.cooldown - time.monotonic()
+                if retry_in > 0:
+                    self._reject(retry_in)
+                self.state = HALF_OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+                print(f"🔌 {self.name} circuit half-open, probing")
+
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    # A probe abandoned by a scan timeout never reports back
+                    retry_in = self._opened_at + self.cooldown - time.monotonic()
+                    if retry_in > 0:
+                        self._reject(retry_in)
+                    self._opened_at = time.monotonic()
+                    self._probes = 0
+                self._probes += 1
+
+    def _reject(self, retry_in: float):
+        self.rejected += 1
+        METRICS.inc("echopulse_circuit_rejections_total", breaker=self.name)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def _record_error(self, error: Exception):
+        if is_source_failure(error):
+            self.record_failure(error)
+        else:
+            self.record_neutral()
+
+    def record_neutral(self):
+        """The source answered, just not usefully: free a probe slot, keep the count"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                print(f"🔌 {self.name} circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)[:200]
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                    print(f"🔌 {self.name} circuit open after {self.failures} failures: {self.last_error}")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for scan metadata"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.opened,
+                "calls_skipped": self.rejected,
+                "last_error": self.last_error
+            }
+
+
+class CircuitBreakers:
+    """One breaker per collector, created on first use"""
+
+    def __init__(self, settings: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.settings = {**DEFAULT_BREAKER_SETTINGS, **(settings or {})}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                threshold, cooldown = self.settings.get(name, (5, 60))
+                breaker = self._breakers[name] = CircuitBreaker(name, threshold, cooldown)
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -4,20 +4,90 @@ Automated data collection from multiple sources
 """
 
 import yfinance as yf
+from yfinance.data import YfData
 import praw
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Set, Callable, Tuple
 import os
+import re
+import time
 from collections import defaultdict
 
+from scan_engine import ScanEngine, SourceTimeout
+from info_cache import TickerInfoCache
+from mention_store import MentionStore
+from request_scheduler import RequestScheduler, RateLimited, shared_scheduler
+from circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError
+from metrics import METRICS
+
+
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+
+
+def fetch_ticker_info(ticker: str) -> Dict[str, Any]:
+    """Fetch the raw yfinance info payload (the slow network call)"""
+    return yf.Ticker(ticker).info
+
+
+def fetch_quote_batch(tickers: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch quote rows for many symbols in one request
+    Uses Yahoo's multi-symbol quote endpoint through yfinance's session
+    """
+    response = YfData().get_raw_json(
+        QUOTE_URL,
+        params={"symbols": ",".join(tickers), "formatted": "false"}
+    )
+    return (response.get("quoteResponse") or {}).get("result") or []
+
+
+def call_direct(source: str, fn: Callable[..., Any], *args) -> Any:
+    """Unbounded stand-in for ScanEngine.call"""
+    return fn(*args)
+
+
+def stock_data_from_info(ticker: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a yfinance info payload to the stock data shape"""
+    return {
+        "ticker": ticker,
+        "name": info.get("longName", ticker),
+        "price": info.get("currentPrice") or info.get("regularMarketPrice", 0),
+        "market_cap": info.get("marketCap", 0),
+        "volume": info.get("volume", 0),
+        "sector": info.get("sector", "Unknown")
+    }
+
+
+def stock_data_from_quote(ticker: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a bulk quote row to the stock data shape"""
+    return {
+        "ticker": ticker,
+        "name": row.get("longName") or row.get("shortName") or ticker,
+        "price": row.get("regularMarketPrice", 0),
+        "market_cap": row.get("marketCap", 0),
+        "volume": row.get("regularMarketVolume", 0),
+        "sector": "Unknown"  # not in the quote endpoint, filled from info later
+    }
+
 
 class StockDataCollector:
     """Collect stock price and volume data via yfinance"""
 
-    def __init__(self):
-        self.cache = {}
+    def __init__(
+        self,
+        cache: Optional[TickerInfoCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         self.cache_duration = 300  # 5 minutes
+        self.cache = cache or TickerInfoCache(ttls={"quote": self.cache_duration})
+        self.scheduler = scheduler or shared_scheduler
+        self.breaker = breaker or CircuitBreaker("stock")
+        # Raw network calls (swapped out by replay.py)
+        self.info_fetcher = fetch_ticker_info
+        self.quote_fetcher = fetch_quote_batch
 
     def get_stock_data(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -25,49 +95,165 @@ class StockDataCollector:
         Returns: price, market_cap, volume, or None if failed
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-
-            return {
-                "ticker": ticker,
-                "name": info.get("longName", ticker),
-                "price": info.get("currentPrice") or info.get("regularMarketPrice", 0),
-                "market_cap": info.get("marketCap", 0),
-                "volume": info.get("volume", 0),
-                "sector": info.get("sector", "Unknown")
-            }
+            info = self.cache.get_or_fetch(ticker, "quote", self._fetch_info)
+            return stock_data_from_info(ticker, info)
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Error fetching {ticker}: {e}")
             return None
 
-    def get_multiple_stocks(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Batch fetch multiple tickers"""
+    def get_multiple_stocks(
+        self,
+        tickers: List[str],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+        call: Callable[..., Any] = call_direct
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Batch fetch multiple tickers
+        Quotes come from chunked bulk requests; only symbols the bulk
+        response leaves out are fetched one at a time.
+        Every request goes through call(source, fn, *args), e.g. ScanEngine.call
+        to bound it; a timed-out request just leaves its tickers out.
+        """
+        chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+        wanted = {ticker.upper(): ticker for ticker in tickers}
         results = {}
-        for ticker in tickers:
-            data = self.get_stock_data(ticker)
+
+        def fetch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+            try:
+                return call("yfinance", self._fetch_quote_chunk, chunk)
+            except SourceTimeout as e:
+                print(f"Bulk quote timeout for {chunk[0]}..{chunk[-1]}: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for rows in pool.map(fetch_chunk, chunks):
+                for row in rows:
+                    ticker = wanted.get(str(row.get("symbol", "")).upper())
+                    if ticker and row.get("regularMarketPrice"):
+                        results[ticker] = stock_data_from_quote(ticker, row)
+
+        missing = [ticker for ticker in tickers if ticker not in results]
+        if missing:
+            print(f"Bulk quotes missed {len(missing)} tickers, fetching individually")
+        for ticker in missing:
+            try:
+                data = call("yfinance", self.get_stock_data, ticker)
+            except (SourceTimeout, CircuitOpenError) as e:
+                # Only this ticker; a half-open breaker may let the next one probe
+                print(f"Skipping {ticker}: {e}")
+                continue
             if data:
                 results[ticker] = data
+
         return results
 
+    def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        return self.breaker.call(self.scheduler.submit, "yfinance", self.info_fetcher, ticker)
+
+    def _fetch_quote_chunk(self, chunk: List[str]) -> List[Dict[str, Any]]:
+        try:
+            return self.breaker.call(self.scheduler.submit, "yfinance", self.quote_fetcher, chunk)
+        except Exception as e:
+            print(f"Bulk quote error for {chunk[0]}..{chunk[-1]}: {e}")
+            return []
+
+
+# $NVDA, $brk.b - case-insensitive like Reddit search
+CASHTAG_PATTERN = re.compile(r"\$([A-Za-z]{1,10}(?:[.\-][A-Za-z]{1,2})?)\b")
+
+# Days in the mention baseline buzz_ratio compares the last 24h against
+BASELINE_DAYS = 7
+
+
+def baseline_scale(sub_name: str, now: float, walk: Dict[str, Any]) -> float:
+    """
+    Factor bringing mentions counted on one subreddit walk up to the full
+    BASELINE_DAYS: 1 if the walk reached the window start, otherwise
+    BASELINE_DAYS over the days it did cover before Reddit's ~1000-post
+    listing cap (at least one day, below which the 24h count is cut short too)
+    """
+    if walk.get("complete", True) or walk.get("oldest") is None:
+        return 1.0
+    covered = (now - walk["oldest"]) / 86400
+    print(f"⚠️  r/{sub_name} listing capped: baseline covers {covered:.1f} of {BASELINE_DAYS} days, scaled up")
+    return BASELINE_DAYS / max(1.0, covered)
+
+
+def buzz_from_counts(mentions_24h: int, mentions_1h: int, mentions_7d: int) -> Dict[str, Any]:
+    """Turn raw mention counts into the buzz fields ECHOPULSE scores"""
+    # Calculate buzz ratio (current vs 7-day average)
+    avg_daily_mentions = mentions_7d / BASELINE_DAYS if mentions_7d > 0 else 1
+    buzz_ratio = mentions_24h / avg_daily_mentions if avg_daily_mentions > 0 else 1.0
+
+    return {
+        "mentions_24h": mentions_24h,
+        "buzz_ratio": round(buzz_ratio, 2),
+        "velocity_1h": mentions_1h,
+        "platforms": ["reddit"]
+    }
+
+
+def mock_reddit_data(ticker: str) -> Dict[str, Any]:
+    """Mock data when Reddit API not available"""
+    import random
+    return {
+        "mentions_24h": random.randint(10, 500),
+        "buzz_ratio": round(random.uniform(0.8, 4.0), 2),
+        "velocity_1h": random.randint(0, 100),
+        "platforms": ["reddit"]
+    }
+
+
+class CashtagMatcher:
+    """Match every watchlist cashtag (or, without a watchlist, every cashtag) in a single pass over a post"""
+
+    def __init__(self, tickers: Optional[List[str]] = None):
+        self.tickers = {ticker.upper() for ticker in tickers} if tickers is not None else None
+
+    def match(self, text: str) -> Set[str]:
+        """Tickers mentioned in text (each counted once per post)"""
+        if not text:
+            return set()
+        tags = {tag.upper() for tag in CASHTAG_PATTERN.findall(text)}
+        return tags if self.tickers is None else tags & self.tickers
+
 
 class RedditBuzzCollector:
     """Collect mentions and buzz from Reddit via PRAW"""
 
-    def __init__(self):
+    SUBREDDITS = ["wallstreetbets", "stocks", "investing", "stockmarket"]
+
+    def __init__(
+        self,
+        store: Optional[MentionStore] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         # Reddit API credentials from environment
         self.reddit = praw.Reddit(
             client_id=os.getenv("REDDIT_CLIENT_ID", ""),
             client_secret=os.getenv("REDDIT_CLIENT_SECRET", ""),
             user_agent=os.getenv("REDDIT_USER_AGENT", "ECHOPULSE/3.0")
         )
-        self.subreddits = ["wallstreetbets", "stocks", "investing", "stockmarket"]
+        self.subreddits = list(self.SUBREDDITS)
+        self.enabled = bool(os.getenv("REDDIT_CLIENT_ID"))
+        # With a store, scans only ingest posts newer than its watermarks
+        self.store = store
+        self.scheduler = scheduler or shared_scheduler
+        self.breaker = breaker or CircuitBreaker("reddit")
+        # Raw network call and time source (swapped out by replay.py)
+        self.listing_fetcher = self._fetch_praw_listing
+        self.clock = time.time
 
     def get_ticker_mentions(self, ticker: str, hours: int = 24) -> Dict[str, Any]:
         """
         Get mention count and buzz for a ticker over the last N hours
         Returns: mentions_24h, buzz_ratio, velocity_1h, platforms
         """
-        if not os.getenv("REDDIT_CLIENT_ID"):
+        if not self.enabled:
             # Return mock data if no Reddit credentials
             return self._mock_reddit_data(ticker)
 
@@ -78,48 +264,192 @@ class RedditBuzzCollector:
 
             # Search across multiple subreddits
             for sub_name in self.subreddits:
-                subreddit = self.reddit.subreddit(sub_name)
+                now = datetime.fromtimestamp(self.clock())
 
                 # Last 24 hours
-                time_filter_24h = datetime.now() - timedelta(hours=24)
-                for submission in subreddit.search(f"${ticker}", time_filter="day", limit=100):
+                time_filter_24h = now - timedelta(hours=24)
+                for submission in self._request(sub_name, "search", query=f"${ticker}", time_filter="day", limit=100):
                     if datetime.fromtimestamp(submission.created_utc) > time_filter_24h:
                         mentions_24h += 1
 
                 # Last 1 hour for velocity
-                time_filter_1h = datetime.now() - timedelta(hours=1)
-                for submission in subreddit.search(f"${ticker}", time_filter="hour", limit=50):
+                time_filter_1h = now - timedelta(hours=1)
+                for submission in self._request(sub_name, "search", query=f"${ticker}", time_filter="hour", limit=50):
                     if datetime.fromtimestamp(submission.created_utc) > time_filter_1h:
                         mentions_1h += 1
 
                 # Last 7 days for baseline
-                for submission in subreddit.search(f"${ticker}", time_filter="week", limit=200):
+                for submission in self._request(sub_name, "search", query=f"${ticker}", time_filter="week", limit=200):
                     mentions_7d += 1
 
-            # Calculate buzz ratio (current vs 7-day average)
-            avg_daily_mentions = mentions_7d / 7 if mentions_7d > 0 else 1
-            buzz_ratio = mentions_24h / avg_daily_mentions if avg_daily_mentions > 0 else 1.0
+            return buzz_from_counts(mentions_24h, mentions_1h, mentions_7d)
+
+        except (RateLimited, CircuitOpenError):
+            # Throttled past every retry, or known down: fail loudly rather than invent buzz
+            raise
+        except Exception as e:
+            print(f"Reddit API error for {ticker}: {e}")
+            return self._mock_reddit_data(ticker)
+
+    def get_watchlist_mentions(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Buzz for a whole watchlist from one read of each subreddit
+        Walks each subreddit's newest posts back 7 days and matches every
+        watchlist cashtag per post, so API calls scale with subreddits
+        (and their post volume), not with the number of tickers.
+        A subreddit whose walk stops at the listing cap before 7 days has its
+        baseline scaled to the span it covered (baseline_scale).
+        """
+        if not self.enabled:
+            return {ticker: self._mock_reddit_data(ticker) for ticker in tickers}
+
+        if self.store is not None:
+            return self._get_stored_mentions(tickers)
+
+        try:
+            now = self.clock()
+            since_7d = now - 7 * 24 * 3600
+            since_24h = now - 24 * 3600
+            since_1h = now - 3600
+
+            matcher = CashtagMatcher(tickers)
+            counts = {ticker.upper(): [0, 0, 0] for ticker in tickers}  # 24h, 1h, 7d
+
+            for sub_name in self.subreddits:
+                walk: Dict[str, Any] = {}
+                week = dict.fromkeys(counts, 0)
+                for submission in self._iter_recent_posts(sub_name, since_7d, walk=walk):
+                    created = submission.created_utc
+                    text = f"{submission.title}\n{submission.selftext}"
+                    for ticker in matcher.match(text):
+                        bucket = counts[ticker]
+                        week[ticker] += 1
+                        if created > since_24h:
+                            bucket[0] += 1
+                        if created > since_1h:
+                            bucket[1] += 1
+
+                scale = baseline_scale(sub_name, now, walk)
+                for ticker, mentions in week.items():
+                    counts[ticker][2] += mentions * scale
 
             return {
-                "mentions_24h": mentions_24h,
-                "buzz_ratio": round(buzz_ratio, 2),
-                "velocity_1h": mentions_1h,
-                "platforms": ["reddit"]
+                ticker: buzz_from_counts(*counts[ticker.upper()])
+                for ticker in tickers
             }
 
+        except (RateLimited, CircuitOpenError):
+            raise
         except Exception as e:
-            print(f"Reddit API error for {ticker}: {e}")
-            return self._mock_reddit_data(ticker)
+            print(f"Reddit API error for watchlist scan: {e}")
+            return {ticker: self._mock_reddit_data(ticker) for ticker in tickers}
+
+    def _get_stored_mentions(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Ingest posts newer than each subreddit's watermark into the store,
+        then read 1h / 24h / 7d counts back from its buckets. Every cashtag in
+        a post is recorded, not just this watchlist's: the watermark is per
+        subreddit, so a ticker added later (or missing from today's quotes)
+        is still answered from posts already ingested. When the listing cap
+        stops a walk short of the watermark, the unread span is flagged as a
+        gap in the store (its baseline is scaled over it, see buzz_counts).
+        """
+        try:
+            now = self.clock()
+            matcher = CashtagMatcher()
+
+            for sub_name in self.subreddits:
+                since = max(self.store.watermark(sub_name) or 0, now - 7 * 24 * 3600)
+                newest = since
+                hits = []
+                walk: Dict[str, Any] = {}
+                for submission in self._iter_recent_posts(sub_name, since, walk=walk):
+                    created = submission.created_utc
+                    newest = max(newest, created)
+                    text = f"{submission.title}\n{submission.selftext}"
+                    hits.extend((ticker, created) for ticker in matcher.match(text))
+
+                # Commit a subreddit only once fully read, so a failed
+                # pass is retried next scan instead of double counted
+                for ticker, created in hits:
+                    self.store.record(ticker, sub_name, created)
+                if not walk["complete"] and walk["oldest"] is not None:
+                    print(f"⚠️  r/{sub_name} listing capped: posts between the last scan and "
+                          f"{datetime.fromtimestamp(walk['oldest']):%Y-%m-%d %H:%M} were not read")
+                    self.store.add_gap(sub_name, since, walk["oldest"])
+                self.store.set_watermark(sub_name, newest)
+
+            self.store.save()
+
+        except (RateLimited, CircuitOpenError):
+            # Persist the subreddits that did finish, then surface the throttle
+            self.store.save()
+            raise
+        except Exception as e:
+            # Keep what was ingested; counts below reflect it
+            print(f"Reddit API error while updating mention store: {e}")
+
+        results = {}
+        for ticker in tickers:
+            counts = self.store.buzz_counts(ticker, now)
+            results[ticker] = buzz_from_counts(
+                counts["mentions_24h"], counts["mentions_1h"], counts["mentions_7d"]
+            )
+        return results
+
+    def _iter_recent_posts(
+        self,
+        sub_name: str,
+        since: float,
+        max_pages: int = 10,
+        walk: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        """
+        Newest-first submissions posted after `since`, one listing page per request
+        Reddit stops listings at ~1000 posts, hence max_pages. walk, if given,
+        gets "oldest" (created_utc of the last post yielded) and "complete"
+        (False when the cap ended the walk before `since`).
+        """
+        walk = walk if walk is not None else {}
+        walk.update(oldest=None, complete=False)
+        after = None
+
+        for _ in range(max_pages):
+            params = {"after": after} if after else {}
+            page = self._request(sub_name, "new", limit=100, params=params)
+            for submission in page:
+                if submission.created_utc <= since:
+                    walk["complete"] = True
+                    return
+                walk["oldest"] = submission.created_utc
+                yield submission
+            if len(page) < 100:
+                walk["complete"] = True
+                return
+            after = page[-1].fullname
+
+    def _request(self, sub_name: str, kind: str, **params) -> List[Any]:
+        """
+        Fetch one Reddit listing page ("new" or "search") through the shared
+        scheduler, then re-pace the scheduler from the quota Reddit reported back
+        """
+        page = self.breaker.call(self.scheduler.submit, "reddit", self.listing_fetcher, sub_name, kind, params)
+
+        limits = getattr(self.reddit.auth, "limits", None) or {}
+        if limits.get("reset_timestamp") is not None:
+            self.scheduler.update_quota(
+                "reddit",
+                limits.get("remaining"),
+                limits["reset_timestamp"] - time.time()
+            )
+        return page
+
+    def _fetch_praw_listing(self, sub_name: str, kind: str, params: Dict[str, Any]) -> List[Any]:
+        listing = getattr(self.reddit.subreddit(sub_name), kind)
+        return list(listing(**params))
 
     def _mock_reddit_data(self, ticker: str) -> Dict[str, Any]:
-        """Mock data when Reddit API not available"""
-        import random
-        return {
-            "mentions_24h": random.randint(10, 500),
-            "buzz_ratio": round(random.uniform(0.8, 4.0), 2),
-            "velocity_1h": random.randint(0, 100),
-            "platforms": ["reddit"]
-        }
+        return mock_reddit_data(ticker)
 
 
 class NewsCollector:
@@ -148,137 +478,288 @@ class NewsCollector:
         }
 
 
+# Worst-case fundamentals when the info payload could not be scored
+FAILED_FUNDAMENTALS = {
+    "revenue_growing": False,
+    "profitable": False,
+    "path_to_profit": False,
+    "red_flags": True,
+    "debt_manageable": False,
+    "dilution_ok": False,
+    "health_score": 0
+}
+
+
+def fundamentals_from_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Score basic fundamental health (0-5) from a yfinance info payload"""
+    # Revenue growth
+    revenue_growth = info.get("revenueGrowth", 0)
+    revenue_growing = revenue_growth > 0
+
+    # Profitability
+    profit_margin = info.get("profitMargins", 0)
+    profitable = profit_margin > 0
+
+    # Path to profit (for unprofitable companies)
+    operating_margin = info.get("operatingMargins", -1)
+    path_to_profit = operating_margin > -0.2  # Improving margins
+
+    # Debt
+    debt_to_equity = info.get("debtToEquity", 0)
+    debt_manageable = debt_to_equity < 200  # < 2x equity
+
+    # Dilution (simplified check)
+    shares_outstanding = info.get("sharesOutstanding", 0)
+    dilution_ok = True  # Would need historical data for real check
+
+    # Red flags
+    red_flags = (
+        debt_to_equity > 300 or  # Excessive debt
+        revenue_growth < -0.2  # Severe revenue decline
+    )
+
+    # Health score (0-5)
+    health_score = 0
+    if revenue_growing: health_score += 1
+    if profitable: health_score += 2
+    elif path_to_profit: health_score += 1
+    if not red_flags: health_score += 1
+    if debt_manageable: health_score += 1
+
+    return {
+        "revenue_growing": revenue_growing,
+        "profitable": profitable,
+        "path_to_profit": path_to_profit,
+        "red_flags": red_flags,
+        "debt_manageable": debt_manageable,
+        "dilution_ok": dilution_ok,
+        "health_score": min(5, health_score)
+    }
+
+
 class FundamentalsCollector:
     """Collect fundamental health metrics"""
 
+    def __init__(
+        self,
+        cache: Optional[TickerInfoCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.cache = cache or TickerInfoCache()
+        self.scheduler = scheduler or shared_scheduler
+        self.breaker = breaker or CircuitBreaker("fundamentals")
+        self.info_fetcher = fetch_ticker_info
+
     def get_fundamentals(self, ticker: str) -> Dict[str, Any]:
         """
         Get fundamental health check data
         Uses yfinance to assess basic fundamentals
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-
-            # Revenue growth
-            revenue_growth = info.get("revenueGrowth", 0)
-            revenue_growing = revenue_growth > 0
-
-            # Profitability
-            profit_margin = info.get("profitMargins", 0)
-            profitable = profit_margin > 0
-
-            # Path to profit (for unprofitable companies)
-            operating_margin = info.get("operatingMargins", -1)
-            path_to_profit = operating_margin > -0.2  # Improving margins
-
-            # Debt
-            debt_to_equity = info.get("debtToEquity", 0)
-            debt_manageable = debt_to_equity < 200  # < 2x equity
-
-            # Dilution (simplified check)
-            shares_outstanding = info.get("sharesOutstanding", 0)
-            dilution_ok = True  # Would need historical data for real check
-
-            # Red flags
-            red_flags = (
-                debt_to_equity > 300 or  # Excessive debt
-                revenue_growth < -0.2  # Severe revenue decline
-            )
-
-            # Health score (0-5)
-            health_score = 0
-            if revenue_growing: health_score += 1
-            if profitable: health_score += 2
-            elif path_to_profit: health_score += 1
-            if not red_flags: health_score += 1
-            if debt_manageable: health_score += 1
-
-            return {
-                "revenue_growing": revenue_growing,
-                "profitable": profitable,
-                "path_to_profit": path_to_profit,
-                "red_flags": red_flags,
-                "debt_manageable": debt_manageable,
-                "dilution_ok": dilution_ok,
-                "health_score": min(5, health_score)
-            }
+            info = self.cache.get_or_fetch(ticker, "fundamentals", self._fetch_info)
+            return fundamentals_from_info(info)
 
+        except (RateLimited, CircuitOpenError):
+            # Zeroed fundamentals would silently fail the health gate
+            raise
         except Exception as e:
             print(f"Fundamentals error for {ticker}: {e}")
-            return {
-                "revenue_growing": False,
-                "profitable": False,
-                "path_to_profit": False,
-                "red_flags": True,
-                "debt_manageable": False,
-                "dilution_ok": False,
-                "health_score": 0
-            }
+            return dict(FAILED_FUNDAMENTALS)
+
+    def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        return self.breaker.call(self.scheduler.submit, "yfinance", self.info_fetcher, ticker)
+
+
+def prioritized(tickers: List[str], priority: Optional[Dict[str, float]]) -> List[str]:
+    """Tickers highest expected score first (unchanged without a priority map)"""
+    if not priority:
+        return list(tickers)
+    return sorted(tickers, key=lambda ticker: -priority.get(ticker, 0.0))
+
+
+def build_candidate(
+    stock_data: Dict[str, Any],
+    buzz_data: Optional[Dict[str, Any]],
+    catalyst_data: Optional[Dict[str, Any]],
+    fundamentals: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Combine per-source results into one candidate
+    A source that returned nothing is named under "missing" and its
+    fields are left absent, so it is never mistaken for a real zero
+    """
+    missing = []
+    if not buzz_data:
+        missing.append("buzz")
+    if not catalyst_data:
+        missing.append("catalyst")
+
+    candidate = {
+        **stock_data,
+        **(buzz_data or {}),
+        **(catalyst_data or {})
+    }
+
+    if fundamentals is None:
+        missing.append("fundamentals")
+    else:
+        candidate["fundamentals"] = {
+            "revenue_growing": fundamentals["revenue_growing"],
+            "profitable": fundamentals["profitable"],
+            "path_to_profit": fundamentals["path_to_profit"],
+            "red_flags": fundamentals["red_flags"],
+            "debt_manageable": fundamentals["debt_manageable"],
+            "dilution_ok": fundamentals["dilution_ok"]
+        }
+        candidate["health_score"] = fundamentals["health_score"]
+
+    if missing:
+        candidate["missing"] = missing
+    return candidate
 
 
 class DataAggregator:
     """Main aggregator that combines all data sources"""
 
-    def __init__(self):
-        self.stock_collector = StockDataCollector()
-        self.reddit_collector = RedditBuzzCollector()
+    def __init__(
+        self,
+        engine: Optional[ScanEngine] = None,
+        mention_store: Optional[MentionStore] = None
+    ):
+        # One info fetch per ticker serves both stock data and fundamentals
+        self.info_cache = TickerInfoCache()
+        self.breakers = CircuitBreakers()
+        self.stock_collector = StockDataCollector(cache=self.info_cache, breaker=self.breakers.get("stock"))
+        self.reddit_collector = RedditBuzzCollector(store=mention_store, breaker=self.breakers.get("reddit"))
         self.news_collector = NewsCollector()
-        self.fundamentals_collector = FundamentalsCollector()
-
-    def collect_candidate_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+        self.fundamentals_collector = FundamentalsCollector(
+            cache=self.info_cache,
+            breaker=self.breakers.get("fundamentals")
+        )
+        self.engine = engine or ScanEngine()
+
+    def collect_candidate_data(
+        self,
+        ticker: str,
+        stock_data: Optional[Dict[str, Any]] = None,
+        buzz_data: Optional[Dict[str, Any]] = None,
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Collect all data for a single ticker candidate
-        Returns complete candidate object for ECHOPULSE analysis
+        Returns complete candidate object for ECHOPULSE analysis.
+        Sources that time out or stay throttled are left out of the candidate
+        (not zeroed), listed under "missing" and recorded in source_errors;
+        without stock data there is no candidate.
         """
         print(f"Collecting data for {ticker}...")
 
-        # Get stock data
-        stock_data = self.stock_collector.get_stock_data(ticker)
+        # Get stock data (unless the bulk quote stage already did)
+        if stock_data is None:
+            stock_data = self.engine.call("yfinance", self.stock_collector.get_stock_data, ticker)
         if not stock_data:
             return None
 
-        # Get social buzz
-        buzz_data = self.reddit_collector.get_ticker_mentions(ticker)
+        # Get social buzz (unless the watchlist-wide Reddit pass already did)
+        if buzz_data is None:
+            buzz_data = self.engine.call_best_effort(
+                "reddit", self.reddit_collector.get_ticker_mentions, ticker, source_errors=source_errors
+            )
 
         # Get catalysts
-        catalyst_data = self.news_collector.get_upcoming_catalysts(ticker)
+        catalyst_data = self.engine.call_best_effort(
+            "news", self.news_collector.get_upcoming_catalysts, ticker, source_errors=source_errors
+        )
 
         # Get fundamentals
-        fundamentals = self.fundamentals_collector.get_fundamentals(ticker)
-
-        # Combine all data
-        candidate = {
-            **stock_data,
-            **buzz_data,
-            **catalyst_data,
-            "fundamentals": {
-                "revenue_growing": fundamentals["revenue_growing"],
-                "profitable": fundamentals["profitable"],
-                "path_to_profit": fundamentals["path_to_profit"],
-                "red_flags": fundamentals["red_flags"],
-                "debt_manageable": fundamentals["debt_manageable"],
-                "dilution_ok": fundamentals["dilution_ok"]
-            },
-            "health_score": fundamentals["health_score"]
-        }
+        fundamentals = self.engine.call_best_effort(
+            "yfinance", self.fundamentals_collector.get_fundamentals, ticker, source_errors=source_errors
+        )
 
-        return candidate
+        # Bulk quotes carry no sector; the fundamentals fetch just cached it
+        if stock_data.get("sector") == "Unknown":
+            info = self.info_cache.get(ticker, "fundamentals")
+            if info:
+                stock_data = {**stock_data, "sector": info.get("sector", "Unknown")}
 
-    def scan_watchlist(self, tickers: List[str]) -> Dict[str, Any]:
+        return build_candidate(stock_data, buzz_data, catalyst_data, fundamentals)
+
+    def fetch_quotes(self, tickers: List[str], max_workers: int = 4) -> Dict[str, Dict[str, Any]]:
+        """Stage 1: price / volume / market cap for every ticker in bulk"""
+        with METRICS.timer("echopulse_collector", source="yfinance", call="get_multiple_stocks"):
+            return self.stock_collector.get_multiple_stocks(
+                tickers, max_workers=max_workers, call=self.engine.call
+            )
+
+    def fetch_buzz(
+        self,
+        tickers: List[str],
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Stage 2: one pass over each subreddit covers every ticker"""
+        try:
+            return self.engine.call("reddit_watchlist", self.reddit_collector.get_watchlist_mentions, tickers)
+        except (RateLimited, SourceTimeout, CircuitOpenError) as e:
+            # No per-ticker retries against a throttled API; candidates go without buzz
+            print(f"Skipping Reddit buzz: {e}")
+            if source_errors is not None:
+                source_errors["reddit"] = str(e)
+            return {ticker: {} for ticker in tickers}
+
+    def collect_details(
+        self,
+        tickers: List[str],
+        quotes: Dict[str, Dict[str, Any]],
+        buzz: Dict[str, Dict[str, Any]],
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        engine: Optional[ScanEngine] = None,
+        priority: Optional[Dict[str, float]] = None,
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
         """
-        Scan a list of tickers and return formatted data for ECHOPULSE
+        Stage 3: catalysts and fundamentals per ticker, in parallel
+        Tickers without a quote count as failures
         """
-        candidates = []
+        def collect(ticker: str) -> Optional[Dict[str, Any]]:
+            if ticker not in quotes:
+                return None
+            return self.collect_candidate_data(
+                ticker,
+                stock_data=quotes[ticker],
+                buzz_data=buzz.get(ticker),
+                source_errors=source_errors
+            )
 
-        for ticker in tickers:
-            candidate = self.collect_candidate_data(ticker)
-            if candidate:
-                candidates.append(candidate)
+        return (engine or self.engine).run(tickers, collect, on_result=on_candidate, priority=priority)
+
+    def scan_watchlist(
+        self,
+        tickers: List[str],
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        priority: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Scan a list of tickers and return formatted data for ECHOPULSE
+        Tickers are collected in parallel; candidates keep watchlist order
+        and tickers that failed are listed under "failures".
+        on_candidate sees each candidate as soon as it is collected.
+        priority (ticker -> expected score) decides which tickers go first.
+        """
+        source_errors = {}
+        quotes = self.fetch_quotes(prioritized(tickers, priority))
+        buzz = self.fetch_buzz(list(quotes), source_errors)
+        candidates, failures = self.collect_details(
+            tickers, quotes, buzz, on_candidate, priority=priority, source_errors=source_errors
+        )
 
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
-            "candidates": candidates
+            "candidates": candidates,
+            "failures": failures,
+            "source_errors": source_errors,
+            "info_cache": self.info_cache.stats(),
+            "circuit_breakers": self.breakers.snapshot()
         }
 
 
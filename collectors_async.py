@@ -0,0 +1,507 @@
+"""
+ECHOPULSE v3.0 Async Data Collectors
+asyncio collector stack on one shared, keep-alive httpx connection pool
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+import httpx
+
+from collectors import (
+    QUOTE_URL,
+    CashtagMatcher,
+    NewsCollector,
+    FAILED_FUNDAMENTALS,
+    build_candidate,
+    baseline_scale,
+    buzz_from_counts,
+    fundamentals_from_info,
+    mock_reddit_data,
+    stock_data_from_info,
+    stock_data_from_quote,
+)
+from circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError
+from info_cache import TickerInfoCache
+from metrics import METRICS
+from request_scheduler import AsyncRequestScheduler, RateLimited
+from scan_engine import DEFAULT_SOURCE_TIMEOUTS
+
+
+YAHOO_COOKIE_URL = "https://fc.yahoo.com"
+YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/{ticker}"
+INFO_MODULES = "price,summaryProfile,financialData,defaultKeyStatistics"
+
+REDDIT_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+REDDIT_API_URL = "https://oauth.reddit.com"
+
+# Yahoo rejects the default httpx agent
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def shared_client() -> httpx.AsyncClient:
+    """Process-wide client, so every collector reuses the same keep-alive connections"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30),
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            headers={"User-Agent": BROWSER_USER_AGENT},
+            follow_redirects=True
+        )
+    return _shared_client
+
+
+async def close_shared_client():
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
+def info_from_quote_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a quoteSummary response into yfinance's info shape
+    ({"raw": 1.2, "fmt": "1.20"} values become 1.2; empty fields are dropped)
+    """
+    results = (payload.get("quoteSummary") or {}).get("result") or [{}]
+    info: Dict[str, Any] = {}
+    for module in (results[0] or {}).values():
+        if not isinstance(module, dict):
+            continue
+        for key, value in module.items():
+            if isinstance(value, dict):
+                value = value.get("raw")
+            if value is not None and key not in info:
+                info[key] = value
+
+    # Names yfinance's info uses for the price module fields
+    if "regularMarketVolume" in info:
+        info.setdefault("volume", info["regularMarketVolume"])
+    return info
+
+
+class YahooClient:
+    """
+    Yahoo's JSON endpoints over httpx: cookie + crumb handshake,
+    bulk quotes, and quoteSummary info cached and shared per ticker
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        scheduler: AsyncRequestScheduler,
+        cache: Optional[TickerInfoCache] = None
+    ):
+        self.client = client
+        self.scheduler = scheduler
+        self.cache = cache or TickerInfoCache()
+        self.crumb: Optional[str] = None
+        self._crumb_lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get_crumb(self, refresh: bool = False) -> str:
+        async with self._crumb_lock:
+            if self.crumb is None or refresh:
+                try:
+                    # Only sets the session cookie; the response itself is a 404
+                    await self.client.get(YAHOO_COOKIE_URL)
+                except httpx.HTTPError:
+                    pass
+                response = await self.client.get(YAHOO_CRUMB_URL)
+                response.raise_for_status()
+                self.crumb = response.text.strip()
+        return self.crumb
+
+    async def get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a Yahoo JSON endpoint through the scheduler, renewing a stale crumb once"""
+        return await self.scheduler.submit("yfinance", self._get_json, url, params)
+
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        crumb = await self.get_crumb()
+        response = await self.client.get(url, params={**params, "crumb": crumb})
+        if response.status_code == 401:
+            crumb = await self.get_crumb(refresh=True)
+            response = await self.client.get(url, params={**params, "crumb": crumb})
+        response.raise_for_status()
+        return response.json()
+
+    async def quotes(self, chunk: List[str]) -> List[Dict[str, Any]]:
+        payload = await self.get_json(QUOTE_URL, {"symbols": ",".join(chunk), "formatted": "false"})
+        return (payload.get("quoteResponse") or {}).get("result") or []
+
+    async def info(self, ticker: str, field_class: str = "quote") -> Dict[str, Any]:
+        """Cached info payload; concurrent misses for a ticker share one request"""
+        info = self.cache.get(ticker, field_class)
+        if info is not None:
+            return info
+
+        task = self._inflight.get(ticker)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_info(ticker))
+            self._inflight[ticker] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ticker, None))
+        # shield: one caller timing out must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        payload = await self.get_json(
+            QUOTE_SUMMARY_URL.format(ticker=ticker),
+            {"modules": INFO_MODULES, "formatted": "false"}
+        )
+        info = info_from_quote_summary(payload)
+        self.cache.put(ticker, info)
+        return info
+
+
+class AsyncStockDataCollector:
+    """Price, volume and market cap from Yahoo, async"""
+
+    def __init__(self, yahoo: YahooClient, breaker: Optional[CircuitBreaker] = None):
+        self.yahoo = yahoo
+        self.breaker = breaker or CircuitBreaker("stock")
+
+    async def get_stock_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+        try:
+            info = await self.breaker.call_async(self.yahoo.info, ticker, "quote")
+            return stock_data_from_info(ticker, info)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Error fetching {ticker}: {e}")
+            return None
+
+    async def get_multiple_stocks(self, tickers: List[str], chunk_size: int = 50) -> Dict[str, Dict[str, Any]]:
+        """Bulk quote chunks concurrently, then single fetches for whatever they missed"""
+        chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+        wanted = {ticker.upper(): ticker for ticker in tickers}
+        results = {}
+
+        for rows in await asyncio.gather(*(self._fetch_quote_chunk(chunk) for chunk in chunks)):
+            for row in rows:
+                ticker = wanted.get(str(row.get("symbol", "")).upper())
+                if ticker and row.get("regularMarketPrice"):
+                    results[ticker] = stock_data_from_quote(ticker, row)
+
+        missing = [ticker for ticker in tickers if ticker not in results]
+        if missing:
+            print(f"Bulk quotes missed {len(missing)} tickers, fetching individually")
+            fetched = await asyncio.gather(
+                *(self.get_stock_data(ticker) for ticker in missing),
+                return_exceptions=True
+            )
+            for ticker, data in zip(missing, fetched):
+                if isinstance(data, dict):
+                    results[ticker] = data
+
+        return results
+
+    async def _fetch_quote_chunk(self, chunk: List[str]) -> List[Dict[str, Any]]:
+        try:
+            return await self.breaker.call_async(self.yahoo.quotes, chunk)
+        except Exception as e:
+            print(f"Bulk quote error for {chunk[0]}..{chunk[-1]}: {e}")
+            return []
+
+
+class AsyncFundamentalsCollector:
+    """Fundamental health metrics from the shared Yahoo info payload, async"""
+
+    def __init__(self, yahoo: YahooClient, breaker: Optional[CircuitBreaker] = None):
+        self.yahoo = yahoo
+        self.breaker = breaker or CircuitBreaker("fundamentals")
+
+    async def get_fundamentals(self, ticker: str) -> Dict[str, Any]:
+        try:
+            info = await self.breaker.call_async(self.yahoo.info, ticker, "fundamentals")
+            return fundamentals_from_info(info)
+        except (RateLimited, CircuitOpenError):
+            raise
+        except Exception as e:
+            print(f"Fundamentals error for {ticker}: {e}")
+            return dict(FAILED_FUNDAMENTALS)
+
+
+class AsyncRedditBuzzCollector:
+    """Watchlist buzz from Reddit's OAuth API (app-only token) over httpx"""
+
+    SUBREDDITS = ["wallstreetbets", "stocks", "investing", "stockmarket"]
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        scheduler: AsyncRequestScheduler,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.client = client
+        self.scheduler = scheduler
+        self.breaker = breaker or CircuitBreaker("reddit")
+        self.client_id = os.getenv("REDDIT_CLIENT_ID", "")
+        self.client_secret = os.getenv("REDDIT_CLIENT_SECRET", "")
+        self.user_agent = os.getenv("REDDIT_USER_AGENT", "ECHOPULSE/3.0")
+        self.subreddits = list(self.SUBREDDITS)
+        self.enabled = bool(self.client_id)
+        self.clock = time.time
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def get_watchlist_mentions(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One pass over each subreddit's newest posts (subreddits read concurrently)"""
+        if not self.enabled:
+            return {ticker: mock_reddit_data(ticker) for ticker in tickers}
+
+        try:
+            now = self.clock()
+            since_7d = now - 7 * 24 * 3600
+            since_24h = now - 24 * 3600
+            since_1h = now - 3600
+
+            matcher = CashtagMatcher(tickers)
+            counts = {ticker.upper(): [0, 0, 0] for ticker in tickers}  # 24h, 1h, 7d
+
+            walks: List[Dict[str, Any]] = [{} for _ in self.subreddits]
+            pages = await asyncio.gather(*(
+                self._recent_posts(sub, since_7d, walk=walk) for sub, walk in zip(self.subreddits, walks)
+            ))
+            for sub_name, walk, posts in zip(self.subreddits, walks, pages):
+                week = dict.fromkeys(counts, 0)
+                for post in posts:
+                    for ticker in matcher.match(f"{post.title}\n{post.selftext}"):
+                        bucket = counts[ticker]
+                        week[ticker] += 1
+                        if post.created_utc > since_24h:
+                            bucket[0] += 1
+                        if post.created_utc > since_1h:
+                            bucket[1] += 1
+
+                # Scale a walk the listing cap cut short to the full baseline
+                scale = baseline_scale(sub_name, now, walk)
+                for ticker, mentions in week.items():
+                    counts[ticker][2] += mentions * scale
+
+            return {ticker: buzz_from_counts(*counts[ticker.upper()]) for ticker in tickers}
+
+        except (RateLimited, CircuitOpenError):
+            raise
+        except Exception as e:
+            print(f"Reddit API error for watchlist scan: {e}")
+            return {ticker: mock_reddit_data(ticker) for ticker in tickers}
+
+    async def _recent_posts(
+        self,
+        sub_name: str,
+        since: float,
+        max_pages: int = 10,
+        walk: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """Newest-first posts after `since`; same paging rules (and walk report) as the PRAW collector"""
+        walk = walk if walk is not None else {}
+        walk.update(oldest=None, complete=False)
+        posts = []
+        after = None
+        for _ in range(max_pages):
+            params = {"limit": 100, "raw_json": 1}
+            if after:
+                params["after"] = after
+            page = await self.breaker.call_async(
+                self.scheduler.submit, "reddit", self._listing, sub_name, params
+            )
+            for post in page:
+                if post.created_utc <= since:
+                    walk["complete"] = True
+                    return posts
+                walk["oldest"] = post.created_utc
+                posts.append(post)
+            if len(page) < 100:
+                walk["complete"] = True
+                return posts
+            after = page[-1].fullname
+        return posts
+
+    async def _listing(self, sub_name: str, params: Dict[str, Any]) -> List[Any]:
+        token = await self._get_token()
+        response = await self.client.get(
+            f"{REDDIT_API_URL}/r/{sub_name}/new",
+            params=params,
+            headers={"Authorization": f"bearer {token}", "User-Agent": self.user_agent}
+        )
+        self.scheduler.update_from_headers("reddit", dict(response.headers))
+        response.raise_for_status()
+
+        children = (response.json().get("data") or {}).get("children") or []
+        return [
+            SimpleNamespace(
+                fullname=child["data"].get("name"),
+                title=child["data"].get("title", ""),
+                selftext=child["data"].get("selftext", ""),
+                created_utc=child["data"].get("created_utc", 0)
+            )
+            for child in children
+        ]
+
+    async def _get_token(self) -> str:
+        """Application-only OAuth token, renewed a minute before it expires"""
+        async with self._token_lock:
+            if self._token is None or time.time() > self._token_expires - 60:
+                response = await self.client.post(
+                    REDDIT_TOKEN_URL,
+                    data={"grant_type": "client_credentials"},
+                    auth=(self.client_id, self.client_secret),
+                    headers={"User-Agent": self.user_agent}
+                )
+                response.raise_for_status()
+                grant = response.json()
+                self._token = grant["access_token"]
+                self._token_expires = time.time() + float(grant.get("expires_in", 3600))
+        return self._token
+
+
+class AsyncDataAggregator:
+    """
+    Async DataAggregator: same stages and scan data shape, driven by
+    asyncio tasks instead of a thread pool, safe to await from FastAPI handlers
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 16,
+        source_timeouts: Optional[Dict[str, float]] = None
+    ):
+        self.client = client or shared_client()
+        self.max_concurrency = max(1, max_concurrency)
+        self.source_timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self.scheduler = AsyncRequestScheduler()
+        self.info_cache = TickerInfoCache()
+        self.breakers = CircuitBreakers()
+        self.yahoo = YahooClient(self.client, self.scheduler, self.info_cache)
+        self.stock_collector = AsyncStockDataCollector(self.yahoo, self.breakers.get("stock"))
+        self.fundamentals_collector = AsyncFundamentalsCollector(self.yahoo, self.breakers.get("fundamentals"))
+        self.reddit_collector = AsyncRedditBuzzCollector(self.client, self.scheduler, self.breakers.get("reddit"))
+        self.news_collector = NewsCollector()
+
+    async def _best_effort(
+        self,
+        source: str,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """
+        Await a source call under its timeout; None if it times out, stays
+        throttled or its circuit is open (the reason goes in source_errors)
+        """
+        try:
+            with METRICS.timer("echopulse_collector", source=source, call=fn.__name__):
+                return await asyncio.wait_for(fn(*args), self.source_timeouts.get(source))
+        except asyncio.TimeoutError:
+            message = f"{source} call timed out for {args[0] if args else source}"
+        except (RateLimited, CircuitOpenError) as e:
+            message = str(e)
+        print(f"⏰ {message}")
+        if source_errors is not None:
+            source_errors[source] = message
+        return None
+
+    async def collect_candidate_data(
+        self,
+        ticker: str,
+        stock_data: Optional[Dict[str, Any]] = None,
+        buzz_data: Optional[Dict[str, Any]] = None,
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Collect all data for one ticker (async version of DataAggregator.collect_candidate_data)"""
+        if stock_data is None:
+            stock_data = await self._best_effort(
+                "yfinance", self.stock_collector.get_stock_data, ticker, source_errors=source_errors
+            )
+        if not stock_data:
+            return None
+
+        fundamentals = await self._best_effort(
+            "yfinance", self.fundamentals_collector.get_fundamentals, ticker, source_errors=source_errors
+        )
+        # Mock catalysts today; no I/O to await
+        catalyst_data = self.news_collector.get_upcoming_catalysts(ticker)
+
+        if stock_data.get("sector") == "Unknown":
+            info = self.info_cache.get(ticker, "fundamentals")
+            if info:
+                stock_data = {**stock_data, "sector": info.get("sector", "Unknown")}
+
+        return build_candidate(stock_data, buzz_data, catalyst_data, fundamentals)
+
+    async def fetch_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        with METRICS.timer("echopulse_collector", source="yfinance", call="get_multiple_stocks"):
+            return await self.stock_collector.get_multiple_stocks(tickers)
+
+    async def fetch_buzz(
+        self,
+        tickers: List[str],
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        try:
+            with METRICS.timer("echopulse_collector", source="reddit_watchlist", call="get_watchlist_mentions"):
+                return await asyncio.wait_for(
+                    self.reddit_collector.get_watchlist_mentions(tickers),
+                    self.source_timeouts.get("reddit_watchlist")
+                )
+        except (RateLimited, CircuitOpenError, asyncio.TimeoutError) as e:
+            message = str(e) or "timed out"
+            print(f"Skipping Reddit buzz: {message}")
+            if source_errors is not None:
+                source_errors["reddit"] = message
+            return {ticker: {} for ticker in tickers}
+
+    async def scan_watchlist(
+        self,
+        tickers: List[str],
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Same output as DataAggregator.scan_watchlist (candidates in watchlist order)"""
+        source_errors = {}
+        quotes = await self.fetch_quotes(tickers)
+        buzz = await self.fetch_buzz(list(quotes), source_errors)
+
+        gate = asyncio.Semaphore(self.max_concurrency)
+
+        async def collect(ticker: str) -> Optional[Dict[str, Any]]:
+            if ticker not in quotes:
+                return None
+            async with gate:
+                candidate = await self.collect_candidate_data(ticker, quotes[ticker], buzz.get(ticker), source_errors)
+            if candidate is not None and on_candidate is not None:
+                on_candidate(candidate)
+            return candidate
+
+        results = await asyncio.gather(*(collect(ticker) for ticker in tickers), return_exceptions=True)
+
+        candidates, failures = [], []
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, BaseException):
+                print(f"Scan failed for {ticker}: {result}")
+                failures.append({"ticker": ticker, "error": str(result)})
+            elif result is None:
+                failures.append({"ticker": ticker, "error": "no data returned"})
+            else:
+                candidates.append(result)
+
+        return {
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "candidates": candidates,
+            "failures": failures,
+            "source_errors": source_errors,
+            "info_cache": self.info_cache.stats(),
+            "circuit_breakers": self.breakers.snapshot()
+        }
@@ -9,7 +9,10 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
 # Import base collectors
-from collectors import StockDataCollector, RedditBuzzCollector, FundamentalsCollector
+from collectors import StockDataCollector, RedditBuzzCollector, FundamentalsCollector, build_candidate
+from scan_engine import ScanEngine
+from info_cache import TickerInfoCache
+from circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError
 
 # Note: This file is designed to run within Claude Code with MCP access
 # For standalone use, it will gracefully fall back to basic collectors
@@ -18,8 +21,9 @@ from collectors import StockDataCollector, RedditBuzzCollector, FundamentalsColl
 class TavilyNewsCollector:
     """Enhanced news collector using Tavily MCP for real web search"""
 
-    def __init__(self):
+    def __init__(self, breaker: Optional[CircuitBreaker] = None):
         self.use_mcp = self._check_mcp_available()
+        self.breaker = breaker or CircuitBreaker("tavily")
 
     def _check_mcp_available(self) -> bool:
         """Check if running in Claude Code with MCP access"""
@@ -35,25 +39,30 @@ class TavilyNewsCollector:
             return self._mock_catalyst(ticker)
 
         try:
-            # This would be called by Claude Code via MCP
-            # Format: search for earnings dates, news, catalysts
-            search_query = f"{ticker} {company_name} earnings date 2025 catalyst news"
-
-            # In Claude Code context, this triggers Tavily MCP search
-            # For now, return structure that Claude will populate
-            return {
-                "catalyst": "Earnings Report",  # Will be populated by Tavily
-                "catalyst_date": (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d"),
-                "rumor": "Market expects positive guidance",  # Will be from real news
-                "rumor_confidence": 2,  # Will be scored by Sequential Thinking
-                "sources": ["https://finance.yahoo.com/calendar/earnings"],
-                "_mcp_enhanced": True
-            }
-
+            return self.breaker.call(self._search_catalyst, ticker, company_name)
+        except CircuitOpenError:
+            # Tavily is known down: skip it rather than dress up mock data
+            raise
         except Exception as e:
             print(f"Tavily search failed for {ticker}, using fallback: {e}")
             return self._mock_catalyst(ticker)
 
+    def _search_catalyst(self, ticker: str, company_name: str) -> Dict[str, Any]:
+        # This would be called by Claude Code via MCP
+        # Format: search for earnings dates, news, catalysts
+        search_query = f"{ticker} {company_name} earnings date 2025 catalyst news"
+
+        # In Claude Code context, this triggers Tavily MCP search
+        # For now, return structure that Claude will populate
+        return {
+            "catalyst": "Earnings Report",  # Will be populated by Tavily
+            "catalyst_date": (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d"),
+            "rumor": "Market expects positive guidance",  # Will be from real news
+            "rumor_confidence": 2,  # Will be scored by Sequential Thinking
+            "sources": ["https://finance.yahoo.com/calendar/earnings"],
+            "_mcp_enhanced": True
+        }
+
     def _mock_catalyst(self, ticker: str) -> Dict[str, Any]:
         """Fallback mock data when MCP not available"""
         return {
@@ -171,52 +180,56 @@ class MemoryPatternTracker:
 class MCPDataAggregator:
     """Enhanced aggregator using all MCP tools"""
 
-    def __init__(self):
-        self.stock_collector = StockDataCollector()
-        self.reddit_collector = RedditBuzzCollector()
-        self.news_collector = TavilyNewsCollector()
-        self.fundamentals_collector = FundamentalsCollector()
+    def __init__(self, engine: Optional[ScanEngine] = None):
+        self.info_cache = TickerInfoCache()
+        self.breakers = CircuitBreakers()
+        self.stock_collector = StockDataCollector(cache=self.info_cache, breaker=self.breakers.get("stock"))
+        self.reddit_collector = RedditBuzzCollector(breaker=self.breakers.get("reddit"))
+        self.news_collector = TavilyNewsCollector(breaker=self.breakers.get("tavily"))
+        self.fundamentals_collector = FundamentalsCollector(
+            cache=self.info_cache,
+            breaker=self.breakers.get("fundamentals")
+        )
         self.sequential_analyzer = SequentialAnalyzer()
         self.memory_tracker = MemoryPatternTracker()
+        self.engine = engine or ScanEngine()
 
-    def collect_candidate_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def collect_candidate_data(
+        self,
+        ticker: str,
+        source_errors: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Collect all data with MCP enhancements
         """
         print(f"Collecting MCP-enhanced data for {ticker}...")
 
         # Get basic stock data
-        stock_data = self.stock_collector.get_stock_data(ticker)
+        stock_data = self.engine.call("yfinance", self.stock_collector.get_stock_data, ticker)
         if not stock_data:
             return None
 
         # Get social buzz
-        buzz_data = self.reddit_collector.get_ticker_mentions(ticker)
+        buzz_data = self.engine.call_best_effort(
+            "reddit", self.reddit_collector.get_ticker_mentions, ticker, source_errors=source_errors
+        )
 
         # Get catalysts with Tavily search
-        catalyst_data = self.news_collector.get_upcoming_catalysts(
+        catalyst_data = self.engine.call_best_effort(
+            "news",
+            self.news_collector.get_upcoming_catalysts,
             ticker,
-            stock_data.get("name", ticker)
-        )
+            stock_data.get("name", ticker),
+            source_errors=source_errors
+        ) or {}
 
         # Get fundamentals
-        fundamentals = self.fundamentals_collector.get_fundamentals(ticker)
-
-        # Combine into candidate
-        candidate = {
-            **stock_data,
-            **buzz_data,
-            **catalyst_data,
-            "fundamentals": {
-                "revenue_growing": fundamentals["revenue_growing"],
-                "profitable": fundamentals["profitable"],
-                "path_to_profit": fundamentals["path_to_profit"],
-                "red_flags": fundamentals["red_flags"],
-                "debt_manageable": fundamentals["debt_manageable"],
-                "dilution_ok": fundamentals["dilution_ok"]
-            },
-            "health_score": fundamentals["health_score"]
-        }
+        fundamentals = self.engine.call_best_effort(
+            "yfinance", self.fundamentals_collector.get_fundamentals, ticker, source_errors=source_errors
+        )
+
+        # Combine into candidate (timed-out sources are flagged under "missing")
+        candidate = build_candidate(stock_data, buzz_data, catalyst_data, fundamentals)
 
         # Use Sequential Thinking for deeper analysis
         analysis = self.sequential_analyzer.analyze_setup_quality(candidate)
@@ -231,16 +244,16 @@ class MCPDataAggregator:
 
         return candidate
 
-    def scan_watchlist(self, tickers: List[str]) -> Dict[str, Any]:
+    def scan_watchlist(self, tickers: List[str], priority: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
         Scan watchlist with MCP enhancements
         """
-        candidates = []
-
-        for ticker in tickers:
-            candidate = self.collect_candidate_data(ticker)
-            if candidate:
-                candidates.append(candidate)
+        source_errors = {}
+        candidates, failures = self.engine.run(
+            tickers,
+            lambda ticker: self.collect_candidate_data(ticker, source_errors),
+            priority=priority
+        )
 
         # Get winning patterns from memory
         winning_patterns = self.memory_tracker.get_winning_patterns()
@@ -248,6 +261,10 @@ class MCPDataAggregator:
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
             "candidates": candidates,
+            "failures": failures,
+            "source_errors": source_errors,
+            "info_cache": self.info_cache.stats(),
+            "circuit_breakers": self.breakers.snapshot(),
             "winning_patterns": winning_patterns,
             "_mcp_enhanced": True
         }
@@ -0,0 +1,163 @@
+"""
+ECHOPULSE v3.0 Live Events
+One broadcaster fans scan progress, stage timings, job updates and new
+briefs out to every connected dashboard over server-sent events
+"""
+
+import asyncio
+import json
+import signal
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, AsyncIterator, Deque, Optional, Set, Tuple
+
+from metrics import METRICS
+
+
+METRICS.describe("echopulse_events_published_total", "Live events published by type")
+METRICS.describe("echopulse_events_dropped_subscribers_total", "Event streams closed for falling behind")
+
+
+def format_event(event_id: int, event: str, data: Dict[str, Any]) -> bytes:
+    """One SSE message (data is a single JSON line)"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+class EventBroadcaster:
+    """
+    Each event is serialized once and the same bytes are queued for every
+    subscriber, so fan-out costs one queue put per viewer. A viewer whose
+    queue fills up is disconnected; EventSource reconnects with
+    Last-Event-ID and the recent-events buffer fills the gap.
+    publish() is safe from any thread (the brief watcher runs in one).
+
+    Open streams would keep the server's graceful shutdown waiting, so they
+    end on SIGTERM/SIGINT (close_on_signals) and, as a backstop, after
+    max_age seconds, when the client simply reconnects.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 256,
+        replay: int = 200,
+        heartbeat: float = 15.0,
+        max_age: float = 300.0
+    ):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.max_age = max_age
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._recent: Deque[Tuple[int, bytes]] = deque(maxlen=replay)
+        self._next_id = 1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._closed = False
+
+    def stop(self):
+        """End every open stream, and refuse new ones"""
+        self._closed = True
+        for queue in list(self._subscribers):
+            self._close(queue)
+        self._loop = None
+
+    def close_on_signals(self, signals=(signal.SIGTERM, signal.SIGINT)):
+        """
+        Chain stop() in front of the server's own shutdown signal handlers
+        (uvicorn installs them before the app starts), so streams close
+        before it waits for connections to drain. Main thread only.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = self._loop
+        for sig in signals:
+            previous = signal.getsignal(sig)
+
+            def handler(signum, frame, previous=previous):
+                if loop is not None and not loop.is_closed():
+                    loop.call_soon_threadsafe(self.stop)
+                if callable(previous):
+                    previous(signum, frame)
+                else:
+                    # SIG_DFL / SIG_IGN: put it back and let it act as before
+                    signal.signal(signum, previous)
+                    signal.raise_signal(signum)
+
+            signal.signal(sig, handler)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        """Send an event to every subscriber; a no-op before start()"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(event, data)
+        else:
+            loop.call_soon_threadsafe(self._fanout, event, data)
+
+    def _fanout(self, event: str, data: Dict[str, Any]):
+        event_id = self._next_id
+        self._next_id += 1
+        message = format_event(event_id, event, data)
+        self._recent.append((event_id, message))
+        METRICS.inc("echopulse_events_published_total", event=event)
+        for queue in list(self._subscribers):
+            if queue.full():
+                METRICS.inc("echopulse_events_dropped_subscribers_total")
+                self._close(queue)
+            else:
+                queue.put_nowait(message)
+
+    def _close(self, queue: asyncio.Queue):
+        # Make room for the end-of-stream marker
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """A queue of SSE messages, starting with any buffered ones after last_event_id"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size + len(self._recent))
+        if last_event_id is not None:
+            for event_id, message in self._recent:
+                if event_id > last_event_id:
+                    queue.put_nowait(message)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def stream(self, last_event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+        """SSE body for one viewer, with keepalive comments while idle; ends after max_age"""
+        if self._closed:
+            return
+        queue = self.subscribe(last_event_id)
+        deadline = time.monotonic() + self.max_age
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    message = await asyncio.wait_for(queue.get(), min(self.heartbeat, remaining))
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(queue)
@@ -0,0 +1,190 @@
+"""
+ECHOPULSE v3.0 Scan Funnel
+Cheap-to-expensive staged filtering for universe-scale scans
+"""
+
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+
+import requests
+
+from collectors import DataAggregator, prioritized
+from scan_engine import ScanEngine
+
+
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt"
+
+
+class FunnelFilters:
+    """Thresholds a ticker must clear to move to the next stage"""
+
+    def __init__(
+        self,
+        min_price: float = 2.0,
+        max_price: Optional[float] = None,
+        min_volume: int = 500_000,
+        min_market_cap: float = 100_000_000,
+        max_market_cap: Optional[float] = None,
+        min_mentions_24h: int = 3
+    ):
+        self.min_price = min_price
+        self.max_price = max_price
+        self.min_volume = min_volume
+        self.min_market_cap = min_market_cap
+        self.max_market_cap = max_market_cap
+        self.min_mentions_24h = min_mentions_24h
+
+    def passes_quote(self, quote: Dict[str, Any]) -> bool:
+        price = quote.get("price") or 0
+        volume = quote.get("volume") or 0
+        market_cap = quote.get("market_cap") or 0
+
+        if price < self.min_price or (self.max_price and price > self.max_price):
+            return False
+        if volume < self.min_volume:
+            return False
+        if market_cap < self.min_market_cap or (self.max_market_cap and market_cap > self.max_market_cap):
+            return False
+        return True
+
+    def passes_buzz(self, buzz: Dict[str, Any]) -> bool:
+        # No buzz data (Reddit skipped) is not evidence of no buzz
+        if not buzz:
+            return True
+        return (buzz.get("mentions_24h") or 0) >= self.min_mentions_24h
+
+
+class ScanFunnel:
+    """
+    Stage 1 (quotes): bulk quotes for every symbol, filtered on price,
+        volume and market cap
+    Stage 2 (buzz): one Reddit pass for the survivors, filtered on mentions
+    Stage 3 (details): catalysts and fundamentals for what is left
+
+    Each stage has its own worker count and reports symbols in vs out.
+    """
+
+    def __init__(
+        self,
+        aggregator: DataAggregator,
+        filters: Optional[FunnelFilters] = None,
+        quote_workers: int = 8,
+        detail_workers: int = 8
+    ):
+        self.aggregator = aggregator
+        self.filters = filters or FunnelFilters()
+        self.quote_workers = quote_workers
+        self.detail_engine = ScanEngine(
+            max_workers=detail_workers,
+            source_limits=aggregator.engine.source_limits,
+            source_timeouts=aggregator.engine.source_timeouts,
+            deadline=aggregator.engine.deadline
+        )
+
+    def run(
+        self,
+        tickers: List[str],
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        priority: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Run every stage; returns scan data with a "funnel" report"""
+        stages = []
+        source_errors = {}
+
+        # Stage 1: bulk quotes
+        started = time.monotonic()
+        quotes = self.aggregator.fetch_quotes(prioritized(tickers, priority), max_workers=self.quote_workers)
+        survivors = [t for t in tickers if t in quotes and self.filters.passes_quote(quotes[t])]
+        stages.append(self._report("quotes", tickers, survivors, self.quote_workers, started))
+
+        # Stage 2: single-pass buzz counts (one listing walk per subreddit, not per ticker)
+        started = time.monotonic()
+        buzz = self.aggregator.fetch_buzz(survivors, source_errors)
+        buzz_survivors = [t for t in survivors if self.filters.passes_buzz(buzz.get(t, {}))]
+        stages.append(self._report("buzz", survivors, buzz_survivors, 1, started))
+
+        # Stage 3: full collection for the survivors only
+        started = time.monotonic()
+        candidates, failures = self.aggregator.collect_details(
+            buzz_survivors, quotes, buzz, on_candidate, engine=self.detail_engine, priority=priority,
+            source_errors=source_errors
+        )
+        stages.append(self._report(
+            "details", buzz_survivors, [c["ticker"] for c in candidates],
+            self.detail_engine.max_workers, started
+        ))
+
+        return {
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "candidates": candidates,
+            "failures": failures,
+            "source_errors": source_errors,
+            "info_cache": self.aggregator.info_cache.stats(),
+            "circuit_breakers": self.aggregator.breakers.snapshot(),
+            "funnel": stages
+        }
+
+    def _report(self, stage: str, entered: List[str], left: List[str], workers: int, started: float) -> Dict[str, Any]:
+        seconds = round(time.monotonic() - started, 2)
+        print(f"🔻 {stage}: {len(entered)} in → {len(left)} out ({workers} workers, {seconds}s)")
+        return {
+            "stage": stage,
+            "in": len(entered),
+            "out": len(left),
+            "workers": workers,
+            "seconds": seconds
+        }
+
+
+def load_us_universe(cache_file: Path = Path("data/universe.txt"), max_age_days: int = 7) -> List[str]:
+    """
+    Every NASDAQ / NYSE / AMEX listed common stock as Yahoo symbols
+    Pulled from the NASDAQ Trader symbol directory and cached locally
+    """
+    cache_file = Path(cache_file)
+    if cache_file.exists():
+        age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
+        if age < timedelta(days=max_age_days):
+            with open(cache_file, "r") as f:
+                return [line.strip() for line in f if line.strip()]
+
+    symbols = set()
+    for url, symbol_col in ((NASDAQ_LISTED_URL, "Symbol"), (OTHER_LISTED_URL, "ACT Symbol")):
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        symbols.update(_parse_symbol_directory(response.text, symbol_col))
+
+    universe = sorted(symbols)
+    cache_file.parent.mkdir(exist_ok=True)
+    with open(cache_file, "w") as f:
+        f.write("\n".join(universe) + "\n")
+
+    print(f"🌎 Loaded {len(universe)} listed US symbols")
+    return universe
+
+
+def _parse_symbol_directory(text: str, symbol_col: str) -> List[str]:
+    """Pipe-delimited symbol directory -> Yahoo symbols (no ETFs or test issues)"""
+    lines = text.strip().splitlines()
+    header = lines[0].split("|")
+    col = {name: i for i, name in enumerate(header)}
+
+    symbols = []
+    for line in lines[1:]:
+        if line.startswith("File Creation Time"):
+            continue
+        fields = line.split("|")
+        if len(fields) != len(header):
+            continue
+        if fields[col["Test Issue"]] == "Y" or fields[col["ETF"]] == "Y":
+            continue
+
+        symbol = fields[col[symbol_col]]
+        # Skip warrants, units, preferreds ($, ^, = suffixes)
+        if not symbol or any(ch in symbol for ch in "$^=+"):
+            continue
+        symbols.append(symbol.replace(".", "-"))
+    return symbols
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+ECHOPULSE v3.0 Scan History Store
+Compacts data/scan_*.json archives into memory-mappable column files
+
+    python history_store.py compact            # append new scans to data/history
+    python history_store.py compact --rebuild
+    python history_store.py show NVDA buzz_ratio --from 2025-10-01
+
+Layout (one .npy per column, rows ordered by scan date):
+    dates.npy     datetime64[D], one entry per archived scan
+    offsets.npy   int64, rows of dates[i] are offsets[i]:offsets[i + 1]
+    <column>.npy  typed values; text columns hold int32 codes into <column>.dict.json
+    meta.json     schema, row count and each archive's mtime/size when compacted
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+
+# column -> dtype; floats use NaN, ints -1 and dates NaT for "not in the scan"
+NUMERIC_COLUMNS = {
+    "price": "f8",
+    "market_cap": "f8",
+    "volume": "f8",
+    "mentions_24h": "f8",
+    "buzz_ratio": "f8",
+    "velocity_1h": "f8",
+    "rumor_confidence": "i1",
+    "health_score": "i1",
+}
+DATE_COLUMNS = ("catalyst_date",)
+# Dictionary-encoded (int32 codes, -1 = missing); platforms are stored comma-joined
+TEXT_COLUMNS = ("ticker", "name", "sector", "catalyst", "platforms")
+FUNDAMENTAL_FLAGS = (
+    "revenue_growing", "profitable", "path_to_profit",
+    "red_flags", "debt_manageable", "dilution_ok"
+)
+FLAG_COLUMNS = tuple(f"fundamentals_{flag}" for flag in FUNDAMENTAL_FLAGS)
+
+STORE_VERSION = 2
+
+
+def _encode_rows(candidates: List[Dict[str, Any]], dictionaries: Dict[str, Dict[str, int]]) -> Dict[str, np.ndarray]:
+    """One scan's candidates as typed column arrays (extends the dictionaries)"""
+    n = len(candidates)
+    columns: Dict[str, np.ndarray] = {}
+
+    for name, dtype in NUMERIC_COLUMNS.items():
+        missing = np.nan if dtype.startswith("f") else -1
+        columns[name] = np.array(
+            [c.get(name) if c.get(name) is not None else missing for c in candidates],
+            dtype=dtype
+        ).reshape(n)
+
+    for name in DATE_COLUMNS:
+        columns[name] = np.array(
+            [_parse_date(c.get(name)) for c in candidates],
+            dtype="datetime64[D]"
+        ).reshape(n)
+
+    for name in TEXT_COLUMNS:
+        codes = dictionaries.setdefault(name, {})
+        values = []
+        for c in candidates:
+            value = c.get(name)
+            if isinstance(value, list):
+                value = ",".join(value)
+            values.append(-1 if value is None else codes.setdefault(value, len(codes)))
+        columns[name] = np.array(values, dtype=np.int32).reshape(n)
+
+    for flag, name in zip(FUNDAMENTAL_FLAGS, FLAG_COLUMNS):
+        values = []
+        for c in candidates:
+            value = (c.get("fundamentals") or {}).get(flag)
+            values.append(-1 if value is None else int(bool(value)))
+        columns[name] = np.array(values, dtype=np.int8).reshape(n)
+
+    return columns
+
+
+def _parse_date(value: Any) -> np.datetime64:
+    try:
+        return np.datetime64(value, "D") if value else np.datetime64("NaT")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def _all_columns() -> List[str]:
+    return [*NUMERIC_COLUMNS, *DATE_COLUMNS, *TEXT_COLUMNS, *FLAG_COLUMNS]
+
+
+def _source_signature(path: Path) -> List[int]:
+    # [mtime_ns, size]; a rewritten scan file (rerun, upload) changes it
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def compact(data_dir: Path = Path("data"), store_dir: Optional[Path] = None, rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Fold archived scans into the column store
+    Scans newer than the last stored date are appended. A stored day whose
+    archive has been rewritten since (a --resume rerun, an upload or API
+    scan of the same day) is re-read along with every day after it; anything
+    else (a backfilled gap, rebuild=True, no store yet) rebuilds from scratch.
+    The new store is written beside the old one and swapped in at the end.
+    """
+    store_dir = Path(store_dir or data_dir / "history")
+    archived = {path.stem.replace("scan_", ""): path for path in sorted(data_dir.glob("scan_*.json"))}
+    sources = {date: _source_signature(path) for date, path in archived.items()}
+
+    store = HistoryStore(store_dir) if (store_dir / "meta.json").exists() and not rebuild else None
+    stored = [str(d) for d in store.dates] if store else []
+    recorded = store.meta.get("sources") if store else None
+    if store and recorded is None:
+        print("↩️  Store doesn't track archive changes yet, rebuilding")
+        store, stored = None, []
+    changed = [d for d in stored if d in sources and sources[d] != recorded.get(d)]
+    if changed:
+        print(f"♻️  {', '.join(changed)} rewritten since compaction, re-reading from {changed[0]}")
+        stored = stored[:stored.index(changed[0])]
+
+    known = set(stored)
+    new_dates = sorted(d for d in archived if d not in known)
+    if store and new_dates and stored and new_dates[0] <= stored[-1]:
+        print(f"↩️  {new_dates[0]} predates the store, rebuilding")
+        store, stored, new_dates = None, [], sorted(archived)
+    if store and not new_dates and not changed:
+        print(f"✅ History store up to date ({len(stored)} days, {store.rows} rows)")
+        return store.meta
+
+    dictionaries: Dict[str, Dict[str, int]] = {
+        name: {value: code for code, value in enumerate(store.dictionary(name))} if store else {}
+        for name in TEXT_COLUMNS
+    }
+    chunks: Dict[str, List[np.ndarray]] = {name: [] for name in _all_columns()}
+    kept_rows = int(store.offsets[len(stored)]) if store else 0
+    if store:
+        for name in chunks:
+            chunks[name].append(np.asarray(store.column(name)[:kept_rows]))
+
+    counts = [int(n) for n in np.diff(store.offsets)[:len(stored)]] if store else []
+    for date in new_dates:
+        with open(archived[date], "r") as f:
+            candidates = json.load(f).get("candidates", [])
+        for name, values in _encode_rows(candidates, dictionaries).items():
+            chunks[name].append(values)
+        counts.append(len(candidates))
+
+    dates = np.array(stored + new_dates, dtype="datetime64[D]")
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    tmp_dir = store_dir.with_name(store_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    np.save(tmp_dir / "dates.npy", dates)
+    np.save(tmp_dir / "offsets.npy", offsets)
+    for name, parts in chunks.items():
+        dtype = HistoryStore.dtype(name)
+        np.save(tmp_dir / f"{name}.npy", np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype))
+    for name, codes in dictionaries.items():
+        with open(tmp_dir / f"{name}.dict.json", "w") as f:
+            json.dump(list(codes), f)
+
+    meta = {
+        "version": STORE_VERSION,
+        "rows": int(offsets[-1]),
+        "days": len(dates),
+        "first_date": str(dates[0]) if len(dates) else None,
+        "last_date": str(dates[-1]) if len(dates) else None,
+        "columns": {name: str(HistoryStore.dtype(name)) for name in chunks},
+        "text_columns": list(TEXT_COLUMNS),
+        # Days kept without an archive on disk keep their recorded signature
+        "sources": {date: sources.get(date) or (recorded or {}).get(date) for date in stored + new_dates}
+    }
+    with open(tmp_dir / "meta.json", "w") as f:
+        json.dump(meta, f, indent=2)
+
+    old_dir = store_dir.with_name(store_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if store_dir.exists():
+        os.replace(store_dir, old_dir)
+    os.replace(tmp_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    print(f"🗜️  History store: +{len(new_dates)} days read → {meta['days']} days, {meta['rows']} rows")
+    return meta
+
+
+class HistoryStore:
+    """Read-only, memory-mapped view of a compacted history directory"""
+
+    def __init__(self, store_dir: Path = Path("data/history")):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / "meta.json", "r") as f:
+            self.meta = json.load(f)
+        self.dates = np.load(self.store_dir / "dates.npy")
+        self.offsets = np.load(self.store_dir / "offsets.npy")
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dictionaries: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def dtype(name: str) -> np.dtype:
+        if name in NUMERIC_COLUMNS:
+            return np.dtype(NUMERIC_COLUMNS[name])
+        if name in DATE_COLUMNS:
+            return np.dtype("datetime64[D]")
+        if name in TEXT_COLUMNS:
+            return np.dtype(np.int32)
+        if name in FLAG_COLUMNS:
+            return np.dtype(np.int8)
+        raise KeyError(f"Unknown history column: {name}")
+
+    @property
+    def rows(self) -> int:
+        return int(self.offsets[-1])
+
+    def column(self, name: str, start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Raw column values (codes for text columns) for scans in [start, end]"""
+        if name not in self._columns:
+            self.dtype(name)
+            self._columns[name] = np.load(self.store_dir / f"{name}.npy", mmap_mode="r")
+        lo, hi = self.row_range(start, end)
+        return self._columns[name][lo:hi]
+
+    def dictionary(self, name: str) -> np.ndarray:
+        """Code -> value for a text column"""
+        if name not in self._dictionaries:
+            with open(self.store_dir / f"{name}.dict.json", "r") as f:
+                self._dictionaries[name] = np.array(json.load(f), dtype=object)
+        return self._dictionaries[name]
+
+    def decode(self, name: str, codes: np.ndarray) -> np.ndarray:
+        """Text values for codes (None where missing)"""
+        values = self.dictionary(name)
+        decoded = np.full(len(codes), None, dtype=object)
+        present = codes >= 0
+        decoded[present] = values[codes[present]]
+        return decoded
+
+    def to_list(self, name: str, values: np.ndarray) -> List[Any]:
+        """JSON-friendly values: missing (NaN, NaT, -1) become None, dates ISO strings"""
+        if name in TEXT_COLUMNS:
+            return list(values)
+        if name in DATE_COLUMNS:
+            return [None if np.isnat(v) else str(v) for v in values]
+        if self.dtype(name).kind == "f":
+            return [None if np.isnan(v) else float(v) for v in values]
+        return [None if v < 0 else int(v) for v in values]
+
+    def code(self, name: str, value: str) -> int:
+        """A text value's code, or -1 if it never appears"""
+        matches = np.flatnonzero(self.dictionary(name) == value)
+        return int(matches[0]) if len(matches) else -1
+
+    def day_range(self, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, int]:
+        """Index range into dates for scans in [start, end]"""
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D")) if start else 0
+        hi = np.searchsorted(self.dates, np.datetime64(end, "D"), side="right") if end else len(self.dates)
+        return int(lo), int(hi)
+
+    def row_range(self, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, int]:
+        lo, hi = self.day_range(start, end)
+        return int(self.offsets[lo]), int(self.offsets[hi])
+
+    def row_dates(self, start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Scan date of every row in [start, end]"""
+        lo, hi = self.day_range(start, end)
+        return np.repeat(self.dates[lo:hi], np.diff(self.offsets[lo:hi + 1]))
+
+    def select(
+        self,
+        columns: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        ticker: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rows in [start, end] (optionally one ticker) as {"date", *columns}
+        Text columns come back decoded
+        """
+        mask = None
+        if ticker is not None:
+            mask = self.column("ticker", start, end) == self.code("ticker", ticker.upper())
+
+        result = {"date": self.row_dates(start, end)}
+        for name in columns:
+            values = self.column(name, start, end)
+            if mask is not None:
+                values = values[mask]
+            result[name] = self.decode(name, values) if name in TEXT_COLUMNS else np.asarray(values)
+        if mask is not None:
+            result["date"] = result["date"][mask]
+        return result
+
+    def day(self, date: str) -> List[Dict[str, Any]]:
+        """One scan's candidates rebuilt as dicts (free-text fields are not stored)"""
+        lo, hi = self.day_range(date, date)
+        if lo == hi:
+            return []
+        rows = self.select(_all_columns(), date, date)
+        candidates = []
+        for i in range(len(rows["date"])):
+            candidate: Dict[str, Any] = {}
+            for name in TEXT_COLUMNS:
+                value = rows[name][i]
+                if value is not None:
+                    candidate[name] = value
+            if "platforms" in candidate:
+                candidate["platforms"] = candidate["platforms"].split(",") if candidate["platforms"] else []
+            for name, dtype in NUMERIC_COLUMNS.items():
+                value = rows[name][i]
+                if dtype.startswith("f") and not np.isnan(value):
+                    candidate[name] = float(value)
+                elif dtype.startswith("i") and value >= 0:
+                    candidate[name] = int(value)
+            for name in DATE_COLUMNS:
+                if not np.isnat(rows[name][i]):
+                    candidate[name] = str(rows[name][i])
+            fundamentals = {
+                flag: bool(rows[name][i])
+                for flag, name in zip(FUNDAMENTAL_FLAGS, FLAG_COLUMNS)
+                if rows[name][i] >= 0
+            }
+            if fundamentals:
+                candidate["fundamentals"] = fundamentals
+            candidates.append(candidate)
+        return candidates
+
+    def scan_dates(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        lo, hi = self.day_range(start, end)
+        return [str(d) for d in self.dates[lo:hi]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ECHOPULSE scan history store")
+    parser.add_argument("--data-dir", default="data", help="where scan_*.json live")
+    parser.add_argument("--store", help="store directory (default: <data-dir>/history)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compact_cmd = sub.add_parser("compact", help="append new scans (or rebuild) the store")
+    compact_cmd.add_argument("--rebuild", action="store_true")
+
+    show_cmd = sub.add_parser("show", help="print one ticker's column over time")
+    show_cmd.add_argument("ticker")
+    show_cmd.add_argument("column")
+    show_cmd.add_argument("--from", dest="start")
+    show_cmd.add_argument("--to", dest="end")
+
+    args = parser.parse_args()
+    store_dir = Path(args.store) if args.store else Path(args.data_dir) / "history"
+
+    if args.command == "compact":
+        compact(Path(args.data_dir), store_dir, rebuild=args.rebuild)
+        return 0
+
+    store = HistoryStore(store_dir)
+    rows = store.select([args.column], args.start, args.end, ticker=args.ticker)
+    for date, value in zip(rows["date"], rows[args.column]):
+        print(f"{date}  {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
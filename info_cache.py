@@ -0,0 +1,104 @@
+"""
+ECHOPULSE v3.0 Ticker Info Cache
+Shared TTL + LRU cache for yfinance info payloads
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
+
+from metrics import METRICS
+
+
+# How long a cached info payload is good for, per class of field read from it
+DEFAULT_TTLS = {
+    "quote": 300,                  # price / volume: 5 minutes
+    "fundamentals": 3 * 24 * 3600  # margins, growth, debt: 3 days
+}
+
+
+class TickerInfoCache:
+    """
+    One yfinance info dict per ticker, shared by every collector.
+    Freshness is judged by the caller's field class, so a quote read can
+    force a refetch while a fundamentals read of the same entry still hits.
+    """
+
+    def __init__(self, max_size: int = 2048, ttls: Optional[Dict[str, float]] = None):
+        self.max_size = max_size
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, ticker: str, field_class: str = "quote") -> Optional[Dict[str, Any]]:
+        """Return the cached info if fresh enough for this field class"""
+        ttl = self.ttls[field_class]
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None or time.monotonic() - entry[0] > ttl:
+                self.misses += 1
+                METRICS.inc("echopulse_info_cache_misses_total", field_class=field_class)
+                return None
+            self._entries.move_to_end(ticker)
+            self.hits += 1
+        METRICS.inc("echopulse_info_cache_hits_total", field_class=field_class)
+        return entry[1]
+
+    def put(self, ticker: str, info: Dict[str, Any]):
+        """Store a freshly fetched info dict, evicting the least recently used"""
+        with self._lock:
+            self._entries[ticker] = (time.monotonic(), info)
+            self._entries.move_to_end(ticker)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(
+        self,
+        ticker: str,
+        field_class: str,
+        fetch: Callable[[str], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Cached info for a ticker, calling fetch(ticker) on a miss.
+        Concurrent misses for the same ticker share a single fetch.
+        """
+        info = self.get(ticker, field_class)
+        if info is not None:
+            return info
+
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(ticker, threading.Lock())
+
+        with fetch_lock:
+            # Another thread may have filled it while we waited
+            with self._lock:
+                entry = self._entries.get(ticker)
+                if entry is not None and time.monotonic() - entry[0] <= self.ttls[field_class]:
+                    self._entries.move_to_end(ticker)
+                    return entry[1]
+
+            info = fetch(ticker)
+            self.put(ticker, info)
+
+        with self._lock:
+            self._fetch_locks.pop(ticker, None)
+        return info
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for scan metadata"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0
+            }
@@ -0,0 +1,186 @@
+"""
+ECHOPULSE v3.0 Background Jobs
+In-process queue for scans and analyses: bounded workers, job IDs with
+status/result lookup, and single-flight dedupe of identical in-flight jobs
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+
+from metrics import METRICS
+
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+METRICS.describe("echopulse_jobs_submitted_total", "Jobs accepted by kind")
+METRICS.describe("echopulse_jobs_deduplicated_total", "Submissions collapsed into an in-flight job")
+METRICS.describe("echopulse_jobs_seconds", "Job run time by kind")
+
+
+def job_key(*parts: Any) -> str:
+    """Stable dedupe key for JSON-able parts (watchlist, date, body digest...)"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class Job:
+    """One submitted scan or analysis"""
+
+    def __init__(self, kind: str, key: str, run: Callable[[], Awaitable[Any]], params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.key = key
+        self.params = params or {}
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted = 1
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._run = run
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    async def wait(self) -> "Job":
+        await self._done.wait()
+        return self
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Status view for the API (result excluded; see /result)"""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "key": self.key,
+            "status": self.status,
+            "params": self.params,
+            "submitted": self.submitted,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queued_seconds": round((self.started_at or time.time()) - self.created_at, 3),
+            "run_seconds": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None
+        }
+
+
+class JobQueue:
+    """
+    FIFO of jobs run by max_workers worker tasks on the app's event loop.
+    A submission whose (kind, key) matches a queued or running job returns
+    that job instead of queueing another execution.
+    on_change is called with the job whenever it's submitted (or joined),
+    starts and finishes.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        keep_finished: int = 200,
+        on_change: Optional[Callable[[Job], None]] = None
+    ):
+        self.max_workers = max_workers
+        self.keep_finished = keep_finished
+        self.on_change = on_change
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        kind: str,
+        key: str,
+        run: Callable[[], Awaitable[Any]],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Job, bool]:
+        """Queue run() as a job, or join the identical in-flight one; returns (job, deduplicated)"""
+        self.start()
+        existing = self._inflight.get((kind, key))
+        if existing is not None:
+            existing.submitted += 1
+            METRICS.inc("echopulse_jobs_deduplicated_total", kind=kind)
+            self._notify(existing)
+            return existing, True
+
+        job = Job(kind, key, run, params)
+        self._jobs[job.id] = job
+        self._inflight[(kind, key)] = job
+        self._queue.put_nowait(job)
+        METRICS.inc("echopulse_jobs_submitted_total", kind=kind)
+        self._trim()
+        self._notify(job)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Newest first"""
+        return [job.snapshot() for job in reversed(self._jobs.values())]
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.max_workers, "queued": self._queue.qsize() if self._queue else 0, "jobs": counts}
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._notify(job)
+            try:
+                with METRICS.timer("echopulse_jobs", kind=job.kind):
+                    job.result = await job._run()
+                job.status = SUCCEEDED
+            except asyncio.CancelledError:
+                job.status = FAILED
+                job.error = "cancelled"
+                raise
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+                print(f"⚠️  Job {job.id} ({job.kind}) failed: {e}")
+            finally:
+                job.finished_at = time.time()
+                self._inflight.pop((job.kind, job.key), None)
+                job._done.set()
+                self._queue.task_done()
+                self._notify(job)
+
+    def _notify(self, job: Job):
+        if self.on_change is not None:
+            self.on_change(job)
+
+    def _trim(self):
+        # Forget the oldest finished jobs beyond keep_finished
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+ECHOPULSE v3.0 /health Load Test
+Measures /health latency on a live uvicorn server, first idle and then
+while large /api/analyze requests run, to check that analysis stays off
+the event loop
+
+    python loadtest.py                                   # 200k-candidate analyses
+    python loadtest.py --candidates 500000 --concurrency 4 --seconds 20
+
+The server runs in a scratch directory (briefs/ and data/ writes land there).
+Results are written under benchmarks/ like benchmark.py's.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Any
+
+import httpx
+
+from benchmark import RESULTS_DIR, _percentile, git_commit, synthetic_scan_data, synthetic_tickers
+
+
+REPO_DIR = Path(__file__).resolve().parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workdir: Path) -> subprocess.Popen:
+    """uvicorn app:app from a scratch cwd that links the repo's static files and templates"""
+    for name in ("static", "templates"):
+        (workdir / name).symlink_to(REPO_DIR / name)
+    env = {**os.environ, "PYTHONPATH": str(REPO_DIR)}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env
+    )
+
+
+async def wait_healthy(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become healthy")
+
+
+async def probe_health(client: httpx.AsyncClient, seconds: float, interval: float) -> List[float]:
+    """/health latencies (seconds), one request every interval"""
+    latencies = []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        started = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+    return latencies
+
+
+def analyze_until(base_url: str, body: bytes, seconds: float) -> List[float]:
+    """
+    POST the payload back to back for `seconds` (runs in its own process,
+    so the upload work doesn't skew the /health probe's timings)
+    """
+    durations = []
+    end = time.monotonic() + seconds
+    with httpx.Client(base_url=base_url, timeout=300.0) as client:
+        while time.monotonic() < end:
+            started = time.perf_counter()
+            response = client.post("/api/analyze", content=body, headers={"Content-Type": "application/json"})
+            response.raise_for_status()
+            durations.append(time.perf_counter() - started)
+    return durations
+
+
+def _latency_stats(latencies: List[float]) -> Dict[str, Any]:
+    ms = [s * 1000 for s in latencies]
+    return {
+        "requests": len(ms),
+        "p50_ms": round(_percentile(ms, 50), 2),
+        "p99_ms": round(_percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2) if ms else 0.0
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    body = json.dumps(synthetic_scan_data(synthetic_tickers(args.candidates))).encode()
+    print(f"📦 Payload: {args.candidates} candidates, {len(body) / 1e6:.1f} MB")
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(port, Path(workdir))
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            async with httpx.AsyncClient(base_url=base_url, timeout=300.0) as probe:
+                await wait_healthy(probe)
+
+                idle = await probe_health(probe, args.seconds, args.interval)
+                print(f"   idle:      {_latency_stats(idle)}")
+
+                with ProcessPoolExecutor(max_workers=args.concurrency, mp_context=get_context("spawn")) as pool:
+                    loaders = [
+                        asyncio.wrap_future(pool.submit(analyze_until, base_url, body, args.seconds))
+                        for _ in range(args.concurrency)
+                    ]
+                    busy = await probe_health(probe, args.seconds, args.interval)
+                    analyses = [d for durations in await asyncio.gather(*loaders) for d in durations]
+                print(f"   analyzing: {_latency_stats(busy)}")
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return {
+        "candidates": args.candidates,
+        "payload_mb": round(len(body) / 1e6, 2),
+        "concurrency": args.concurrency,
+        "idle": _latency_stats(idle),
+        "under_load": _latency_stats(busy),
+        "analyses": _latency_stats(analyses)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/health latency under /api/analyze load")
+    parser.add_argument("--candidates", type=int, default=200_000, help="candidates per analysis request")
+    parser.add_argument("--concurrency", type=int, default=2, help="analysis requests in flight")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each phase")
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between /health probes")
+    parser.add_argument("--output", help="results file (default: benchmarks/loadtest_<date>_<commit>.json)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    idle_p99, busy_p99 = result["idle"]["p99_ms"], result["under_load"]["p99_ms"]
+    print(f"\n/health p99 {idle_p99}ms idle → {busy_p99}ms with {result['analyses']['requests']} analyses "
+          f"(p50 {result['analyses']['p50_ms']}ms each)")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"loadtest_{datetime.now():%Y-%m-%d}_{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "run_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            **result
+        }, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+ECHOPULSE v3.0 Mention Store
+Rolling on-disk mention counts per ticker and subreddit
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+HOURLY_SLOTS = 7 * 24   # one week of hourly buckets
+DAILY_SLOTS = 30        # one month of daily rollups
+
+
+class MentionStore:
+    """
+    Mention counts bucketed by hour (ring buffer, 7 days) and by day
+    (ring buffer, 30 days) for every ticker/subreddit pair, plus a
+    per-subreddit watermark of the newest post already ingested.
+
+    Each slot holds [bucket_id, count]; a slot whose bucket_id is not the
+    one being read is stale and counts as zero, so rings never need
+    clearing and every read touches a fixed number of slots.
+
+    Gaps are [start, end] spans a subreddit's posts were never ingested for
+    (Reddit's listing cap stopped a walk short of the watermark); the 7-day
+    baseline is scaled over the span actually covered.
+    """
+
+    def __init__(self, path: Path = Path("data/mentions.json")):
+        self.path = Path(path)
+        self.watermarks: Dict[str, float] = {}
+        self.gaps: Dict[str, List[List[float]]] = {}
+        self.series: Dict[str, Dict[str, Dict[str, List[List[int]]]]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read the store from disk (empty store if missing)"""
+        if not self.path.exists():
+            return
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        self.watermarks = state.get("watermarks", {})
+        self.gaps = state.get("gaps", {})
+        self.series = state.get("series", {})
+
+    def save(self):
+        """Write the store atomically so a crash never leaves half a file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        self.prune()
+        with self._lock:
+            state = {"watermarks": self.watermarks, "gaps": self.gaps, "series": self.series}
+            with open(tmp, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def prune(self, now: Optional[float] = None):
+        """
+        Drop ticker/subreddit series with no mention in the daily ring's window;
+        every cashtag seen is stored, so one-off tags would otherwise pile up
+        """
+        oldest_day = int((now or time.time()) // 86400) - DAILY_SLOTS + 1
+        with self._lock:
+            for ticker in list(self.series):
+                by_subreddit = self.series[ticker]
+                for subreddit in list(by_subreddit):
+                    if max(day for day, _ in by_subreddit[subreddit]["daily"]) < oldest_day:
+                        del by_subreddit[subreddit]
+                if not by_subreddit:
+                    del self.series[ticker]
+
+    def watermark(self, subreddit: str) -> Optional[float]:
+        """created_utc of the newest post ingested for a subreddit"""
+        return self.watermarks.get(subreddit)
+
+    def set_watermark(self, subreddit: str, created_utc: float):
+        with self._lock:
+            if created_utc > self.watermarks.get(subreddit, 0):
+                self.watermarks[subreddit] = created_utc
+
+    def add_gap(self, subreddit: str, start: float, end: float):
+        """Flag [start, end] as never ingested for a subreddit; gaps older than a week are dropped"""
+        with self._lock:
+            horizon = end - HOURLY_SLOTS * 3600
+            gaps = [gap for gap in self.gaps.get(subreddit, []) if gap[1] > horizon]
+            gaps.append([start, end])
+            self.gaps[subreddit] = gaps
+
+    def gap_seconds(self, subreddit: str, start: float, end: float) -> float:
+        """Seconds of [start, end] inside a subreddit's gaps"""
+        with self._lock:
+            return sum(
+                max(0.0, min(end, gap_end) - max(start, gap_start))
+                for gap_start, gap_end in self.gaps.get(subreddit, [])
+            )
+
+    def record(self, ticker: str, subreddit: str, created_utc: float, count: int = 1):
+        """Add mentions at a post's timestamp to its hourly and daily buckets"""
+        hour = int(created_utc // 3600)
+        day = hour // 24
+
+        with self._lock:
+            by_subreddit = self.series.setdefault(ticker.upper(), {})
+            rings = by_subreddit.get(subreddit)
+            if rings is None:
+                rings = by_subreddit[subreddit] = {
+                    "hourly": [[-1, 0] for _ in range(HOURLY_SLOTS)],
+                    "daily": [[-1, 0] for _ in range(DAILY_SLOTS)]
+                }
+
+            self._bump(rings["hourly"], hour, HOURLY_SLOTS, count)
+            self._bump(rings["daily"], day, DAILY_SLOTS, count)
+
+    def _bump(self, ring: List[List[int]], bucket: int, slots: int, count: int):
+        slot = ring[bucket % slots]
+        if slot[0] != bucket:
+            slot[0] = bucket
+            slot[1] = 0
+        slot[1] += count
+
+    def hourly_total(
+        self,
+        ticker: str,
+        hours: int,
+        now: Optional[float] = None,
+        subreddit: Optional[str] = None
+    ) -> int:
+        """
+        Mentions over the last `hours` hours as a sliding window: whole
+        buckets back to the current one, plus the share of the oldest
+        partial bucket the window still covers (one subreddit's, if given)
+        """
+        now = now or time.time()
+        hours = min(hours, HOURLY_SLOTS)
+        current = int(now // 3600)
+        total = self._sum(ticker, "hourly", range(current - hours + 1, current + 1), HOURLY_SLOTS, subreddit)
+
+        if hours < HOURLY_SLOTS:
+            uncovered = (now % 3600) / 3600
+            oldest = current - hours
+            total += self._sum(ticker, "hourly", range(oldest, oldest + 1), HOURLY_SLOTS, subreddit) * (1 - uncovered)
+
+        return int(round(total))
+
+    def daily_total(self, ticker: str, days: int, now: Optional[float] = None) -> int:
+        """Mentions over the last `days` UTC days (today included) for longer baselines"""
+        days = min(days, DAILY_SLOTS)
+        today = int((now or time.time()) // 86400)
+        wanted = range(today - days + 1, today + 1)
+        return self._sum(ticker, "daily", wanted, DAILY_SLOTS)
+
+    def _sum(self, ticker: str, ring_name: str, buckets: range, slots: int, subreddit: Optional[str] = None) -> int:
+        total = 0
+        with self._lock:
+            for name, rings in self.series.get(ticker.upper(), {}).items():
+                if subreddit is not None and name != subreddit:
+                    continue
+                ring = rings[ring_name]
+                for bucket in buckets:
+                    slot = ring[bucket % slots]
+                    if slot[0] == bucket:
+                        total += slot[1]
+        return total
+
+    def buzz_counts(self, ticker: str, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        1h / 24h / 7-day mention counts for one ticker. A subreddit with
+        gaps in the week has its share of the 7-day count scaled up to the
+        full week from the days it covered (at least one).
+        """
+        now = now or time.time()
+        counts = {
+            "mentions_1h": self.hourly_total(ticker, 1, now),
+            "mentions_24h": self.hourly_total(ticker, 24, now),
+            "mentions_7d": self.hourly_total(ticker, HOURLY_SLOTS, now)
+        }
+
+        week = HOURLY_SLOTS * 3600
+        with self._lock:
+            subreddits = list(self.series.get(ticker.upper(), {}))
+        for subreddit in subreddits:
+            missed = self.gap_seconds(subreddit, now - week, now)
+            if missed:
+                covered_days = max(1.0, (week - missed) / 86400)
+                scale = (week / 86400) / covered_days
+                mentions = self.hourly_total(ticker, HOURLY_SLOTS, now, subreddit)
+                counts["mentions_7d"] += int(round(mentions * (scale - 1)))
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tickers": len(self.series),
+            "watermarks": dict(self.watermarks),
+            "gaps": {subreddit: len(gaps) for subreddit, gaps in self.gaps.items() if gaps}
+        }
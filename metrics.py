@@ -0,0 +1,224 @@
+"""
+ECHOPULSE v3.0 Metrics
+Process-wide latency histograms and counters, exported for Prometheus and scan files
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple
+
+
+# Seconds; covers cache hits through slow yfinance info fetches
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Dict[str, str] = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by metric name and label set"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Time a block into <name>_seconds and count it in <name>_calls_total,
+        plus <name>_errors_total if it raises
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - started, **labels)
+            self.inc(f"{name}_calls_total", **labels)
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def drain(self) -> Dict[str, Any]:
+        """
+        Raw counters and histograms recorded since the last drain, then reset;
+        picklable, for worker processes to hand back to the parent's merge()
+        """
+        with self._lock:
+            state = {
+                "counters": {
+                    name: list(series.items()) for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [(key, h.buckets, h.counts, h.count, h.sum, h.max) for key, h in series.items()]
+                    for name, series in self._histograms.items()
+                }
+            }
+            self._counters.clear()
+            self._histograms.clear()
+        return state
+
+    def merge(self, state: Dict[str, Any]):
+        """Add another registry's drain() into this one"""
+        with self._lock:
+            for name, items in state["counters"].items():
+                series = self._counters.setdefault(name, {})
+                for key, value in items:
+                    series[key] = series.get(key, 0) + value
+            for name, items in state["histograms"].items():
+                series = self._histograms.setdefault(name, {})
+                for key, buckets, counts, count, total, peak in items:
+                    histogram = series.get(key)
+                    if histogram is None:
+                        histogram = series[key] = Histogram(buckets)
+                    histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                    histogram.count += count
+                    histogram.sum += total
+                    histogram.max = max(histogram.max, peak)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+            for name in sorted(self._histograms):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, {'le': f'{bound:g}'})} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, {'le': '+Inf'})} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+            lines.extend(self._cache_gauge_lines())
+
+        return "\n".join(lines) + "\n"
+
+    def _cache_gauge_lines(self) -> List[str]:
+        hits = sum(self._counters.get("echopulse_info_cache_hits_total", {}).values())
+        misses = sum(self._counters.get("echopulse_info_cache_misses_total", {}).values())
+        if not hits + misses:
+            return []
+        return [
+            "# TYPE echopulse_info_cache_hit_ratio gauge",
+            f"echopulse_info_cache_hit_ratio {hits / (hits + misses):.4f}"
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact JSON view for attaching to scan files"""
+        with self._lock:
+            counters = {
+                name: {_format_labels(key) or "total": value for key, value in series.items()}
+                for name, series in self._counters.items()
+            }
+            timings = {
+                name: {
+                    _format_labels(key) or "all": {
+                        "count": h.count,
+                        "mean_ms": round(h.sum / h.count * 1000, 2) if h.count else 0.0,
+                        "p50_ms": round(h.quantile(0.5) * 1000, 2),
+                        "p99_ms": round(h.quantile(0.99) * 1000, 2),
+                        "max_ms": round(h.max * 1000, 2),
+                    }
+                    for key, h in series.items()
+                }
+                for name, series in self._histograms.items()
+            }
+            hits = sum(self._counters.get("echopulse_info_cache_hits_total", {}).values())
+            misses = sum(self._counters.get("echopulse_info_cache_misses_total", {}).values())
+
+        return {
+            "timings": timings,
+            "counters": counters,
+            "info_cache_hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None
+        }
+
+
+METRICS = MetricsRegistry()
+METRICS.describe("echopulse_collector_seconds", "Collector call latency by source and call")
+METRICS.describe("echopulse_analyzer_seconds", "Analyzer phase latency (score, render)")
+METRICS.describe("echopulse_http_seconds", "FastAPI handler latency by route")
+METRICS.describe("echopulse_info_cache_hits_total", "Ticker info cache hits")
+METRICS.describe("echopulse_info_cache_misses_total", "Ticker info cache misses")
@@ -0,0 +1,40 @@
+"""
+ECHOPULSE v3.0 Collection Priority
+Order today's collection by the composite scores of the last scan
+"""
+
+import json
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from analyzer import EchoPulseAnalyzer
+
+
+def previous_scan_file(data_dir: Path = Path("data"), today: Optional[str] = None) -> Optional[Path]:
+    """Most recent data/scan_YYYY-MM-DD.json from before today"""
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    earlier = sorted(
+        path for path in data_dir.glob("scan_*.json")
+        if path.stem.replace("scan_", "") < today
+    )
+    return earlier[-1] if earlier else None
+
+
+def prior_scores(scan_file: Path, analyzer: Optional[EchoPulseAnalyzer] = None) -> Dict[str, float]:
+    """Re-score a saved scan: ticker -> composite"""
+    with open(scan_file, "r") as f:
+        data = json.load(f)
+    return (analyzer or EchoPulseAnalyzer()).composite_scores(data.get("candidates", []))
+
+
+def collection_priority(tickers: List[str], scores: Dict[str, float]) -> Dict[str, float]:
+    """
+    Expected score for every ticker in the watchlist
+    Tickers the last scan never saw get the median, so they land mid-queue
+    instead of ahead of proven names or behind every weak one
+    """
+    known = [scores[ticker] for ticker in tickers if ticker in scores]
+    median = statistics.median(known) if known else 0.0
+    return {ticker: scores.get(ticker, median) for ticker in tickers}
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+ECHOPULSE v3.0 Record / Replay
+Capture raw source payloads from a live scan and replay them offline
+
+    python replay.py record watchlist.txt sessions/2025-11-11.json
+    python replay.py replay sessions/2025-11-11.json --latency yfinance=0.3,reddit=0.5
+    python replay.py replay sessions/2025-11-11.json --throttle fundamentals   # 429s, checked
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional
+
+
+# Typical per-request latency (seconds) seen from GitHub Actions runners
+DEFAULT_LATENCY = {
+    "yfinance": 0.35,
+    "reddit": 0.45,
+    "news": 0.15,
+}
+
+SUBMISSION_FIELDS = ("fullname", "title", "selftext", "created_utc")
+
+# --throttle choice -> (scheduler source, candidate "missing" entry)
+THROTTLE_SOURCES = {
+    "fundamentals": ("yfinance", "fundamentals"),
+    "reddit": ("reddit", "buzz"),
+    "news": ("news", "catalyst"),
+}
+
+
+class ReplayMiss(LookupError):
+    """The session has no recording for this request"""
+
+
+class SourceSession:
+    """
+    Raw payloads from one scan, keyed per source:
+      info      ticker -> yfinance info dict
+      quotes    symbol -> bulk quote row
+      listings  [subreddit, kind, params] -> submissions (plain dicts)
+      catalysts ticker -> catalyst payload
+    """
+
+    def __init__(self, recorded_at: Optional[float] = None):
+        self.recorded_at = recorded_at or time.time()
+        self.tickers: List[str] = []
+        self.info: Dict[str, Dict[str, Any]] = {}
+        self.quotes: Dict[str, Dict[str, Any]] = {}
+        self.listings: Dict[str, List[Dict[str, Any]]] = {}
+        self.catalysts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def listing_key(sub_name: str, kind: str, params: Dict[str, Any]) -> str:
+        return json.dumps([sub_name, kind, params], sort_keys=True)
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "recorded_at": self.recorded_at,
+            "tickers": self.tickers,
+            "info": self.info,
+            "quotes": self.quotes,
+            "listings": self.listings,
+            "catalysts": self.catalysts
+        }
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "wt") as f:
+            json.dump(state, f, default=str)
+
+    @classmethod
+    def load(cls, path: Path) -> "SourceSession":
+        path = Path(path)
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt") as f:
+            state = json.load(f)
+        session = cls(state["recorded_at"])
+        session.tickers = state.get("tickers", [])
+        session.info = state.get("info", {})
+        session.quotes = state.get("quotes", {})
+        session.listings = state.get("listings", {})
+        session.catalysts = state.get("catalysts", {})
+        return session
+
+
+class SessionRecorder:
+    """Wrap a live aggregator's raw fetchers so every payload is kept"""
+
+    def __init__(self, session: Optional[SourceSession] = None):
+        self.session = session or SourceSession()
+
+    def install(self, aggregator):
+        stock = aggregator.stock_collector
+        fundamentals = aggregator.fundamentals_collector
+        reddit = aggregator.reddit_collector
+        news = aggregator.news_collector
+
+        stock.info_fetcher = self._record_info(stock.info_fetcher)
+        fundamentals.info_fetcher = self._record_info(fundamentals.info_fetcher)
+        stock.quote_fetcher = self._record_quotes(stock.quote_fetcher)
+        reddit.listing_fetcher = self._record_listing(reddit.listing_fetcher)
+        news.get_upcoming_catalysts = self._record_catalyst(news.get_upcoming_catalysts)
+
+        # Freeze time and skip the mention store so listings replay identically
+        reddit.clock = lambda: self.session.recorded_at
+        reddit.store = None
+        return aggregator
+
+    def _record_info(self, fetch):
+        def recording(ticker):
+            info = fetch(ticker)
+            with self.session._lock:
+                self.session.info[ticker] = info
+            return info
+        return recording
+
+    def _record_quotes(self, fetch):
+        def recording(chunk):
+            rows = fetch(chunk)
+            with self.session._lock:
+                for row in rows:
+                    self.session.quotes[str(row.get("symbol", "")).upper()] = row
+            return rows
+        return recording
+
+    def _record_listing(self, fetch):
+        def recording(sub_name, kind, params):
+            page = fetch(sub_name, kind, params)
+            posts = [
+                {field: getattr(post, field, None) for field in SUBMISSION_FIELDS}
+                for post in page
+            ]
+            with self.session._lock:
+                self.session.listings[SourceSession.listing_key(sub_name, kind, params)] = posts
+            return page
+        return recording
+
+    def _record_catalyst(self, fetch):
+        def recording(ticker, *args):
+            payload = fetch(ticker, *args)
+            with self.session._lock:
+                self.session.catalysts[ticker] = payload
+            return payload
+        return recording
+
+
+class SessionReplayer:
+    """
+    Serve an aggregator entirely from a recorded session.
+    Each request sleeps for its source's latency (+/- jitter) so
+    concurrency behaves like it would against the real services.
+    Sources named in throttle (THROTTLE_SOURCES keys) answer every request
+    as if still rate limited after all retries.
+    """
+
+    def __init__(
+        self,
+        session: SourceSession,
+        latency: Optional[Dict[str, float]] = None,
+        jitter: float = 0.25,
+        seed: int = 0,
+        throttle: Optional[List[str]] = None
+    ):
+        self.session = session
+        self.throttle = list(throttle or [])
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self.jitter = jitter
+        self.calls: Dict[str, int] = {source: 0 for source in self.latency}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def install(self, aggregator, scheduler=None):
+        """Point every collector at the session; optionally swap the rate-limit scheduler"""
+        stock = aggregator.stock_collector
+        fundamentals = aggregator.fundamentals_collector
+        reddit = aggregator.reddit_collector
+        news = aggregator.news_collector
+
+        stock.info_fetcher = self.fetch_info
+        fundamentals.info_fetcher = self.fetch_info
+        stock.quote_fetcher = self.fetch_quotes
+        reddit.listing_fetcher = self.fetch_listing
+        reddit.enabled = True
+        reddit.store = None
+        reddit.clock = lambda: self.session.recorded_at
+        news.get_upcoming_catalysts = self.fetch_catalyst
+
+        if "fundamentals" in self.throttle:
+            fundamentals.info_fetcher = self._throttled("fundamentals")
+        if "reddit" in self.throttle:
+            reddit.listing_fetcher = self._throttled("reddit")
+        if "news" in self.throttle:
+            news.get_upcoming_catalysts = self._throttled("news")
+
+        if scheduler is not None:
+            stock.scheduler = fundamentals.scheduler = reddit.scheduler = scheduler
+        return aggregator
+
+    def _wait(self, source: str):
+        with self._lock:
+            self.calls[source] = self.calls.get(source, 0) + 1
+            spread = self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(max(0.0, self.latency.get(source, 0.0) * spread))
+
+    def _throttled(self, name: str):
+        from request_scheduler import RateLimited
+
+        source = THROTTLE_SOURCES[name][0]
+
+        def fetch(*args):
+            self._wait(source)
+            raise RateLimited(source, f"{source} still throttled (replayed 429)")
+        return fetch
+
+    def fetch_info(self, ticker: str) -> Dict[str, Any]:
+        self._wait("yfinance")
+        if ticker not in self.session.info:
+            raise ReplayMiss(f"no recorded info for {ticker}")
+        return copy.deepcopy(self.session.info[ticker])
+
+    def fetch_quotes(self, chunk: List[str]) -> List[Dict[str, Any]]:
+        self._wait("yfinance")
+        return [
+            copy.deepcopy(self.session.quotes[symbol.upper()])
+            for symbol in chunk
+            if symbol.upper() in self.session.quotes
+        ]
+
+    def fetch_listing(self, sub_name: str, kind: str, params: Dict[str, Any]) -> List[Any]:
+        self._wait("reddit")
+        key = SourceSession.listing_key(sub_name, kind, params)
+        if key not in self.session.listings:
+            raise ReplayMiss(f"no recorded listing for {key}")
+        return [SimpleNamespace(**post) for post in self.session.listings[key]]
+
+    def fetch_catalyst(self, ticker: str, *args) -> Dict[str, Any]:
+        self._wait("news")
+        if ticker not in self.session.catalysts:
+            raise ReplayMiss(f"no recorded catalyst for {ticker}")
+        return copy.deepcopy(self.session.catalysts[ticker])
+
+
+def check_throttled(data: Dict[str, Any], quoted: List[str], throttle: List[str]) -> List[str]:
+    """
+    Problems with a scan replayed under --throttle: every quoted ticker must
+    still be a candidate, flagging each throttled source as missing, and the
+    throttled sources must be reported under source_errors
+    """
+    problems = []
+    candidates = {c["ticker"]: c for c in data["candidates"]}
+    for ticker in quoted:
+        candidate = candidates.get(ticker)
+        if candidate is None:
+            problems.append(f"{ticker} dropped")
+            continue
+        for name in throttle:
+            if THROTTLE_SOURCES[name][1] not in candidate.get("missing", []):
+                problems.append(f"{ticker} not flagged missing {THROTTLE_SOURCES[name][1]}")
+    for name in throttle:
+        if THROTTLE_SOURCES[name][0] not in data.get("source_errors", {}):
+            problems.append(f"{THROTTLE_SOURCES[name][0]} not in source_errors")
+    return problems
+
+
+def _parse_latency(text: Optional[str]) -> Dict[str, float]:
+    """'yfinance=0.3,reddit=0.5' -> {'yfinance': 0.3, 'reddit': 0.5}"""
+    latency = {}
+    for part in (text or "").split(","):
+        if "=" in part:
+            source, seconds = part.split("=", 1)
+            latency[source.strip()] = float(seconds)
+    return latency
+
+
+def main():
+    from collectors import DataAggregator
+    from scanner import load_watchlist
+
+    parser = argparse.ArgumentParser(description="Record or replay ECHOPULSE source payloads")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="run a live scan and save its payloads")
+    record.add_argument("watchlist", nargs="?")
+    record.add_argument("session")
+
+    replay = sub.add_parser("replay", help="rerun a scan from a saved session")
+    replay.add_argument("session")
+    replay.add_argument("--latency", help="per-source seconds, e.g. yfinance=0.3,reddit=0.5")
+    replay.add_argument("--output", help="write the scan JSON here")
+    replay.add_argument(
+        "--throttle", action="append", choices=sorted(THROTTLE_SOURCES), default=[],
+        help="serve this source as rate limited and check the scan degrades to missing fields (repeatable)"
+    )
+
+    args = parser.parse_args()
+    aggregator = DataAggregator()
+
+    if args.command == "record":
+        recorder = SessionRecorder()
+        recorder.install(aggregator)
+        watchlist = load_watchlist(args.watchlist)
+        recorder.session.tickers = list(watchlist)
+        data = aggregator.scan_watchlist(watchlist)
+        recorder.session.save(Path(args.session))
+        print(f"✅ Recorded {len(data['candidates'])} candidates to {args.session}")
+        return
+
+    session = SourceSession.load(Path(args.session))
+    replayer = SessionReplayer(session, latency=_parse_latency(args.latency), throttle=args.throttle)
+    replayer.install(aggregator)
+
+    # Same tickers, same order as the recording
+    watchlist = session.tickers
+    started = time.monotonic()
+    data = aggregator.scan_watchlist(watchlist)
+    data["date"] = datetime.fromtimestamp(session.recorded_at).strftime("%Y-%m-%d")
+    elapsed = time.monotonic() - started
+
+    print(f"✅ Replayed {len(data['candidates'])} candidates in {elapsed:.2f}s ({replayer.calls})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if args.throttle:
+        quoted = [ticker for ticker in watchlist if ticker.upper() in session.quotes]
+        problems = check_throttled(data, quoted, args.throttle)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print(f"✅ Throttled {', '.join(args.throttle)}: all {len(quoted)} quoted tickers kept, gaps flagged")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+ECHOPULSE v3.0 Request Scheduler
+Token-bucket rate limiting, priority ordering and throttle backoff per source
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Tuple
+
+
+# (requests per second, burst capacity) per upstream source
+DEFAULT_RATE_LIMITS = {
+    "yfinance": (2.0, 5),
+    "reddit": (100 / 60, 10),   # OAuth quota: 100 requests per minute
+    "news": (5.0, 5),
+}
+
+# Lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+class RateLimited(Exception):
+    """An upstream source kept throttling us after every retry"""
+
+    def __init__(self, source: str, message: str = ""):
+        self.source = source
+        super().__init__(message or f"{source} rate limit exceeded")
+
+
+class TokenBucket:
+    """Classic token bucket; not thread-safe on its own (the scheduler locks it)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return 0, or return seconds until one is available"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next `seconds`"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def apply_quota(self, remaining: float, reset_in: float):
+        """Re-pace the bucket to spend what is left of a server-side quota window"""
+        now = time.monotonic()
+        self._refill(now)
+        if remaining < 1:
+            self.tokens = 0
+            self.pause(reset_in)
+            return
+        if reset_in > 0:
+            self.rate = remaining / reset_in
+        self.tokens = min(self.tokens, remaining)
+
+
+class RequestScheduler:
+    """
+    Shared gate for every outbound request.
+    Callers submit(source, fn) and block until the source's bucket has a
+    token and no higher-priority request for that source is waiting.
+    Throttled calls are retried with exponential backoff and jitter, and
+    pause the whole source so other workers back off too.
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_retries: int = 4,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0
+    ):
+        limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.buckets = {source: TokenBucket(rate, cap) for source, (rate, cap) in limits.items()}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.throttled: Dict[str, int] = {source: 0 for source in limits}
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, list] = {source: [] for source in limits}
+        self._seq = itertools.count()
+
+    def submit(
+        self,
+        source: str,
+        fn: Callable[..., Any],
+        *args,
+        priority: int = PRIORITY_NORMAL,
+        **kwargs
+    ) -> Any:
+        """Run fn(*args, **kwargs) once the source allows it; retry while throttled"""
+        for attempt in range(self.max_retries + 1):
+            self._acquire(source, priority)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                retry_after = throttle_delay(e)
+                if retry_after is None:
+                    raise
+                if attempt == self.max_retries:
+                    raise RateLimited(source, f"{source} still throttled after {attempt + 1} attempts: {e}") from e
+
+                delay = self._backoff(attempt, retry_after)
+                print(f"{source} throttled, backing off {delay:.1f}s")
+                with self._cond:
+                    self.throttled[source] = self.throttled.get(source, 0) + 1
+                    if source in self.buckets:
+                        self.buckets[source].pause(delay)
+                    self._cond.notify_all()
+
+    def _acquire(self, source: str, priority: int):
+        bucket = self.buckets.get(source)
+        if bucket is None:
+            return
+
+        with self._cond:
+            queue = self._queues[source]
+            entry = (priority, next(self._seq))
+            heapq.heappush(queue, entry)
+            try:
+                while True:
+                    timeout = None
+                    if queue[0] == entry:
+                        timeout = bucket.reserve()
+                        if timeout <= 0:
+                            heapq.heappop(queue)
+                            self._cond.notify_all()
+                            return
+                    self._cond.wait(timeout)
+            except BaseException:
+                if entry in queue:
+                    queue.remove(entry)
+                    heapq.heapify(queue)
+                    self._cond.notify_all()
+                raise
+
+    def _backoff(self, attempt: int, retry_after: float) -> float:
+        """Exponential backoff with equal jitter, never shorter than the server asked"""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        return max(delay, retry_after)
+
+    def update_quota(self, source: str, remaining: Optional[float], reset_in: Optional[float]):
+        """Feed a server-reported quota (remaining calls, seconds until reset)"""
+        if remaining is None or reset_in is None or source not in self.buckets:
+            return
+        with self._cond:
+            self.buckets[source].apply_quota(float(remaining), float(reset_in))
+            self._cond.notify_all()
+
+    def update_from_headers(self, source: str, headers: Dict[str, str]):
+        """Honour X-RateLimit-Remaining / X-RateLimit-Reset / Retry-After headers"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        retry_after = _to_float(headers.get("retry-after"))
+        if retry_after is not None:
+            self.update_quota(source, 0, retry_after)
+            return
+        self.update_quota(
+            source,
+            _to_float(headers.get("x-ratelimit-remaining")),
+            _to_float(headers.get("x-ratelimit-reset"))
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                source: {
+                    "rate": round(bucket.rate, 3),
+                    "waiting": len(self._queues[source]),
+                    "throttled": self.throttled.get(source, 0)
+                }
+                for source, bucket in self.buckets.items()
+            }
+
+
+class AsyncRequestScheduler(RequestScheduler):
+    """
+    asyncio counterpart for the async collectors: same buckets, backoff and
+    quota handling, but waits with asyncio.sleep and submits coroutines.
+    Requests for a source queue first-come first-served (no priorities).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._source_locks: Dict[str, asyncio.Lock] = {}
+
+    async def submit(self, source: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) once the source allows it; retry while throttled"""
+        for attempt in range(self.max_retries + 1):
+            await self._acquire_async(source)
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                retry_after = throttle_delay(e)
+                if retry_after is None:
+                    raise
+                if attempt == self.max_retries:
+                    raise RateLimited(source, f"{source} still throttled after {attempt + 1} attempts: {e}") from e
+
+                delay = self._backoff(attempt, retry_after)
+                print(f"{source} throttled, backing off {delay:.1f}s")
+                with self._cond:
+                    self.throttled[source] = self.throttled.get(source, 0) + 1
+                    if source in self.buckets:
+                        self.buckets[source].pause(delay)
+
+    async def _acquire_async(self, source: str):
+        bucket = self.buckets.get(source)
+        if bucket is None:
+            return
+
+        lock = self._source_locks.setdefault(source, asyncio.Lock())
+        async with lock:
+            while True:
+                with self._cond:
+                    wait = bucket.reserve()
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+
+def throttle_delay(exc: Exception) -> Optional[float]:
+    """
+    Seconds to wait if exc means "slow down" (0 when the server gave no hint),
+    None for ordinary failures
+    """
+    if isinstance(exc, RateLimited):
+        return None  # already retried upstream
+
+    # yfinance raises YFRateLimitError on HTTP 429
+    if type(exc).__name__ in ("YFRateLimitError", "TooManyRequests"):
+        response = getattr(exc, "response", None)
+        return _retry_after_header(response) or 0.0
+
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return _retry_after_header(response) or 0.0
+
+    return None
+
+
+def _retry_after_header(response: Any) -> Optional[float]:
+    headers = getattr(response, "headers", None) or {}
+    for key, value in headers.items():
+        if key.lower() == "retry-after":
+            return _to_float(value)
+    return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Process-wide scheduler: quotas belong to the upstream, not to a collector
+shared_scheduler = RequestScheduler()
@@ -0,0 +1,255 @@
+"""
+ECHOPULSE v3.0 Scan Engine
+Parallel watchlist collection with per-source concurrency limits and deadlines
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from circuit_breaker import CircuitOpenError
+from metrics import METRICS
+from request_scheduler import RateLimited
+
+
+# Max in-flight calls per upstream source, shared by all scan workers
+DEFAULT_SOURCE_LIMITS = {
+    "yfinance": 4,
+    "reddit": 2,
+    "news": 4,
+}
+
+# Seconds one collector call may take before it is abandoned (used with a deadline).
+# "reddit_watchlist" is the whole one-pass subreddit read, not a single request.
+DEFAULT_SOURCE_TIMEOUTS = {
+    "yfinance": 30,
+    "reddit": 60,
+    "news": 20,
+    "reddit_watchlist": 300,
+}
+
+# How long in-flight tickers get to wrap up with partial data once the deadline passes
+DEADLINE_GRACE = 5.0
+
+
+class SourceTimeout(TimeoutError):
+    """A collector call ran past its source timeout or the scan deadline"""
+
+    def __init__(self, source: str, seconds: float):
+        self.source = source
+        self.seconds = seconds
+        super().__init__(f"{source} call timed out after {seconds:.1f}s")
+
+
+class Deadline:
+    """Wall-clock budget for a whole scan"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Deadline state for scan metadata"""
+        return {
+            "minutes": round(self.seconds / 60, 2),
+            "expired": self.expired(),
+            "remaining_seconds": round(self.remaining(), 1)
+        }
+
+
+def call_with_timeout(
+    source: str,
+    timeout: Optional[float],
+    fn: Callable[..., Any],
+    *args,
+    slot: Optional[threading.Semaphore] = None,
+    **kwargs
+) -> Any:
+    """
+    Run fn on a daemon thread and stop waiting after timeout seconds
+    Python cannot kill a thread, so a hung call is abandoned rather than
+    cancelled; being a daemon it never holds up interpreter exit.
+    slot is an already-acquired concurrency slot, released when fn actually
+    returns, so an abandoned call keeps counting against its source's limit.
+    """
+    release = slot.release if slot is not None else (lambda: None)
+    if timeout is None:
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            release()
+    if timeout <= 0:
+        release()
+        raise SourceTimeout(source, 0)
+
+    outcome: Dict[str, Any] = {}
+    done = threading.Event()
+
+    def target():
+        try:
+            outcome["value"] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            release()
+            done.set()
+
+    threading.Thread(target=target, name=f"echopulse-{source}", daemon=True).start()
+    if not done.wait(timeout):
+        raise SourceTimeout(source, timeout)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+class ScanEngine:
+    """
+    Run a per-ticker collector across a worker pool
+    With source_timeouts and/or a deadline, every call() is bounded by
+    whichever runs out first, and run() stops handing out tickers once
+    the deadline passes.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        source_limits: Optional[Dict[str, int]] = None,
+        source_timeouts: Optional[Dict[str, float]] = None,
+        deadline: Optional[Deadline] = None
+    ):
+        self.max_workers = max(1, max_workers)
+        self.source_limits = {**DEFAULT_SOURCE_LIMITS, **(source_limits or {})}
+        self.source_timeouts = dict(source_timeouts or {})
+        self.deadline = deadline
+        self._semaphores = {
+            source: threading.BoundedSemaphore(max(1, limit))
+            for source, limit in self.source_limits.items()
+        }
+
+    @contextmanager
+    def limit(self, source: str):
+        """Hold one concurrency slot for a source (unknown sources are unbounded)"""
+        semaphore = self._semaphores.get(source)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+    def timeout_for(self, source: str) -> Optional[float]:
+        """Seconds a call to this source may take right now (None = unbounded)"""
+        timeout = self.source_timeouts.get(source)
+        if self.deadline is not None:
+            remaining = self.deadline.remaining()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def call(self, source: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call a collector method under the source's concurrency limit
+        Raises SourceTimeout if the call outlives its timeout or the deadline;
+        the slot stays taken until the abandoned call really finishes.
+        """
+        slot = self._semaphores.get(source)
+        if slot is not None:
+            slot.acquire()
+        with METRICS.timer("echopulse_collector", source=source, call=getattr(fn, "__name__", "call")):
+            return call_with_timeout(source, self.timeout_for(source), fn, *args, slot=slot, **kwargs)
+
+    def call_best_effort(
+        self,
+        source: str,
+        fn: Callable[..., Any],
+        *args,
+        source_errors: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Like call(), but a call that times out, stays throttled after its
+        retries or is skipped by an open circuit breaker returns None so the
+        caller can flag the gap; the reason is recorded under source_errors
+        """
+        try:
+            return self.call(source, fn, *args, **kwargs)
+        except (SourceTimeout, RateLimited, CircuitOpenError) as e:
+            print(f"⏰ {e}")
+            if source_errors is not None:
+                source_errors[source] = str(e)
+            return None
+
+    def run(
+        self,
+        tickers: List[str],
+        collect: Callable[[str], Optional[Dict[str, Any]]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        priority: Optional[Dict[str, float]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """
+        Collect every ticker in parallel
+        Returns (candidates, failures), both in watchlist order.
+        A ticker fails if collect raises or returns None; the scan carries on.
+        on_result is called with each candidate as soon as it completes,
+        always from the calling thread.
+        When the deadline passes, tickers not yet started are cancelled and
+        those in flight get DEADLINE_GRACE seconds to return partial data.
+        With priority (ticker -> score), higher-scored tickers start first,
+        so a deadline cuts the least promising ones; output order is unchanged.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tickers)
+        errors: List[Optional[str]] = [None] * len(tickers)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="echopulse-scan")
+        order = range(len(tickers))
+        if priority:
+            order = sorted(order, key=lambda i: -priority.get(tickers[i], 0.0))
+        futures = {pool.submit(collect, tickers[i]): i for i in order}
+        pending = set(futures)
+
+        def drain(timeout: Optional[float]):
+            for future in as_completed(list(pending), timeout=timeout):
+                pending.discard(future)
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    print(f"Scan failed for {tickers[i]}: {e}")
+                    errors[i] = str(e)
+                    continue
+
+                if results[i] is None:
+                    errors[i] = "no data returned"
+                elif on_result is not None:
+                    on_result(results[i])
+
+        try:
+            drain(self.deadline.remaining() if self.deadline is not None else None)
+        except FuturesTimeout:
+            cancelled = [future for future in pending if future.cancel()]
+            for future in cancelled:
+                pending.discard(future)
+                errors[futures[future]] = "deadline exceeded"
+            print(f"⏰ Deadline reached: {len(cancelled)} tickers not started, {len(pending)} finishing up")
+            try:
+                drain(DEADLINE_GRACE)
+            except FuturesTimeout:
+                for future in pending:
+                    errors[futures[future]] = "deadline exceeded"
+        finally:
+            # Don't block on stragglers past the deadline; their calls are already abandoned
+            pool.shutdown(wait=not pending, cancel_futures=True)
+
+        candidates = [r for r in results if r is not None]
+        failures = [
+            {"ticker": ticker, "error": error}
+            for ticker, error in zip(tickers, errors)
+            if error is not None
+        ]
+        return candidates, failures
@@ -4,12 +4,21 @@ ECHOPULSE v3.0 Scanner Script
 Automated daily scan of watchlist stocks
 """
 
+import argparse
+import functools
 import json
 import sys
 from datetime import datetime
 from pathlib import Path
 from collectors import DataAggregator
 from analyzer import EchoPulseAnalyzer
+from atomic_io import atomic_writer, write_atomic
+from checkpoint import ScanCheckpoint
+from funnel import ScanFunnel, FunnelFilters, load_us_universe
+from mention_store import MentionStore
+from scan_engine import ScanEngine, Deadline, DEFAULT_SOURCE_TIMEOUTS
+from metrics import METRICS
+from priority import previous_scan_file, prior_scores, collection_priority
 
 
 # Default watchlist - can be customized
@@ -34,6 +43,42 @@ def load_watchlist(filepath: str = None) -> list:
     return DEFAULT_WATCHLIST
 
 
+def checkpoint_path(output_dir: Path = Path("data")) -> Path:
+    """Today's append-only candidate checkpoint"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    return output_dir / f"scan_{today}.ndjson"
+
+
+def collect_with_checkpoint(
+    scan,
+    watchlist: list,
+    checkpoint: ScanCheckpoint,
+    resume: bool = False
+) -> dict:
+    """
+    Scan the watchlist, streaming each candidate to the checkpoint
+    scan(tickers, on_candidate) is DataAggregator.scan_watchlist or ScanFunnel.run.
+    With resume, tickers already checkpointed today are not collected again.
+    The returned data is assembled from the checkpoint, in watchlist order.
+    """
+    if resume:
+        done = checkpoint.tickers()
+        print(f"♻️  Resuming: {len(done)} tickers already collected today")
+    else:
+        checkpoint.reset()
+        done = set()
+
+    remaining = [ticker for ticker in watchlist if ticker not in done]
+    data = scan(remaining, on_candidate=checkpoint.append)
+
+    order = {ticker: i for i, ticker in enumerate(watchlist)}
+    candidates = [c for c in checkpoint.load() if c.get("ticker") in order]
+    candidates.sort(key=lambda c: order[c["ticker"]])
+
+    data["candidates"] = candidates
+    return data
+
+
 def save_scan_results(data: dict, output_dir: Path = Path("data")):
     """Save raw scan data to file"""
     output_dir.mkdir(exist_ok=True)
@@ -41,7 +86,7 @@ def save_scan_results(data: dict, output_dir: Path = Path("data")):
     today = datetime.now().strftime("%Y-%m-%d")
     filename = output_dir / f"scan_{today}.json"
 
-    with open(filename, 'w') as f:
+    with atomic_writer(filename) as f:
         json.dump(data, f, indent=2)
 
     print(f"✅ Saved scan data to {filename}")
@@ -58,36 +103,107 @@ def generate_brief(data: dict, output_dir: Path = Path("briefs")):
     today = datetime.now().strftime("%Y-%m-%d")
     filename = output_dir / f"morning_brief_{today}.md"
 
-    with open(filename, 'w') as f:
-        f.write(brief)
+    # Atomic: the brief index watcher may pick the file up at any moment
+    write_atomic(filename, brief)
 
     print(f"✅ Generated brief at {filename}")
     return filename, brief
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ECHOPULSE v3.0 automated scanner")
+    parser.add_argument("watchlist", nargs="?", help="watchlist file, one ticker per line")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip tickers already in today's checkpoint")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="tickers collected in parallel (default: 8)")
+    parser.add_argument("--no-priority", action="store_true",
+                        help="collect in watchlist order instead of by the last scan's scores")
+    parser.add_argument("--deadline", type=float, metavar="MINUTES",
+                        help="stop collecting after this many minutes and brief "
+                             "from what was gathered; also times out each source call")
+
+    funnel = parser.add_argument_group("funnel", "staged filtering for large scans")
+    funnel.add_argument("--universe", action="store_true",
+                        help="scan every listed US symbol (implies --funnel)")
+    funnel.add_argument("--funnel", action="store_true",
+                        help="filter on quotes, then buzz, before full collection")
+    funnel.add_argument("--quote-workers", type=int, default=8,
+                        help="bulk quote requests in flight (default: 8)")
+    funnel.add_argument("--min-price", type=float, default=2.0)
+    funnel.add_argument("--min-volume", type=int, default=500_000)
+    funnel.add_argument("--min-market-cap", type=float, default=100_000_000)
+    funnel.add_argument("--min-mentions", type=int, default=3,
+                        help="minimum 24h Reddit mentions to reach fundamentals")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main scanner execution"""
+    args = parse_args()
+
     print("=" * 60)
     print("ECHOPULSE v3.0 - Automated Scanner")
     print("=" * 60)
     print()
 
     # Load watchlist
-    watchlist_file = sys.argv[1] if len(sys.argv) > 1 else None
-    watchlist = load_watchlist(watchlist_file)
+    watchlist = load_us_universe() if args.universe else load_watchlist(args.watchlist)
 
     print(f"📋 Watchlist: {len(watchlist)} tickers")
-    print(f"   {', '.join(watchlist)}")
+    if len(watchlist) <= 50:
+        print(f"   {', '.join(watchlist)}")
     print()
 
     # Collect data
     print("🔍 Collecting data...")
-    aggregator = DataAggregator()
-    data = aggregator.scan_watchlist(watchlist)
+    deadline = Deadline(args.deadline * 60) if args.deadline else None
+    if deadline:
+        print(f"⏰ Deadline: {args.deadline:g} minutes")
+    aggregator = DataAggregator(
+        engine=ScanEngine(
+            max_workers=args.workers,
+            source_timeouts=DEFAULT_SOURCE_TIMEOUTS if deadline else None,
+            deadline=deadline
+        ),
+        mention_store=MentionStore(Path("data") / "mentions.json")
+    )
+    scan = aggregator.scan_watchlist
+    if args.funnel or args.universe:
+        filters = FunnelFilters(
+            min_price=args.min_price,
+            min_volume=args.min_volume,
+            min_market_cap=args.min_market_cap,
+            min_mentions_24h=args.min_mentions
+        )
+        scan = ScanFunnel(
+            aggregator,
+            filters,
+            quote_workers=args.quote_workers,
+            detail_workers=args.workers
+        ).run
+
+    # Best-scoring names from the last scan go first, so a deadline cuts the weakest
+    prior_scan = None if args.no_priority else previous_scan_file()
+    if prior_scan:
+        scores = prior_scores(prior_scan)
+        priority = collection_priority(watchlist, scores)
+        known = sum(1 for ticker in watchlist if ticker in scores)
+        print(f"📈 Priority order from {prior_scan.name} ({known}/{len(watchlist)} tickers scored)")
+        scan = functools.partial(scan, priority=priority)
+
+    checkpoint = ScanCheckpoint(checkpoint_path())
+    data = collect_with_checkpoint(scan, watchlist, checkpoint, resume=args.resume)
 
     print(f"✅ Collected data for {len(data['candidates'])} candidates")
     print()
 
+    if deadline:
+        data["deadline"] = deadline.summary()
+
+    # Per-source timings, call/error counts and cache hit ratio for this run
+    data["metrics"] = METRICS.summary()
+
     # Save raw data
     save_scan_results(data)
 
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+ECHOPULSE v3.0 Parameter Sweep
+Grade a grid of composite weights and qualification thresholds against
+archived scans and their forward returns, all configurations at once
+
+    python sweep.py --offline --top 20
+    python sweep.py --min-attention 50,60,70 --output sweep.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from analyzer import EchoPulseAnalyzer
+from backtest import OHLCVCache, load_day, scan_days, simulate_pick, time_stop_date
+
+
+# Composite components, in the order EchoPulseAnalyzer.score_batch sums them
+COMPONENTS = ("attention", "health", "catalyst", "confidence")
+BASELINE_WEIGHTS = (0.4, 0.2, 0.2, 0.2)
+
+DEFAULT_MIN_ATTENTION = (40, 50, 60, 70)
+DEFAULT_MIN_HEALTH = (1, 2, 3)
+DEFAULT_MIN_CONFIDENCE = (1, 2, 3)
+# Each weight in 10% steps; combinations summing to 100%
+WEIGHT_STEP = 10
+
+# Upper bound on days x candidates x configs floats held at once
+MAX_CELLS = 20_000_000
+
+
+def weight_grid(step: int = WEIGHT_STEP) -> List[Tuple[float, ...]]:
+    """Every weight vector on the simplex in step-% increments, each weight > 0"""
+    levels = range(step, 100, step)
+    return [
+        tuple(w / 100 for w in combo)
+        for combo in product(levels, repeat=len(COMPONENTS))
+        if sum(combo) == 100
+    ]
+
+
+def config_grid(
+    weights: List[Tuple[float, ...]],
+    min_attention=DEFAULT_MIN_ATTENTION,
+    min_health=DEFAULT_MIN_HEALTH,
+    min_confidence=DEFAULT_MIN_CONFIDENCE
+) -> Dict[str, np.ndarray]:
+    """Configuration columns: weights (C, 4) and one threshold array per filter"""
+    configs = list(product(weights, min_attention, min_health, min_confidence))
+    return {
+        "weights": np.array([c[0] for c in configs], dtype=np.float64).reshape(-1, len(COMPONENTS)),
+        "min_attention": np.array([c[1] for c in configs], dtype=np.float64),
+        "min_health": np.array([c[2] for c in configs], dtype=np.float64),
+        "min_confidence": np.array([c[3] for c in configs], dtype=np.float64)
+    }
+
+
+def day_outcomes(source: str, cache_dir: str, history_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One archived scan as columns: the analyzer's score components for every
+    candidate plus the brief's exit plan played over its forward prices
+    (runs in a worker process)
+    """
+    date, candidates = load_day(source, history_dir)
+    cache = OHLCVCache(Path(cache_dir))
+
+    scores = EchoPulseAnalyzer().score_batch(candidates)
+    returns, t1_hits = [], []
+    for c in candidates:
+        trade = simulate_pick(
+            {"date": date, "ticker": c["ticker"], "price": c.get("price", 0), "catalyst_date": c.get("catalyst_date")},
+            cache.load(c["ticker"])
+        )
+        returns.append(np.nan if trade["return_pct"] is None else trade["return_pct"])
+        t1_hits.append(bool(trade.get("t1_hit")))
+
+    confidence = [c.get("rumor_confidence", 0) for c in candidates]
+    return {
+        "date": date,
+        "tickers": [c["ticker"] for c in candidates],
+        # Scaled exactly as score_batch scales them before weighting
+        "components": np.stack([
+            scores["attention"],
+            scores["health"] * 20,
+            np.array([100.0 if c.get("catalyst_date") else 50.0 for c in candidates]),
+            np.array(confidence, dtype=np.float64) * 33.3
+        ], axis=-1) if candidates else np.zeros((0, len(COMPONENTS))),
+        "attention": scores["attention"],
+        "health": scores["health"],
+        "confidence": np.array(confidence, dtype=np.float64),
+        "return_pct": np.array(returns, dtype=np.float64),
+        "t1_hit": np.array(t1_hits, dtype=np.bool_)
+    }
+
+
+def stack_days(days: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Pad per-day columns into (days, max candidates) arrays with a valid mask"""
+    d = len(days)
+    n = max((len(day["tickers"]) for day in days), default=0)
+    stacked = {
+        "valid": np.zeros((d, n), dtype=np.bool_),
+        "components": np.zeros((d, n, len(COMPONENTS))),
+        "attention": np.zeros((d, n)),
+        "health": np.zeros((d, n)),
+        "confidence": np.zeros((d, n)),
+        "return_pct": np.full((d, n), np.nan),
+        "t1_hit": np.zeros((d, n), dtype=np.bool_)
+    }
+    for i, day in enumerate(days):
+        size = len(day["tickers"])
+        stacked["valid"][i, :size] = True
+        for key in ("components", "attention", "health", "confidence", "return_pct", "t1_hit"):
+            stacked[key][i, :size] = day[key]
+    return stacked
+
+
+def evaluate_grid(stacked: Dict[str, np.ndarray], grid: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Each configuration's pick for each day, then its stats over days:
+    composite for every (day, candidate, config) in one broadcast, masked by
+    the config's thresholds, argmax over candidates (first wins ties, like
+    the stable sort in rank()). Configs are processed in chunks of MAX_CELLS.
+    """
+    d, n = stacked["valid"].shape
+    c = len(grid["min_attention"])
+    trades = np.zeros(c, dtype=np.int64)
+    hits = np.zeros(c, dtype=np.int64)
+    wins = np.zeros(c, dtype=np.int64)
+    total = np.zeros(c)
+    picks = np.full((d, c), -1, dtype=np.int64)
+
+    chunk = max(1, MAX_CELLS // max(1, d * n))
+    rows = np.arange(d)[:, None]
+    for lo in range(0, c if n else 0, chunk):
+        hi = min(c, lo + chunk)
+        weights = grid["weights"][lo:hi]
+
+        # Summed component by component, in score_batch order, so the
+        # baseline config reproduces the analyzer's composite exactly
+        composite = np.zeros((d, n, hi - lo))
+        for k in range(len(COMPONENTS)):
+            composite += stacked["components"][:, :, k, None] * weights[:, k]
+
+        qualified = (
+            stacked["valid"][:, :, None]
+            & (stacked["attention"][:, :, None] >= grid["min_attention"][lo:hi])
+            & (stacked["health"][:, :, None] >= grid["min_health"][lo:hi])
+            & (stacked["confidence"][:, :, None] >= grid["min_confidence"][lo:hi])
+        )
+        masked = np.where(qualified, composite, -np.inf)
+        best = masked.argmax(axis=1)                                  # (d, configs)
+        has_pick = np.take_along_axis(qualified, best[:, None, :], axis=1)[:, 0, :]
+
+        returns = stacked["return_pct"][rows, best]
+        t1 = stacked["t1_hit"][rows, best]
+        graded = has_pick & ~np.isnan(returns)
+
+        picks[:, lo:hi] = np.where(has_pick, best, -1)
+        trades[lo:hi] = graded.sum(axis=0)
+        hits[lo:hi] = (graded & t1).sum(axis=0)
+        wins[lo:hi] = (graded & (returns > 0)).sum(axis=0)
+        total[lo:hi] = np.where(graded, returns, 0).sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "picks": picks,
+            "trades": trades,
+            "t1_hit_rate": np.where(trades > 0, hits / trades * 100, 0.0),
+            "win_rate": np.where(trades > 0, wins / trades * 100, 0.0),
+            # Mean return per trade taken
+            "expectancy_pct": np.where(trades > 0, total / trades, 0.0)
+        }
+
+
+def rank_configs(
+    grid: Dict[str, np.ndarray],
+    results: Dict[str, np.ndarray],
+    min_trades: int = 1,
+    top: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Configurations by T1 hit rate, then expectancy (best first)"""
+    eligible = np.flatnonzero(results["trades"] >= min_trades)
+    order = eligible[np.lexsort((
+        -results["expectancy_pct"][eligible],
+        -results["t1_hit_rate"][eligible]
+    ))]
+    if top is not None:
+        order = order[:top]
+
+    return [
+        {
+            "weights": dict(zip(COMPONENTS, grid["weights"][i].tolist())),
+            "min_attention": float(grid["min_attention"][i]),
+            "min_health": float(grid["min_health"][i]),
+            "min_confidence": float(grid["min_confidence"][i]),
+            "trades": int(results["trades"][i]),
+            "t1_hit_rate": round(float(results["t1_hit_rate"][i]), 1),
+            "win_rate": round(float(results["win_rate"][i]), 1),
+            "expectancy_pct": round(float(results["expectancy_pct"][i]), 3)
+        }
+        for i in order.tolist()
+    ]
+
+
+def load_days(
+    days: List[str],
+    cache: OHLCVCache,
+    workers: Optional[int] = None,
+    offline: bool = False,
+    history_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Fill the price cache for every candidate, then build day columns in parallel"""
+    if not offline:
+        today = datetime.now().strftime("%Y-%m-%d")
+        needs: Dict[str, Tuple[str, str]] = {}
+        for source in days:
+            date, candidates = load_day(source, history_dir)
+            for c in candidates:
+                start = date
+                end = min(time_stop_date({"date": date, "catalyst_date": c.get("catalyst_date")}), today)
+                known = needs.get(c["ticker"], (start, end))
+                needs[c["ticker"]] = (min(known[0], start), max(known[1], end))
+        cache.ensure(needs)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            day_outcomes,
+            days,
+            [str(cache.cache_dir)] * len(days),
+            [history_dir] * len(days),
+            chunksize=max(1, len(days) // (workers * 4))
+        ))
+
+
+def _floats(text: str) -> Tuple[float, ...]:
+    return tuple(float(v) for v in text.split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep ECHOPULSE weights and thresholds over archived scans")
+    parser.add_argument("--data-dir", default="data", help="where scan_*.json live")
+    parser.add_argument("--from", dest="start", help="first scan date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="last scan date (YYYY-MM-DD)")
+    parser.add_argument("--weight-step", type=int, default=WEIGHT_STEP, help="weight grid step in %% (default 10)")
+    parser.add_argument("--min-attention", type=_floats, default=DEFAULT_MIN_ATTENTION)
+    parser.add_argument("--min-health", type=_floats, default=DEFAULT_MIN_HEALTH)
+    parser.add_argument("--min-confidence", type=_floats, default=DEFAULT_MIN_CONFIDENCE)
+    parser.add_argument("--min-trades", type=int, default=5, help="ignore configs with fewer graded picks")
+    parser.add_argument("--top", type=int, default=10, help="configs to print")
+    parser.add_argument("--workers", type=int, help="processes for grading (default: all cores)")
+    parser.add_argument("--offline", action="store_true", help="use cached prices only")
+    parser.add_argument("--history", help="read scans from this compacted history store")
+    parser.add_argument("--output", help="write the full ranking JSON here")
+    args = parser.parse_args()
+
+    days = scan_days(Path(args.data_dir), args.start, args.end, args.history)
+    if not days:
+        print("No archived scans found")
+        return 1
+
+    cache = OHLCVCache(Path(args.data_dir) / "ohlcv")
+    stacked = stack_days(load_days(days, cache, workers=args.workers, offline=args.offline, history_dir=args.history))
+
+    weights = weight_grid(args.weight_step)
+    if BASELINE_WEIGHTS not in weights:
+        weights.append(BASELINE_WEIGHTS)
+    grid = config_grid(weights, args.min_attention, args.min_health, args.min_confidence)
+    results = evaluate_grid(stacked, grid)
+    ranking = rank_configs(grid, results, min_trades=args.min_trades)
+
+    print(f"📊 {len(days)} days × {len(grid['min_attention'])} configs")
+    for i, config in enumerate(ranking[:args.top], 1):
+        w = config["weights"]
+        print(
+            f"   {i:>2}. weights {w['attention']:.2f}/{w['health']:.2f}/{w['catalyst']:.2f}/{w['confidence']:.2f}"
+            f"  min att {config['min_attention']:g} health {config['min_health']:g} conf {config['min_confidence']:g}"
+            f"  → {config['trades']} trades, T1 {config['t1_hit_rate']}%, expectancy {config['expectancy_pct']:+.2f}%"
+        )
+
+    baseline = EchoPulseAnalyzer()
+    for position, config in enumerate(ranking, 1):
+        if (
+            tuple(config["weights"].values()) == BASELINE_WEIGHTS
+            and config["min_attention"] == baseline.min_attention_score
+            and config["min_health"] == baseline.min_health_score
+            and config["min_confidence"] == baseline.min_rumor_confidence
+        ):
+            print(f"   Current settings rank #{position}: T1 {config['t1_hit_rate']}%, "
+                  f"expectancy {config['expectancy_pct']:+.2f}%")
+            break
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"days": len(days), "configs": ranking}, f, indent=2)
+        print(f"📄 Full ranking: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+ECHOPULSE v3.0 Streaming Scan Uploads
+Incremental parsing of a scan JSON document: candidates are validated and
+handed on one at a time, so an upload is never held in memory whole
+
+    python upload_stream.py                          # chunk-size sweep over a built-in sample
+    python upload_stream.py data/scan_2025-11-11.json --max-chunk 256
+"""
+
+import argparse
+import codecs
+import io
+import json
+import shutil
+import sys
+from typing import Dict, List, Any, IO, Iterable, Iterator, Optional, TextIO, Tuple
+
+
+CHUNK_SIZE = 64 * 1024
+# A single array element or top-level value bigger than this is rejected
+MAX_ITEM_CHARS = 1024 * 1024
+
+# Candidate fields that must be numbers when present
+NUMERIC_FIELDS = (
+    "price", "market_cap", "volume", "mentions_24h",
+    "buzz_ratio", "velocity_1h", "health_score", "rumor_confidence"
+)
+
+_WHITESPACE = " \t\n\r"
+# Characters that can continue a number raw_decode already accepted ("1." -> "1.5")
+_NUMBER_TAIL = frozenset(".eE+-0123456789")
+
+
+class UploadError(ValueError):
+    """The upload isn't a valid scan document"""
+
+
+def validate_candidate(candidate: Any, index: int) -> Dict[str, Any]:
+    """Check the fields the analyzer and brief read; raise UploadError on the first problem"""
+    if not isinstance(candidate, dict):
+        raise UploadError(f"candidate {index}: expected an object")
+    ticker = candidate.get("ticker")
+    if not isinstance(ticker, str) or not ticker.strip():
+        raise UploadError(f"candidate {index}: missing ticker")
+    for field in NUMERIC_FIELDS:
+        value = candidate.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise UploadError(f"candidate {index} ({ticker}): {field} must be a number")
+    if not isinstance(candidate.get("platforms", []), list):
+        raise UploadError(f"candidate {index} ({ticker}): platforms must be a list")
+    catalyst_date = candidate.get("catalyst_date")
+    if catalyst_date is not None and not isinstance(catalyst_date, str):
+        raise UploadError(f"candidate {index} ({ticker}): catalyst_date must be a string")
+    return candidate
+
+
+class ScanEventParser:
+    """
+    Push parser for a top-level JSON object. feed() text as it arrives and
+    collect events:
+        ("field", key, value)     a complete non-array value
+        ("array_start", key)      then one ("item", key, value) per element
+        ("array_end", key)
+    Arrays are split element by element, so only the element being parsed
+    (never the whole array) is buffered.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._first = True
+        self._item_first = True
+        self._eof = False
+
+    def feed(self, text: str) -> List[Tuple]:
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return self._parse()
+
+    def close(self) -> List[Tuple]:
+        self._eof = True
+        events = self._parse()
+        if self._state != "done":
+            raise UploadError("upload ended before the JSON document was complete")
+        return events
+
+    def _skip_ws(self) -> Optional[str]:
+        while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._buf[self._pos] if self._pos < len(self._buf) else None
+
+    def _runs_to_end(self, pos: int, chars: frozenset) -> bool:
+        """True if only `chars` lie between pos and the end of the buffer"""
+        while pos < len(self._buf):
+            if self._buf[pos] not in chars:
+                return False
+            pos += 1
+        return True
+
+    def _value(self) -> Tuple[bool, Any]:
+        """(complete, value) for the JSON value at the cursor"""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if self._eof:
+                raise UploadError(f"invalid JSON: {e.msg}") from e
+            if len(self._buf) - self._pos > MAX_ITEM_CHARS:
+                raise UploadError(f"invalid JSON or value over {MAX_ITEM_CHARS} characters") from e
+            return False, None
+        # A number at the end of the buffer may continue in the next chunk, also
+        # when the chunk split it after "1." or "1e" (raw_decode stops before those)
+        if (
+            not self._eof
+            and isinstance(value, (int, float)) and not isinstance(value, bool)
+            and self._runs_to_end(end, _NUMBER_TAIL)
+        ):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self) -> List[Tuple]:
+        events: List[Tuple] = []
+        while True:
+            char = self._skip_ws()
+            if char is None:
+                return events
+
+            if self._state == "start":
+                if char != "{":
+                    raise UploadError("expected a JSON object")
+                self._pos += 1
+                self._state, self._first = "key", True
+
+            elif self._state == "key":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                mark = self._pos
+                if not self._first:
+                    if char != ",":
+                        raise UploadError("expected ',' between fields")
+                    self._pos += 1
+                    if self._skip_ws() is None:
+                        self._pos = mark
+                        return events
+                complete, key = self._value()
+                if not complete:
+                    self._pos = mark
+                    return events
+                if not isinstance(key, str):
+                    raise UploadError("expected a field name")
+                if self._skip_ws() is None:
+                    self._pos = mark
+                    return events
+                if self._buf[self._pos] != ":":
+                    raise UploadError(f"expected ':' after {key!r}")
+                self._pos += 1
+                self._key, self._first, self._state = key, False, "value"
+
+            elif self._state == "value":
+                if char == "[":
+                    self._pos += 1
+                    events.append(("array_start", self._key))
+                    self._state, self._item_first = "item", True
+                    continue
+                complete, value = self._value()
+                if not complete:
+                    return events
+                events.append(("field", self._key, value))
+                self._state = "key"
+
+            elif self._state == "item":
+                if char == "]":
+                    self._pos += 1
+                    events.append(("array_end", self._key))
+                    self._state = "key"
+                    continue
+                mark = self._pos
+                if not self._item_first:
+                    if char != ",":
+                        raise UploadError(f"expected ',' between {self._key} entries")
+                    self._pos += 1
+                    if self._skip_ws() is None:
+                        self._pos = mark
+                        return events
+                complete, value = self._value()
+                if not complete:
+                    self._pos = mark
+                    return events
+                events.append(("item", self._key, value))
+                self._item_first = False
+
+            elif self._state == "done":
+                raise UploadError("unexpected data after the JSON document")
+
+
+def copy_upload(src: IO, path: str, chunk_size: int = CHUNK_SIZE):
+    """Copy an upload's spooled file to path chunk by chunk"""
+    src.seek(0)
+    with open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst, chunk_size)
+
+
+def iter_events(stream: IO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple]:
+    """Parser events for a binary or text file, read chunk_size at a time"""
+    parser = ScanEventParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield from parser.feed(text)
+    yield from parser.feed(decoder.decode(b"", final=True))
+    yield from parser.close()
+
+
+class ScanFileWriter:
+    """Writes parser events back out as json.dump(data, indent=2) would, in document order"""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self._fields = 0
+        self._items = 0
+
+    @staticmethod
+    def _dump(value: Any, indent: str) -> str:
+        return json.dumps(value, indent=2).replace("\n", "\n" + indent)
+
+    def _open_field(self, key: str):
+        self.out.write(("{\n" if not self._fields else ",\n") + f"  {json.dumps(key)}: ")
+        self._fields += 1
+
+    def write(self, event: Tuple):
+        kind, key = event[0], event[1]
+        if kind == "field":
+            self._open_field(key)
+            self.out.write(self._dump(event[2], "  "))
+        elif kind == "array_start":
+            self._open_field(key)
+            self.out.write("[")
+            self._items = 0
+        elif kind == "item":
+            self.out.write(("\n" if not self._items else ",\n") + "    " + self._dump(event[2], "    "))
+            self._items += 1
+        elif kind == "array_end":
+            self.out.write("\n  ]" if self._items else "]")
+
+    def close(self):
+        self.out.write("\n}" if self._fields else "{}")
+
+
+def stream_candidates(
+    events: Iterable[Tuple],
+    metadata: Dict[str, Any],
+    writer: Optional[ScanFileWriter] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validated candidates from parser events, in order. Every other top-level
+    field lands in metadata (complete once the generator is exhausted), and
+    each event is also passed to writer when given.
+    """
+    index = 0
+    for event in events:
+        if writer is not None:
+            writer.write(event)
+        kind, key = event[0], event[1]
+        if key == "candidates":
+            if kind == "item":
+                yield validate_candidate(event[2], index)
+                index += 1
+            elif kind == "field":
+                raise UploadError("candidates must be a list")
+        elif kind == "field":
+            metadata[key] = event[2]
+        elif kind == "array_start":
+            metadata[key] = []
+        elif kind == "item":
+            metadata[key].append(event[2])
+
+
+# Top-level and nested floats, exponents and negatives, for the chunk-size sweep
+SAMPLE_SCAN = {
+    "date": "2025-11-11",
+    "threshold": 1.5,
+    "drift": -2.5e-3,
+    "candidates": [
+        {"ticker": "NVDA", "price": 12.75, "market_cap": 3e+10, "buzz_ratio": 1e-2, "platforms": ["reddit"]},
+        {"ticker": "AMD", "price": -0.0, "volume": 10, "platforms": []}
+    ],
+    "elapsed": 7.25
+}
+
+
+def chunk_mismatches(text: str, chunk_sizes: Iterable[int]) -> List[int]:
+    """Chunk sizes at which streaming text through the parser and writer doesn't reproduce json.dumps(indent=2)"""
+    expected = json.dumps(json.loads(text), indent=2)
+    bad = []
+    for chunk_size in chunk_sizes:
+        out = io.StringIO()
+        writer = ScanFileWriter(out)
+        try:
+            for _ in stream_candidates(iter_events(io.BytesIO(text.encode()), chunk_size), {}, writer):
+                pass
+            writer.close()
+        except UploadError:
+            bad.append(chunk_size)
+            continue
+        if out.getvalue() != expected:
+            bad.append(chunk_size)
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check streamed scan parsing at every chunk size")
+    parser.add_argument("scan", nargs="?", help="scan JSON file (default: built-in sample)")
+    parser.add_argument("--max-chunk", type=int, help="largest chunk size tried (default: the whole document)")
+    args = parser.parse_args()
+
+    if args.scan:
+        with open(args.scan, "r") as f:
+            text = f.read()
+    else:
+        text = json.dumps(SAMPLE_SCAN)
+    sizes = range(1, (args.max_chunk or len(text)) + 1)
+
+    bad = chunk_mismatches(text, sizes)
+    if bad:
+        print(f"❌ {len(bad)} chunk sizes mis-parsed, first: {bad[:10]}")
+        return 1
+    print(f"✅ Chunk sizes 1-{sizes[-1]} all reproduce the document")
+
+
+if __name__ == "__main__":
+    sys.exit(main())